@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+命令行仪表板渲染基准
+
+用合成会话模拟命令行版的 Live 刷新循环（ClaudeMonitor.create_dashboard + 渲染），
+把每一帧渲染到不输出的 Console，分别统计：
+
+- build:   create_dashboard 构建 Layout 的耗时
+- render:  Console 把 Layout 渲染成终端输出的耗时
+- 每帧的 Python 内存分配（tracemalloc，单独跑一遍，不影响计时）
+- 无变化帧：输出与上一帧完全相同的帧数，以及花在这些帧上的时间（浪费的渲染）
+
+每帧之前以 --change-rate 的概率修改一次数据（todo 状态变化、活跃状态切换、状态消息等），
+默认 0.05 大约相当于每 5 秒有一次变化。
+
+默认每一帧都构建并渲染（与固定帧率刷新相同）；--render-on-change 时和 run_ui 一样
+只在脏版本变化时渲染，跳过的帧记为 skipped_frames。
+
+用法:
+    python benchmarks/bench_cli_dashboard.py [--sessions 20 200 2000] [--todos 10] [--frames 200]
+                                             [--json results.json] [--compare baseline.json]
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_scan import compare  # noqa: E402
+
+TODO_STATUSES = ('pending', 'in_progress', 'completed')
+BASE_TIME = datetime(2025, 1, 1, 9, 0, 0)
+ALLOC_FRAMES = 10
+
+
+class DashboardWorkload:
+    """向 ClaudeMonitor 填充合成会话，并按概率在帧之间修改数据"""
+
+    def __init__(self, monitor, sessions: int, todos: int, active_fraction: float, seed: int = 42):
+        from claudecode_cola import ClaudeSession, TodoItem
+        self.session_cls = ClaudeSession
+        self.todo_cls = TodoItem
+        self.monitor = monitor
+        self.rng = random.Random(seed)
+
+        for i in range(sessions):
+            session_id = f"{i:08d}-0000-4000-8000-{i:012d}"
+            start = BASE_TIME + timedelta(minutes=i)
+            session = ClaudeSession(
+                session_id=session_id,
+                project_path=f"/work/project-{i % 50}",
+                project_name=f"/work/project-{i % 50}",
+                start_time=start,
+                last_activity=start,
+                is_active=self.rng.random() < active_fraction,
+                is_pinned=self.rng.random() < 0.05,
+                todos=[self._todo(i, j) for j in range(todos)],
+                message_count=self.rng.randint(1, 500),
+            )
+            monitor.sessions[session_id] = session
+            monitor.session_ids.add(session_id)
+            if session.is_active:
+                monitor.active_sessions.add(session_id)
+
+    def _todo(self, session_index: int, todo_index: int):
+        return self.todo_cls(content=f"session {session_index} task {todo_index}",
+                             status=self.rng.choice(TODO_STATUSES),
+                             activeForm=f"Working on session {session_index} task {todo_index}",
+                             timestamp=BASE_TIME + timedelta(seconds=todo_index))
+
+    def change(self):
+        """对数据做一次修改（模拟文件更新、活跃状态变化或用户操作）"""
+        monitor = self.monitor
+        session = self.rng.choice(list(monitor.sessions.values()))
+        kind = self.rng.randrange(4)
+        if kind == 0 and session.todos:
+            todo = self.rng.choice(session.todos)
+            todo.status = self.rng.choice(TODO_STATUSES)
+        elif kind == 1:
+            session.is_active = not session.is_active
+            if session.is_active:
+                monitor.active_sessions.add(session.session_id)
+            else:
+                monitor.active_sessions.discard(session.session_id)
+        elif kind == 2:
+            session.last_activity += timedelta(seconds=self.rng.randint(1, 120))
+            session.todos.append(self._todo(0, len(session.todos)))
+        else:
+            monitor.status_message = f"📌 已标记 {session.session_id[:8]}"
+            return
+        monitor.mark_dirty()
+
+
+def render_frame(monitor, console) -> tuple:
+    """构建并渲染一帧，返回 (构建耗时, 渲染耗时, 输出指纹)"""
+    output = console.file
+    output.seek(0)
+    output.truncate()
+
+    start = time.perf_counter()
+    layout = monitor.create_dashboard()
+    built = time.perf_counter()
+    console.print(layout)
+    rendered = time.perf_counter()
+
+    digest = hashlib.blake2b(output.getvalue().encode('utf-8'), digest_size=16).digest()
+    return (built - start) * 1000, (rendered - built) * 1000, digest
+
+
+def run_case(sessions: int, args) -> dict:
+    from rich.console import Console
+    from claudecode_cola import ClaudeMonitor
+
+    monitor = ClaudeMonitor()
+    workload = DashboardWorkload(monitor, sessions, args.todos, args.active_fraction)
+    console = Console(file=io.StringIO(), width=args.width, height=args.height,
+                      force_terminal=True, color_system='truecolor')
+    monitor.console = console
+    rng = random.Random(args.seed)
+
+    build_times: List[float] = []
+    render_times: List[float] = []
+    frame_times: List[float] = []
+    unchanged = 0
+    wasted_ms = 0.0
+    previous = None
+    changes = 0
+    skipped = 0
+    rendered_version = monitor.version
+
+    render_frame(monitor, console)  # 预热
+    for _ in range(args.frames):
+        if rng.random() < args.change_rate:
+            workload.change()
+            changes += 1
+        if args.render_on_change:
+            if monitor.version == rendered_version:
+                skipped += 1
+                continue
+            rendered_version = monitor.version
+        build_ms, render_ms, digest = render_frame(monitor, console)
+        frame_ms = build_ms + render_ms
+        build_times.append(build_ms)
+        render_times.append(render_ms)
+        frame_times.append(frame_ms)
+        if digest == previous:
+            unchanged += 1
+            wasted_ms += frame_ms
+        previous = digest
+
+    # 分配统计单独跑，避免 tracemalloc 的开销影响计时
+    peaks = []
+    blocks = []
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    tracemalloc.start()
+    try:
+        for _ in range(ALLOC_FRAMES):
+            before = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            render_frame(monitor, console)
+            _, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            stats = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), 'filename')
+            blocks.append(sum(stat.count_diff for stat in stats))
+            peaks.append(peak - base)
+    finally:
+        tracemalloc.stop()
+
+    if not frame_times:
+        frame_times = [0.0]
+        build_times = [0.0]
+        render_times = [0.0]
+    frame_times_sorted = sorted(frame_times)
+    return {
+        'status': 'ok',
+        'sessions': sessions,
+        'frames': args.frames,
+        'changes': changes,
+        'median_ms': round(statistics.median(frame_times), 3),
+        'p95_ms': round(frame_times_sorted[min(len(frame_times) - 1, int(len(frame_times) * 0.95))], 3),
+        'build_median_ms': round(statistics.median(build_times), 3),
+        'render_median_ms': round(statistics.median(render_times), 3),
+        'peak_kb': round(statistics.mean(peaks) / 1024, 1),
+        'net_blocks': round(statistics.mean(blocks)),
+        'skipped_frames': skipped,
+        'unchanged_frames': unchanged,
+        'wasted_ms': round(wasted_ms, 2),
+        'wasted_fraction': round(wasted_ms / sum(frame_times), 3) if sum(frame_times) else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="命令行仪表板渲染基准")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[20, 200, 2000], help="会话数（可指定多个）")
+    parser.add_argument('--todos', type=int, default=10, help="每个会话的 todo 数")
+    parser.add_argument('--active-fraction', type=float, default=0.3, help="活跃会话比例")
+    parser.add_argument('--frames', type=int, default=200, help="每种规模渲染的帧数（4 帧 = 1 秒）")
+    parser.add_argument('--change-rate', type=float, default=0.05, help="每帧之前发生数据变化的概率")
+    parser.add_argument('--render-on-change', action='store_true', help="只在脏版本变化时渲染（与 run_ui 相同）")
+    parser.add_argument('--width', type=int, default=160, help="终端宽度")
+    parser.add_argument('--height', type=int, default=50, help="终端高度")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', type=Path, help="把结果写入 JSON 文件")
+    parser.add_argument('--compare', type=Path, help="与之前保存的 JSON 结果比较")
+    args = parser.parse_args()
+
+    # 配置文件按 HOME 定位，指向临时目录，避免读写真实配置
+    tmp = tempfile.TemporaryDirectory(prefix='cola-dashboard-')
+    os.environ['HOME'] = tmp.name
+
+    results = {}
+    try:
+        for sessions in args.sessions:
+            name = f"dashboard_{sessions}"
+            try:
+                result = run_case(sessions, args)
+            except ImportError as e:
+                result = {'status': 'skipped', 'reason': f"缺少依赖: {e.name or e}"}
+            results[name] = result
+            if result['status'] == 'ok':
+                print(f"{name:16s} {result['median_ms']:8.2f} ms/帧 (中位数)  p95 {result['p95_ms']:8.2f} ms  "
+                      f"构建 {result['build_median_ms']:.2f} ms + 渲染 {result['render_median_ms']:.2f} ms  "
+                      f"峰值 {result['peak_kb']:.1f} KB")
+                print(f"{'':16s} 跳过 {result['skipped_frames']} 帧  "
+                      f"无变化帧 {result['unchanged_frames']}/{result['frames']}  "
+                      f"浪费 {result['wasted_ms']:.1f} ms ({result['wasted_fraction']:.0%})")
+            else:
+                print(f"{name:16s} 跳过: {result['reason']}")
+    finally:
+        tmp.cleanup()
+
+    output = {
+        'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'args': {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()},
+        'results': results,
+    }
+    if args.json:
+        args.json.write_text(json.dumps(output, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"\n结果已写入 {args.json}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+会话模型内存基准
+
+构造 N 个会话（默认 10k），分别使用旧版数据模型（普通 dataclass + 列表）
+和当前数据模型（slots + 字符串驻留 + 元组），用 tracemalloc 统计每个会话占用的字节数
+
+用法:
+    python benchmarks/bench_models_memory.py [--sessions 10000] [--projects 50]
+"""
+import argparse
+import gc
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data.models import Session, TodoItem, TodoStatus
+
+
+# ---- 旧版数据模型（优化前的布局，仅用于对比） ----
+
+@dataclass
+class LegacyTodoItem:
+    content: str
+    status: TodoStatus
+    active_form: str
+    created_at: datetime = field(default_factory=datetime.now)
+    completed_at: Optional[datetime] = None
+
+
+@dataclass
+class LegacySession:
+    session_id: str
+    project_path: str
+    project_name: str
+    start_time: datetime
+    last_activity: datetime
+    is_active: bool = False
+    is_pinned: bool = False
+    custom_name: str = ""
+    todos: List[LegacyTodoItem] = field(default_factory=list)
+    message_count: int = 0
+    last_message: str = ""
+    file_path: str = ""
+    source_type: str = "claude"
+
+
+def build_corpus(session_cls, todo_cls, sessions: int, projects: int, todos_per_session: int):
+    """
+    构造会话列表
+
+    字符串都通过拼接动态生成（与解析 jsonl 时的情况一致），
+    这样相同内容的字符串是不同的对象，能体现驻留的效果
+    """
+    base_time = datetime(2025, 1, 1)
+    statuses = list(TodoStatus)
+    corpus = []
+    for i in range(sessions):
+        project = i % projects
+        encoded = "-".join(["", "Users", "dev", "Code", f"project-{project}"])
+        todos = [
+            todo_cls(
+                content="".join(["实现任务 ", str(j)]),
+                status=statuses[j % len(statuses)],
+                active_form="".join(["正在实现任务 ", str(j)]),
+            )
+            for j in range(todos_per_session if i % 3 == 0 else 0)
+        ]
+        corpus.append(session_cls(
+            session_id=f"{i:08x}-0000-4000-8000-{i:012x}",
+            project_path="".join(["/Users/dev/.claude/projects/", encoded]),
+            project_name="".join(["/Users/dev/Code/project-", str(project)]),
+            start_time=base_time + timedelta(minutes=i),
+            last_activity=base_time + timedelta(minutes=i + 5),
+            todos=todos,
+            message_count=i % 200,
+            last_message="".join(["最后一条消息 ", str(i)]),
+            file_path=f"/Users/dev/.claude/projects/{encoded}/{i:08x}.jsonl",
+            source_type="".join(["clau", "de"]),
+        ))
+    return corpus
+
+
+def measure(session_cls, todo_cls, sessions: int, projects: int, todos_per_session: int) -> int:
+    """返回构造语料期间净分配的字节数"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    corpus = build_corpus(session_cls, todo_cls, sessions, projects, todos_per_session)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del corpus
+    return after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="会话模型内存基准")
+    parser.add_argument("--sessions", type=int, default=10000, help="会话数量")
+    parser.add_argument("--projects", type=int, default=50, help="不同项目数量")
+    parser.add_argument("--todos", type=int, default=5, help="每个有任务的会话的 todo 数量（每 3 个会话中有 1 个有任务）")
+    args = parser.parse_args()
+
+    legacy = measure(LegacySession, LegacyTodoItem, args.sessions, args.projects, args.todos)
+    current = measure(Session, TodoItem, args.sessions, args.projects, args.todos)
+
+    print(f"会话数: {args.sessions}, 项目数: {args.projects}")
+    print("=" * 60)
+    print(f"优化前: {legacy / args.sessions:8.1f} 字节/会话  (共 {legacy / 1024 / 1024:.2f} MiB)")
+    print(f"优化后: {current / args.sessions:8.1f} 字节/会话  (共 {current / 1024 / 1024:.2f} MiB)")
+    if legacy:
+        print(f"节省:   {(1 - current / legacy) * 100:8.1f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+会话扫描基准
+
+用 benchmarks/corpus.py 在临时目录中生成语料（或使用 --corpus 指定的已有语料），
+把 HOME 指向语料目录后分别计时：
+
+- claude_scan:      ClaudeSessionMonitor.scan_sessions（BaseSessionMonitor 的扫描流程）
+- qoder_scan:       QoderSessionMonitor.scan_sessions
+- todo_parser:      TodoParser.parse_claude_todos（逐个 jsonl 文件）
+- decode_dirname:   decode_encoded_dirname（所有项目目录）
+- cli_scan:         命令行版 ClaudeMonitor.scan_existing_sessions
+
+缺少依赖（watchdog / rich）的项目标记为 skipped。结果可以保存为 JSON，
+并与之前保存的结果比较。
+
+用法:
+    python benchmarks/bench_scan.py [--sessions 500 --lines 200 ...] [--repeat 5]
+                                    [--json results.json] [--compare baseline.json]
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from corpus import add_spec_arguments, generate_corpus, spec_from_args  # noqa: E402
+
+
+def time_runs(fn: Callable[[], int], repeat: int) -> dict:
+    """执行 repeat 次，返回耗时统计（fn 返回处理的条目数）"""
+    durations = []
+    items = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items = fn()
+        durations.append((time.perf_counter() - start) * 1000)
+    return {
+        'status': 'ok',
+        'runs': repeat,
+        'items': items,
+        'median_ms': round(statistics.median(durations), 2),
+        'min_ms': round(min(durations), 2),
+        'max_ms': round(max(durations), 2),
+    }
+
+
+def run_benchmark(name: str, setup: Callable[[], Callable[[], int]], repeat: int) -> dict:
+    """setup 负责导入依赖并返回被计时的函数，导入失败时标记为 skipped"""
+    try:
+        fn = setup()
+    except ImportError as e:
+        return {'status': 'skipped', 'reason': f"缺少依赖: {e.name or e}"}
+    return time_runs(fn, repeat)
+
+
+def setup_claude_scan(corpus: Path):
+    from src.core.session_monitor import ClaudeSessionMonitor
+    monitor = ClaudeSessionMonitor(corpus / '.claude' / 'projects', todos_dir=corpus / '.claude' / 'todos')
+    return lambda: len(monitor.scan_sessions())
+
+
+def setup_qoder_scan(corpus: Path):
+    from src.core.qoder_monitor import QoderSessionMonitor
+    monitor = QoderSessionMonitor(corpus / '.qoder' / 'projects', todos_dir=corpus / '.qoder' / 'todos')
+    return lambda: len(monitor.scan_sessions())
+
+
+def setup_todo_parser(corpus: Path):
+    from src.core.todo_parser import TodoParser
+    files = sorted((corpus / '.claude' / 'projects').rglob('*.jsonl'))
+
+    def run():
+        for file_path in files:
+            TodoParser.parse_claude_todos(file_path)
+        return len(files)
+    return run
+
+
+def setup_decode_dirname(corpus: Path):
+    from src.utils.path_decoder import decode_encoded_dirname
+    names = sorted(p.name for source in ('.claude', '.qoder')
+                   for p in (corpus / source / 'projects').iterdir() if p.is_dir())
+
+    def run():
+        for name in names:
+            decode_encoded_dirname(name)
+        return len(names)
+    return run
+
+
+def setup_cli_scan(corpus: Path):
+    from rich.console import Console
+    from claudecode_cola import ClaudeMonitor
+
+    def run():
+        monitor = ClaudeMonitor()
+        monitor.console = Console(file=io.StringIO())  # 不输出进度条
+        asyncio.run(monitor.scan_existing_sessions())
+        return len(monitor.sessions)
+    return run
+
+
+BENCHMARKS = {
+    'claude_scan': setup_claude_scan,
+    'qoder_scan': setup_qoder_scan,
+    'todo_parser': setup_todo_parser,
+    'decode_dirname': setup_decode_dirname,
+    'cli_scan': setup_cli_scan,
+}
+
+
+def compare(results: Dict[str, dict], baseline_path: Path):
+    """与之前保存的结果比较中位数"""
+    try:
+        baseline = json.loads(baseline_path.read_text(encoding='utf-8'))['results']
+    except (OSError, ValueError, KeyError) as e:
+        print(f"\n无法读取对比基准 {baseline_path}: {e}")
+        return
+    print(f"\n== 与 {baseline_path} 对比（中位数）")
+    for name, result in results.items():
+        old = baseline.get(name, {})
+        if result.get('status') != 'ok' or old.get('status') != 'ok':
+            print(f"   {name:16s} 无法比较")
+            continue
+        ratio = result['median_ms'] / old['median_ms'] if old['median_ms'] else float('inf')
+        print(f"   {name:16s} {old['median_ms']:10.2f} ms -> {result['median_ms']:10.2f} ms  ({ratio:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="会话扫描基准")
+    add_spec_arguments(parser)
+    parser.add_argument('--corpus', type=Path, help="使用已生成的语料目录（不指定时生成到临时目录）")
+    parser.add_argument('--repeat', type=int, default=5, help="每项重复次数（取中位数）")
+    parser.add_argument('--only', nargs='*', choices=sorted(BENCHMARKS), help="只运行指定的项目")
+    parser.add_argument('--json', type=Path, help="把结果写入 JSON 文件")
+    parser.add_argument('--compare', type=Path, help="与之前保存的 JSON 结果比较")
+    args = parser.parse_args()
+
+    spec = spec_from_args(args)
+    tmp: Optional[tempfile.TemporaryDirectory] = None
+    if args.corpus:
+        corpus = args.corpus
+    else:
+        tmp = tempfile.TemporaryDirectory(prefix='cola-corpus-')
+        corpus = Path(tmp.name)
+        stats = generate_corpus(corpus, spec)
+        print(f"生成语料: {stats.claude_files} 个 Claude 会话, {stats.qoder_files} 个 Qoder 会话, "
+              f"{stats.lines} 行, {stats.bytes / 1024 / 1024:.1f} MB")
+
+    # 标记/自定义名称等配置文件按 HOME 定位，指向语料目录，避免读写真实配置
+    os.environ['HOME'] = str(corpus)
+
+    results = {}
+    try:
+        for name, setup in BENCHMARKS.items():
+            if args.only and name not in args.only:
+                continue
+            result = run_benchmark(name, lambda: setup(corpus), args.repeat)
+            results[name] = result
+            if result['status'] == 'ok':
+                print(f"{name:16s} {result['median_ms']:10.2f} ms (中位数)  "
+                      f"{result['min_ms']:10.2f} ms (最小)  {result['items']} 项")
+            else:
+                print(f"{name:16s} 跳过: {result['reason']}")
+    finally:
+        if tmp is not None:
+            tmp.cleanup()
+
+    output = {
+        'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'corpus': str(args.corpus) if args.corpus else None,
+        'spec': asdict(spec),
+        'results': results,
+    }
+    if args.json:
+        args.json.write_text(json.dumps(output, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"\n结果已写入 {args.json}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+启动耗时基准
+
+1. 用 `python -X importtime` 在新进程中导入各个入口模块，统计总导入耗时、
+   耗时最多的模块，以及是否导入了 Qt（无界面路径不应该导入 Qt）
+2. 输出桌面应用最近一次启动记录（~/.claudecode-cola/startup_report.json，
+   由 src/utils/startup_profiler.py 写入，包含托盘显示、首帧绘制等阶段耗时）
+
+用法:
+    python benchmarks/bench_startup.py [--repeat 5] [--top 10] [--json results.json]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.startup_profiler import STARTUP_REPORT_FILE
+
+# 入口名称 -> 导入的模块
+TARGETS = {
+    'gui (src.app)': 'src.app',
+    'daemon (src.daemon)': 'src.daemon',
+    'engine (src.core.multi_source_monitor)': 'src.core.multi_source_monitor',
+    'api script (claudecode_cola_api)': 'claudecode_cola_api',
+}
+HEADLESS_TARGETS = {'daemon (src.daemon)', 'engine (src.core.multi_source_monitor)',
+                    'api script (claudecode_cola_api)'}
+
+
+def parse_importtime(stderr: str) -> List[dict]:
+    """解析 -X importtime 输出：每行 `import time: self | cumulative | name`（微秒）"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        except ValueError:
+            continue
+        modules.append({
+            'name': name.strip(),
+            'depth': (len(name) - len(name.lstrip())) // 2,
+            'self_ms': int(self_us) / 1000,
+            'cumulative_ms': int(cumulative_us) / 1000,
+        })
+    return modules
+
+
+def measure_target(module: str) -> Optional[List[dict]]:
+    """在新进程中导入模块，失败（缺少依赖等）时返回 None"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=str(project_root), capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        return None
+    return parse_importtime(result.stderr)
+
+
+def run_target(module: str, repeat: int, top: int) -> dict:
+    totals = []
+    modules: List[dict] = []
+    for _ in range(repeat):
+        modules = measure_target(module)
+        if modules is None:
+            return {'status': 'skipped', 'reason': f'无法导入 {module}（缺少依赖？）'}
+        totals.append(sum(m['self_ms'] for m in modules))
+
+    slowest = sorted(modules, key=lambda m: m['self_ms'], reverse=True)[:top]
+    return {
+        'status': 'ok',
+        'import_ms_median': round(statistics.median(totals), 1),
+        'import_ms_min': round(min(totals), 1),
+        'modules': len(modules),
+        'qt_modules': sorted(m['name'] for m in modules if m['name'].startswith('PyQt')),
+        'slowest_self': [{'name': m['name'], 'self_ms': round(m['self_ms'], 1)} for m in slowest],
+    }
+
+
+def load_startup_report() -> Optional[dict]:
+    try:
+        with open(STARTUP_REPORT_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f).get('latest')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="启动耗时基准")
+    parser.add_argument('--repeat', type=int, default=5, help="每个入口的导入次数（取中位数）")
+    parser.add_argument('--top', type=int, default=10, help="列出耗时最多的模块数")
+    parser.add_argument('--json', type=Path, help="把结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    results: Dict[str, dict] = {}
+    for name, module in TARGETS.items():
+        result = run_target(module, args.repeat, args.top)
+        results[name] = result
+
+        print(f"\n== {name}")
+        if result['status'] != 'ok':
+            print(f"   跳过: {result['reason']}")
+            continue
+        print(f"   导入耗时: {result['import_ms_median']:.1f} ms (中位数), "
+              f"{result['import_ms_min']:.1f} ms (最小), {result['modules']} 个模块")
+        if name in HEADLESS_TARGETS:
+            status = "❌ " + ", ".join(result['qt_modules'][:3]) if result['qt_modules'] else "✅ 无"
+            print(f"   Qt 模块: {status}")
+        for item in result['slowest_self']:
+            print(f"   {item['self_ms']:8.1f} ms  {item['name']}")
+
+    report = load_startup_report()
+    print(f"\n== 最近一次桌面应用启动 ({STARTUP_REPORT_FILE})")
+    if report is None:
+        print("   没有记录（启动一次桌面应用后生成）")
+    else:
+        print(f"   版本 {report.get('version')}，记录于 {report.get('recorded_at')}")
+        for mark, ms in report.get('marks_ms', {}).items():
+            print(f"   {ms:8.1f} ms  {mark}")
+        for name, ms in report.get('imports_ms', {}).items():
+            print(f"   导入 {name}: {ms:.1f} ms")
+
+    if args.json:
+        args.json.write_text(json.dumps({'imports': results, 'startup_report': report},
+                                        ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"\n结果已写入 {args.json}")
+
+
+if __name__ == '__main__':
+    main()
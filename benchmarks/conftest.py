@@ -0,0 +1,53 @@
+"""
+benchmarks 下 pytest 用例的公共设置
+
+    python -m pytest benchmarks
+"""
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录和 benchmarks 目录到 Python 路径
+benchmarks_dir = Path(__file__).parent
+sys.path.insert(0, str(benchmarks_dir.parent))
+sys.path.insert(0, str(benchmarks_dir))
+
+from corpus import CorpusSpec, generate_corpus  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def corpus_root(tmp_path_factory) -> Path:
+    """小规模合成语料（包含大工具结果行和带连字符的项目名）"""
+    root = tmp_path_factory.mktemp('corpus')
+    generate_corpus(root, CorpusSpec(sessions=40, qoder_sessions=10, lines=60, projects=8,
+                                     todo_fraction=0.2, large_fraction=0.05, large_bytes=8 * 1024,
+                                     hyphen_fraction=0.5, seed=7))
+    return root
+
+
+# ---- 基准结果汇总 ----
+
+BENCH_ROWS = pytest.StashKey[list]()
+
+
+@pytest.fixture(scope='session')
+def bench_report(request):
+    """收集基准结果（每项一个 dict），测试结束后在终端汇总，设置 COLA_BENCH_JSON 时同时写入 JSON"""
+    return request.config.stash.setdefault(BENCH_ROWS, [])
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    rows = config.stash.get(BENCH_ROWS, [])
+    if not rows:
+        return
+    terminalreporter.section("基准结果")
+    for row in rows:
+        terminalreporter.write_line("  ".join(f"{key}={value}" for key, value in row.items()))
+
+    json_path = os.environ.get('COLA_BENCH_JSON')
+    if json_path:
+        Path(json_path).write_text(json.dumps(rows, ensure_ascii=False, indent=2), encoding='utf-8')
+        terminalreporter.write_line(f"结果已写入 {json_path}")
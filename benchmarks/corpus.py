@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+合成会话语料生成器
+
+在指定目录下生成与真实环境结构一致的假数据（同一个种子生成的内容完全相同）：
+
+    <root>/.claude/projects/<编码后的项目目录>/<会话ID>.jsonl
+    <root>/.claude/todos/<会话ID>-agent-<会话ID>.json
+    <root>/.qoder/projects/<编码后的项目目录>/<会话ID>.jsonl
+    <root>/.qoder/todos/<会话ID>.json
+    <root>/work/<项目名>/                  项目目录本身（路径解码时需要真实存在）
+
+可配置会话数、每个文件的行数、TodoWrite 行的比例、大工具结果行的比例和大小，
+以及项目名中带连字符的比例（用于覆盖路径解码的回溯分支）。
+
+用法:
+    python benchmarks/corpus.py /tmp/cola-corpus [--sessions 500] [--lines 200] ...
+"""
+import argparse
+import json
+import random
+import re
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+TODO_STATUSES = ('pending', 'in_progress', 'completed')
+WORDS = ('parser', 'cache', 'index', 'monitor', 'daemon', 'widget', 'socket', 'snapshot',
+         'refactor', 'benchmark', 'session', 'todo', 'render', 'tray', 'layout', 'config')
+BASE_TIME = datetime(2025, 1, 1, 9, 0, 0)
+
+
+@dataclass
+class CorpusSpec:
+    """语料参数"""
+    sessions: int = 200               # Claude Code 会话数
+    qoder_sessions: int = 50          # Qoder 会话数
+    lines: int = 200                  # 每个会话文件的行数
+    projects: int = 20                # 项目数
+    todo_fraction: float = 0.05       # TodoWrite 行占 assistant 行的比例
+    large_fraction: float = 0.01      # 大工具结果行的比例
+    large_bytes: int = 64 * 1024      # 大工具结果行的大小
+    hyphen_fraction: float = 0.3      # 项目名带连字符的比例
+    todo_file_fraction: float = 0.5   # 有独立 todo 文件的会话比例
+    seed: int = 42
+
+
+@dataclass
+class CorpusStats:
+    """生成结果统计"""
+    root: str
+    claude_files: int = 0
+    qoder_files: int = 0
+    todo_files: int = 0
+    lines: int = 0
+    todo_lines: int = 0
+    large_lines: int = 0
+    bytes: int = 0
+
+
+def encode_project_dir(path: str) -> str:
+    """与 Claude Code 相同的项目目录编码（非字母数字字符替换为 -）"""
+    return re.sub(r'[^A-Za-z0-9]', '-', path)
+
+
+class CorpusGenerator:
+    """按 CorpusSpec 生成语料"""
+
+    def __init__(self, root: Path, spec: CorpusSpec):
+        self.root = root
+        self.spec = spec
+        self.rng = random.Random(spec.seed)
+        self.stats = CorpusStats(root=str(root))
+
+    def generate(self) -> CorpusStats:
+        projects = self._make_projects()
+        claude_dir = self.root / '.claude'
+        qoder_dir = self.root / '.qoder'
+        for source_dir, count, writer in ((claude_dir, self.spec.sessions, self._claude_session),
+                                          (qoder_dir, self.spec.qoder_sessions, self._qoder_session)):
+            (source_dir / 'todos').mkdir(parents=True, exist_ok=True)
+            for i in range(count):
+                project = projects[i % len(projects)]
+                project_dir = source_dir / 'projects' / encode_project_dir(str(project))
+                project_dir.mkdir(parents=True, exist_ok=True)
+                writer(project_dir, source_dir / 'todos', project)
+        return self.stats
+
+    def _make_projects(self) -> List[Path]:
+        projects = []
+        for i in range(max(1, self.spec.projects)):
+            name = self.rng.choice(WORDS)
+            if self.rng.random() < self.spec.hyphen_fraction:
+                name = f"{name}-{self.rng.choice(WORDS)}-{i}"
+            else:
+                name = f"{name}{i}"
+            path = self.root / 'work' / name
+            path.mkdir(parents=True, exist_ok=True)
+            projects.append(path)
+        return projects
+
+    def _session_id(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def _todos(self) -> List[dict]:
+        count = self.rng.randint(1, 8)
+        todos = []
+        for i in range(count):
+            content = f"{self.rng.choice(WORDS)} {self.rng.choice(WORDS)} step {i}"
+            todos.append({'content': content, 'status': self.rng.choice(TODO_STATUSES),
+                          'activeForm': f"Working on {content}"})
+        return todos
+
+    def _text(self, words: int) -> str:
+        return ' '.join(self.rng.choice(WORDS) for _ in range(words))
+
+    def _write_lines(self, file_path: Path, lines: List[dict]):
+        with open(file_path, 'w', encoding='utf-8') as f:
+            for line in lines:
+                data = json.dumps(line, ensure_ascii=False)
+                f.write(data + '\n')
+                self.stats.bytes += len(data) + 1
+        self.stats.lines += len(lines)
+
+    def _write_todo_file(self, todos_dir: Path, name: str):
+        if self.rng.random() >= self.spec.todo_file_fraction:
+            return
+        (todos_dir / name).write_text(json.dumps(self._todos(), ensure_ascii=False), encoding='utf-8')
+        self.stats.todo_files += 1
+
+    def _claude_session(self, project_dir: Path, todos_dir: Path, project: Path):
+        session_id = self._session_id()
+        ts = BASE_TIME + timedelta(minutes=self.rng.randint(0, 60 * 24 * 90))
+        lines = []
+        for i in range(self.spec.lines):
+            ts += timedelta(seconds=self.rng.randint(1, 90))
+            common = {'sessionId': session_id, 'cwd': str(project), 'uuid': self._session_id(),
+                      'timestamp': ts.isoformat() + 'Z'}
+            roll = self.rng.random()
+            if i % 2 == 0:
+                if roll < self.spec.large_fraction:
+                    # 大工具结果（如读取大文件、长命令输出）
+                    content = [{'type': 'tool_result', 'tool_use_id': f'toolu_{i}',
+                                'content': 'x' * self.spec.large_bytes}]
+                    self.stats.large_lines += 1
+                else:
+                    content = self._text(self.rng.randint(3, 40))
+                lines.append({**common, 'type': 'user', 'message': {'role': 'user', 'content': content}})
+            else:
+                content = [{'type': 'text', 'text': self._text(self.rng.randint(5, 60))}]
+                if roll < self.spec.todo_fraction:
+                    content.append({'type': 'tool_use', 'id': f'toolu_{i}', 'name': 'TodoWrite',
+                                    'input': {'todos': self._todos()}})
+                    self.stats.todo_lines += 1
+                lines.append({**common, 'type': 'assistant',
+                              'message': {'role': 'assistant', 'model': 'synthetic', 'content': content}})
+        self._write_lines(project_dir / f'{session_id}.jsonl', lines)
+        self._write_todo_file(todos_dir, f'{session_id}-agent-{session_id}.json')
+        self.stats.claude_files += 1
+
+    def _qoder_session(self, project_dir: Path, todos_dir: Path, project: Path):
+        session_id = self._session_id()
+        ts_ms = int((BASE_TIME + timedelta(minutes=self.rng.randint(0, 60 * 24 * 90))).timestamp() * 1000)
+        lines = []
+        for i in range(self.spec.lines):
+            ts_ms += self.rng.randint(1, 90) * 1000
+            role = 'user' if i % 2 == 0 else 'assistant'
+            if self.rng.random() < self.spec.large_fraction:
+                content = 'x' * self.spec.large_bytes
+                self.stats.large_lines += 1
+            else:
+                content = self._text(self.rng.randint(3, 40))
+            lines.append({'id': self._session_id(), 'role': role, 'content': content,
+                          'created_at': ts_ms, 'updated_at': ts_ms})
+        self._write_lines(project_dir / f'{session_id}.jsonl', lines)
+        self._write_todo_file(todos_dir, f'{session_id}.json')
+        self.stats.qoder_files += 1
+
+
+def generate_corpus(root: Path, spec: CorpusSpec = CorpusSpec()) -> CorpusStats:
+    """在 root 下生成语料，返回统计信息"""
+    root.mkdir(parents=True, exist_ok=True)
+    return CorpusGenerator(root, spec).generate()
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser):
+    """把 CorpusSpec 的字段添加为命令行参数（基准脚本共用）"""
+    defaults = CorpusSpec()
+    for name, value in asdict(defaults).items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=type(value), default=value)
+
+
+def spec_from_args(args: argparse.Namespace) -> CorpusSpec:
+    return CorpusSpec(**{name: getattr(args, name) for name in asdict(CorpusSpec())})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成合成会话语料")
+    parser.add_argument('root', type=Path, help="输出目录（相当于 HOME）")
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+
+    stats = generate_corpus(args.root, spec_from_args(args))
+    print(json.dumps(asdict(stats), ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,267 @@
+"""
+解析参考实现（基线版本）
+
+这里逐行保存基线（bb56a71）中的会话解析逻辑，作为差分测试（test_parse_equivalence.py）的语义基准：
+
+- ClaudeSessionMonitor.parse_session_file（src/core/session_monitor.py，按文本读取，保留完整的最后一条消息）
+- TodoParser.parse_claude_todos（src/core/todo_parser.py）
+- 命令行版 ClaudeMonitor.parse_session / parse_line / handle_file_update（claudecode_cola.py，
+  按行数记录读取位置）
+
+不要为了让测试通过而修改这里的逻辑：当前实现的输出必须与基线一致，
+包括遇到损坏行、截断写入、非法编码时的行为（跳过该行 / 停止读取 / 返回 None）。
+有意改变的语义在 test_parse_equivalence.py 中单独列出，并在比较时显式处理。
+日志输出和界面相关的代码不属于语义，已省略；会话以 dict 表示，只包含基线产生的字段。
+"""
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from src.data.models import TodoItem, TodoStatus
+from src.utils.path_decoder import decode_encoded_dirname
+
+
+# ---- 桌面版（src/core） ----
+
+def reference_parse_claude_todos(jsonl_path: Path) -> List[TodoItem]:
+    """基线 TodoParser.parse_claude_todos"""
+    todos = []
+    try:
+        with open(jsonl_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    data = json.loads(line.strip())
+
+                    if 'message' in data and 'content' in data['message']:
+                        for item in data['message']['content']:
+                            if isinstance(item, dict) and \
+                               item.get('type') == 'tool_use' and \
+                               item.get('name') == 'TodoWrite':
+
+                                if 'input' in item and 'todos' in item['input']:
+                                    todos_list = item['input']['todos']
+                                    if isinstance(todos_list, list):
+                                        todos = []  # 清空，使用最新的
+                                        for todo_item in todos_list:
+                                            try:
+                                                todo = TodoItem(
+                                                    content=todo_item.get('content', ''),
+                                                    status=TodoStatus(todo_item.get('status', 'pending')),
+                                                    active_form=todo_item.get('activeForm', ''),
+                                                )
+                                                todos.append(todo)
+                                            except Exception:
+                                                pass
+                except json.JSONDecodeError:
+                    continue
+    except Exception:
+        pass
+
+    return todos
+
+
+def reference_parse_session_file(monitor, file_path: Path) -> Optional[dict]:
+    """
+    基线 ClaudeSessionMonitor.parse_session_file
+
+    Args:
+        monitor: ClaudeSessionMonitor（提供 projects_dir / 标记 / 自定义名称 / 活跃判断）
+    """
+    session_id = file_path.stem
+
+    if session_id.startswith('agent-'):
+        return None
+
+    project_path = str(file_path.parent)
+    if project_path.count('/') < 2:
+        return None
+
+    start_time = None
+    last_activity = None
+    message_count = 0
+    last_message = ""
+
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    data = json.loads(line.strip())
+
+                    if 'ts' in data:
+                        ts = datetime.fromisoformat(data['ts'])
+                        if not start_time:
+                            start_time = ts
+                        last_activity = ts
+
+                    if 'message' in data:
+                        message_count += 1
+                        last_message = data['message']
+
+                except json.JSONDecodeError:
+                    continue
+
+        if not start_time:
+            start_time = datetime.now()
+        if not last_activity:
+            last_activity = start_time
+
+        is_active = monitor.check_session_active(file_path)
+        is_pinned = session_id in monitor.pinned_sessions
+
+        try:
+            relative_path = file_path.parent.relative_to(monitor.projects_dir)
+            project_display_name = decode_encoded_dirname(str(relative_path))
+        except ValueError:
+            project_display_name = decode_encoded_dirname(file_path.parent.name)
+
+        custom_name = monitor.session_names.get(session_id, "")
+        todos = reference_parse_claude_todos(file_path)
+
+        return {
+            'session_id': session_id,
+            'project_path': project_path,
+            'project_name': project_display_name,
+            'start_time': start_time,
+            'last_activity': last_activity,
+            'is_active': is_active,
+            'is_pinned': is_pinned,
+            'custom_name': custom_name,
+            'todos': todos,
+            'message_count': message_count,
+            'last_message': last_message,
+            'file_path': str(file_path),
+            'source_type': "claude",
+        }
+
+    except Exception:
+        return None
+
+
+# ---- 命令行版（claudecode_cola.py） ----
+
+def reference_cli_parse_session(file_path: Path) -> Optional[Tuple[dict, int]]:
+    """
+    基线 ClaudeMonitor.parse_session
+
+    Returns:
+        (会话, 已读取的行数)，不是有效会话时返回 None
+    """
+    try:
+        session_id = file_path.stem
+        if session_id.startswith('agent-'):
+            return None
+        project_path = file_path.parent.name
+        project_name = project_path
+
+        if project_name.startswith('-'):
+            path_without_prefix = project_name[1:]
+            project_name = '/' + path_without_prefix.replace('-', '/')
+
+        if project_name.count('/') < 2:
+            return None
+
+        session = {
+            'session_id': session_id,
+            'project_path': project_path,
+            'project_name': project_name,
+            'start_time': datetime.fromtimestamp(file_path.stat().st_ctime),
+            'last_activity': datetime.fromtimestamp(file_path.stat().st_mtime),
+            'is_active': False,
+            'is_pinned': False,
+            'todos': [],
+            'message_count': 0,
+            'last_message': "",
+            'file_path': str(file_path),
+        }
+
+        with open(file_path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+        position = len(lines)
+        for line in lines:
+            reference_cli_parse_line(line, session)
+
+        try:
+            file_stat = Path(session['file_path']).stat()
+            file_mtime = datetime.fromtimestamp(file_stat.st_mtime)
+            time_diff = (datetime.now() - file_mtime).total_seconds()
+            if time_diff < 120:
+                session['is_active'] = True
+        except Exception:
+            time_diff = (datetime.now() - session['last_activity']).total_seconds()
+            if time_diff < 120:
+                session['is_active'] = True
+
+        return session, position
+
+    except Exception:
+        return None
+
+
+def reference_cli_parse_line(line: str, session: dict) -> None:
+    """基线 ClaudeMonitor.parse_line（TodoItem 表示为 (content, status, activeForm, timestamp)）"""
+    try:
+        data = json.loads(line.strip())
+
+        if data.get('type') in ['user', 'assistant']:
+            session['message_count'] += 1
+
+            if data.get('type') == 'user':
+                message = data.get('message', {})
+                if isinstance(message.get('content'), str):
+                    session['last_message'] = message['content'][:100]
+
+            if data.get('type') == 'assistant':
+                message = data.get('message', {})
+                content = message.get('content', [])
+
+                for item in content:
+                    if isinstance(item, dict) and item.get('type') == 'tool_use' and item.get('name') == 'TodoWrite':
+                        todos_data = item.get('input', {}).get('todos', [])
+                        new_todos = []
+                        for todo in todos_data:
+                            timestamp_str = data.get('timestamp', datetime.now().isoformat()).replace('Z', '+00:00')
+                            timestamp = datetime.fromisoformat(timestamp_str)
+                            if timestamp.tzinfo:
+                                timestamp = timestamp.replace(tzinfo=None)
+
+                            new_todos.append((todo.get('content', ''), todo.get('status', 'pending'),
+                                              todo.get('activeForm', ''), timestamp))
+                        session['todos'] = new_todos
+
+            if 'timestamp' in data:
+                try:
+                    timestamp_str = data['timestamp'].replace('Z', '+00:00')
+                    timestamp = datetime.fromisoformat(timestamp_str)
+                    if timestamp.tzinfo:
+                        timestamp = timestamp.replace(tzinfo=None)
+                    session['last_activity'] = timestamp
+                except Exception:
+                    pass
+
+    except json.JSONDecodeError:
+        pass
+    except Exception:
+        pass
+
+
+def reference_cli_handle_file_update(file_path: Path, session: dict, position: int) -> int:
+    """
+    基线 ClaudeMonitor.handle_file_update（会话已存在时）
+
+    Returns:
+        新的读取位置（行数）
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+
+            new_lines = lines[position:]
+            if new_lines:
+                position = len(lines)
+                for line in new_lines:
+                    reference_cli_parse_line(line, session)
+                session['last_activity'] = datetime.now()
+    except Exception:
+        pass
+    return position
@@ -0,0 +1,422 @@
+"""
+解析实现与基线的差分测试
+
+用基线解析逻辑（parse_reference.py，逐行复制自 bb56a71）和当前实现分别解析同一批会话文件，
+要求基线产生的每个字段都一致。输入包括：
+
+- 合成语料（benchmarks/corpus.py）中的全部会话文件
+- 在合成会话基础上随机变异的文件：截断的最后一行、写到一半的文件、
+  非法 UTF-8、BOM、CRLF、NUL、非对象 JSON 行、结构异常的 TodoWrite、ts 字段等
+
+被比较的实现登记在 SESSION_EXTRACTORS / TODO_EXTRACTORS 中，新增快速路径时加入即可。
+与基线相比有意改变的语义（比较时显式换算或排除）：
+
+- 桌面版只保留最后一条消息的预览（last_message），完整消息通过 last_message_ref 按需读取：
+  分别与基线完整消息的预览、基线完整消息比较
+- 桌面版读取 Claude Code 写入的 timestamp 字段（基线只读 ts），没有时间戳时开始时间取文件修改时间
+  （基线取当前时间，每次扫描都不同）：按这条规则重新计算基线的开始/最后活动时间后比较
+- 桌面版优先使用 ~/.claude/todos 下的独立 todo 文件：比较时 todo 目录为空，只比较回放 TodoWrite 的结果
+- 命令行版逐行跳过非法 UTF-8 的行，基线按文本读取整个文件，遇到非法编码时整个会话解析失败：
+  不是合法 UTF-8 的文件不比较命令行版
+- 命令行版增量读取：基线按行数记录读取位置，文件在行中间被读取时会丢掉那一行；
+  当前按字节偏移 + 未写完的行拼接，结果应与一次性解析追加后的整个文件相同
+
+    python -m pytest benchmarks/test_parse_equivalence.py
+    COLA_FUZZ_CASES=2000 python -m pytest benchmarks/test_parse_equivalence.py   # 更多随机用例
+"""
+import asyncio
+import json
+import os
+import random
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import pytest
+
+from parse_reference import (reference_cli_parse_session, reference_parse_claude_todos,
+                             reference_parse_session_file)
+from src.core.todo_parser import TodoParser
+from src.utils.message_preview import build_message_preview
+
+FUZZ_CASES = int(os.environ.get('COLA_FUZZ_CASES', '200'))
+FROZEN_NOW = datetime(2025, 6, 1, 12, 0, 0)
+
+
+class FrozenDatetime(datetime):
+    """now() 固定的 datetime（默认开始时间、活跃判断都依赖当前时间）"""
+
+    @classmethod
+    def now(cls, tz=None):
+        return FROZEN_NOW if tz is None else FROZEN_NOW.replace(tzinfo=tz)
+
+
+# ---- 比较用的字段 ----
+
+def todos_key(todos) -> List[tuple]:
+    return [(t.content, t.status, t.active_form) for t in todos]
+
+
+def session_key(session) -> Optional[dict]:
+    """桌面版 Session 中与基线对应的字段"""
+    if session is None:
+        return None
+    return {
+        'session_id': session.session_id,
+        'project_path': session.project_path,
+        'project_name': session.project_name,
+        'start_time': session.start_time,
+        'last_activity': session.last_activity,
+        'is_active': session.is_active,
+        'is_pinned': session.is_pinned,
+        'custom_name': session.custom_name,
+        'todos': todos_key(session.todos),
+        'message_count': session.message_count,
+        'last_message': session.last_message,
+        'full_message': session.load_last_message(),
+        'file_path': session.file_path,
+        'source_type': session.source_type,
+    }
+
+
+def reference_session_key(data: Optional[dict]) -> Optional[dict]:
+    """基线会话换算成 session_key 的形式（完整消息 -> 预览 + 按需读取的完整消息）"""
+    if data is None:
+        return None
+    key = dict(data, todos=todos_key(data['todos']))
+    message = data['last_message'] if data['message_count'] else None
+    key['last_message'] = build_message_preview(message) if message is not None else ""
+    key['full_message'] = message
+    return key
+
+
+def reference_with_timestamps(monitor, path: Path) -> Optional[dict]:
+    """基线会话，开始/最后活动时间按有意改变的规则重新计算（timestamp 优先于 ts，默认取文件修改时间）"""
+    data = reference_parse_session_file(monitor, path)
+    if data is None:
+        return None
+    times = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line.strip())
+            except json.JSONDecodeError:
+                continue
+            ts = None
+            if 'timestamp' in record:
+                try:
+                    ts = datetime.fromisoformat(record['timestamp'].replace('Z', '+00:00')).replace(tzinfo=None)
+                except (AttributeError, ValueError):
+                    pass
+            elif 'ts' in record:
+                ts = datetime.fromisoformat(record['ts'])
+            if ts:
+                times.append(ts)
+    start_time = times[0] if times else datetime.fromtimestamp(path.stat().st_mtime)
+    return dict(data, start_time=start_time, last_activity=times[-1] if times else start_time)
+
+
+def cli_session_key(session) -> Optional[dict]:
+    """命令行版 ClaudeSession 中与基线对应的字段"""
+    if session is None:
+        return None
+    return {
+        'session_id': session.session_id,
+        'project_path': session.project_path,
+        'project_name': session.project_name,
+        'start_time': session.start_time,
+        'last_activity': session.last_activity,
+        'is_active': session.is_active,
+        'is_pinned': session.is_pinned,
+        'todos': [(t.content, t.status, t.activeForm, t.timestamp) for t in session.todos],
+        'message_count': session.message_count,
+        'last_message': session.last_message,
+        'file_path': session.file_path,
+    }
+
+
+def without_start_time(key: Optional[dict]) -> Optional[dict]:
+    """start_time 取自文件的 ctime，追加内容后会变化，增量读取时不比较"""
+    if key is None:
+        return None
+    return {name: value for name, value in key.items() if name != 'start_time'}
+
+
+# ---- 命令行版 ----
+
+def cli_parse(monitor, path: Path):
+    result = monitor.parse_session_file(path)
+    return result[0] if result is not None else None
+
+
+def reference_cli_parse(monitor, path: Path):
+    result = reference_cli_parse_session(path)
+    return result[0] if result is not None else None
+
+
+def append_split(data: bytes, path: Path) -> Optional[int]:
+    """
+    增量读取的切分位置：先写入 data[:split]，解析后再追加剩余部分
+
+    切分位置在最后一个换行符之前（可能在行中间），保证追加后至少有一个完整的新行；没有换行符时返回 None
+    """
+    last_newline = data.rfind(b'\n')
+    if last_newline < 0:
+        return None
+    rng = random.Random(zlib.crc32(str(path).encode('utf-8')))
+    return rng.randint(0, last_newline)
+
+
+def cli_parse_appended(monitor, path: Path):
+    """先解析文件的前半部分，再追加剩余内容，经 handle_file_update 增量读取（文件内容和修改时间最终不变）"""
+    data = path.read_bytes()
+    split = append_split(data, path)
+    if split is None:
+        return cli_parse(monitor, path)
+    stat = path.stat()
+
+    async def parse_then_append():
+        path.write_bytes(data[:split])
+        session = await monitor.parse_session(path)
+        with open(path, 'ab') as f:
+            f.write(data[split:])
+        if session is None:
+            return None
+        monitor.sessions[session.session_id] = session
+        await monitor.handle_file_update(str(path))
+        return monitor.sessions.pop(session.session_id)
+
+    try:
+        return asyncio.run(parse_then_append())
+    finally:
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+
+def reference_cli_parse_appended(monitor, path: Path):
+    """基线一次性解析整个文件；有新行追加时 handle_file_update 把最后活动时间设为当前时间"""
+    session = reference_cli_parse(monitor, path)
+    if session is not None and append_split(path.read_bytes(), path) is not None:
+        session['last_activity'] = FrozenDatetime.now()
+    return session
+
+
+# ---- 被比较的实现 ----
+
+class Extractor(NamedTuple):
+    monitor: str                        # 提供监控器的 fixture
+    parse: Callable[[Any, Path], Any]   # 当前实现（先执行，可以修改后再恢复文件）
+    reference: Callable[[Any, Path], Any]
+    key: Callable[[Any], Any]
+    reference_key: Callable[[Any], Any]
+    utf8_only: bool = False             # 只比较合法 UTF-8 的文件
+
+
+# 名称 -> 被比较的实现
+TODO_EXTRACTORS: Dict[str, Callable] = {
+    'TodoParser.parse_claude_todos': TodoParser.parse_claude_todos,
+}
+SESSION_EXTRACTORS: Dict[str, Extractor] = {
+    'ClaudeSessionMonitor.parse_session_file': Extractor(
+        'claude_monitor', lambda monitor, path: monitor.parse_session_file(path), reference_with_timestamps,
+        session_key, reference_session_key),
+    'ClaudeMonitor.parse_session_file': Extractor(
+        'cli_monitor', cli_parse, reference_cli_parse, cli_session_key, lambda data: data, utf8_only=True),
+    'ClaudeMonitor.read_appended_lines': Extractor(
+        'cli_monitor', cli_parse_appended, reference_cli_parse_appended,
+        lambda session: without_start_time(cli_session_key(session)), without_start_time, utf8_only=True),
+}
+
+
+# ---- 变异 ----
+
+ODD_LINES = [
+    b'',
+    b'   ',
+    b'not json at all',
+    b'{"type": "user", "message": ',  # 写到一半的行
+    b'[1, 2, 3]',
+    b'42',
+    b'"just a string"',
+    b'null',
+    b'{"message": null}',
+    b'{"message": {"content": null}}',
+    b'{"message": {"content": "plain string content"}}',
+    b'{"message": {"content": [{"type": "tool_use", "name": "TodoWrite"}]}}',
+    b'{"message": {"content": [{"type": "tool_use", "name": "TodoWrite", "input": {"todos": "oops"}}]}}',
+    b'{"message": {"content": [{"type": "tool_use", "name": "TodoWrite", "input": {"todos": [1, null]}}]}}',
+    b'{"message": {"content": [{"type": "tool_use", "name": "TodoWrite", "input": {"todos": '
+    b'[{"content": "bad status", "status": "blocked", "activeForm": "x"}]}}]}}',
+    b'{"message": {"content": [{"type": "tool_use", "name": "TodoWrite", "input": {"todos": []}}]}}',
+    b'{"ts": "2025-01-02T03:04:05", "message": {"role": "user", "content": "with ts"}}',
+    b'{"ts": "not a timestamp", "message": {"role": "user", "content": "bad ts"}}',
+    b'{"type": "user", "timestamp": "2025-01-02T03:04:05Z", "message": {"role": "user", "content": "utc"}}',
+    b'{"type": "user", "timestamp": "yesterday", "message": {"role": "user", "content": "bad timestamp"}}',
+    b'{"message": {"role": "user", "content": "\\ud800 lone surrogate"}}',
+    b'{"message": {"role": "user", "content": "caf\xe9 latin-1"}}',  # 非法 UTF-8
+    b'\xff\xfe{"message": {"content": []}}',
+    b'\xef\xbb\xbf{"type": "user", "message": {"role": "user", "content": "bom"}}',
+    b'{"message": {"role": "user", "content": "nul \x00 byte"}}',
+    '{"message": {"role": "user", "content": "中文 emoji 🥤 多字节"}}'.encode('utf-8'),
+]
+
+
+def mutate(data: bytes, rng: random.Random) -> bytes:
+    """对会话文件内容做 1~3 个随机变异"""
+    lines = data.split(b'\n')
+    for _ in range(rng.randint(1, 3)):
+        kind = rng.randrange(7)
+        if kind == 0:
+            # 插入异常行
+            lines.insert(rng.randint(0, len(lines)), rng.choice(ODD_LINES))
+        elif kind == 1 and lines:
+            # 截断某一行
+            i = rng.randrange(len(lines))
+            lines[i] = lines[i][:rng.randint(0, max(0, len(lines[i]) - 1))]
+        elif kind == 2:
+            # 文件只写了一部分（在任意字节处截断）
+            joined = b'\n'.join(lines)
+            lines = joined[:rng.randint(0, len(joined))].split(b'\n')
+        elif kind == 3 and lines:
+            # UTF-8 BOM
+            lines[0] = b'\xef\xbb\xbf' + lines[0]
+        elif kind == 4:
+            # Windows 换行
+            lines = [line + b'\r' for line in lines]
+        elif kind == 5 and lines:
+            # 多字节字符被截断
+            i = rng.randrange(len(lines))
+            lines[i] = lines[i] + '🥤'.encode('utf-8')[:rng.randint(1, 3)]
+        elif kind == 6:
+            # 文件末尾没有换行
+            while lines and lines[-1] == b'':
+                lines.pop()
+    return b'\n'.join(lines)
+
+
+# ---- fixtures ----
+
+@pytest.fixture
+def frozen_time(monkeypatch):
+    import parse_reference
+    monkeypatch.setattr(parse_reference, 'datetime', FrozenDatetime)
+    for module in ('src.core.session_monitor', 'src.core.base_monitor', 'claudecode_cola'):
+        try:
+            monkeypatch.setattr(f'{module}.datetime', FrozenDatetime)
+        except ImportError:
+            pass
+
+
+@pytest.fixture
+def claude_monitor(corpus_root, frozen_time, monkeypatch, tmp_path):
+    pytest.importorskip('watchdog')
+    # 标记/自定义名称按 HOME 定位，指向语料目录，避免读取真实配置
+    monkeypatch.setenv('HOME', str(corpus_root))
+    from src.core.session_monitor import ClaudeSessionMonitor
+    # 基线总是回放 TodoWrite，todo 目录为空时两边走同一条路径
+    monitor = ClaudeSessionMonitor(corpus_root / '.claude' / 'projects', todos_dir=tmp_path / 'todos')
+    monitor.todo_cache.refresh()
+    return monitor
+
+
+@pytest.fixture
+def cli_monitor(corpus_root, monkeypatch):
+    pytest.importorskip('watchdog')
+    pytest.importorskip('rich')
+    monkeypatch.setenv('HOME', str(corpus_root))
+    import claudecode_cola
+    monkeypatch.setattr(claudecode_cola, 'datetime', FrozenDatetime)
+    import parse_reference
+    monkeypatch.setattr(parse_reference, 'datetime', FrozenDatetime)
+    monitor = claudecode_cola.ClaudeMonitor()
+    yield monitor
+    if monitor.parse_executor is not None:
+        monitor.parse_executor.shutdown()
+
+
+def corpus_files(corpus_root: Path) -> List[Path]:
+    return sorted((corpus_root / '.claude' / 'projects').rglob('*.jsonl'))
+
+
+def fuzzed_files(corpus_root: Path, out_dir: Path, cases: int) -> List[Path]:
+    """把合成会话随机变异后写到 out_dir 下同名的项目目录中（会话ID不同，没有独立 todo 文件）"""
+    rng = random.Random(1234)
+    sources = corpus_files(corpus_root)
+    files = []
+    for case in range(cases):
+        source = rng.choice(sources)
+        project_dir = out_dir / source.parent.name
+        project_dir.mkdir(exist_ok=True)
+        target = project_dir / f'fuzz-{case:05d}.jsonl'
+        target.write_bytes(mutate(source.read_bytes(), rng))
+        files.append(target)
+    # 一些极端情况
+    for name, content in (('fuzz-empty', b''), ('fuzz-newlines', b'\n\n\n'),
+                          ('fuzz-odd-only', b'\n'.join(ODD_LINES)),
+                          ('fuzz-bom-only', b'\xef\xbb\xbf{"type": "user", "message": {"content": "x"}}\n')):
+        target = out_dir / sources[0].parent.name / f'{name}.jsonl'
+        target.write_bytes(content)
+        files.append(target)
+    return files
+
+
+@pytest.fixture(scope='module')
+def fuzz_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp('fuzz')
+
+
+# ---- 比较 ----
+
+def is_utf8(path: Path) -> bool:
+    try:
+        path.read_bytes().decode('utf-8')
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def _assert_todos_equal(files: List[Path]):
+    for name, extractor in TODO_EXTRACTORS.items():
+        for file_path in files:
+            expected = reference_parse_claude_todos(file_path)
+            actual = extractor(file_path)
+            assert todos_key(actual) == todos_key(expected), f"{name} 与基线不一致: {file_path}"
+
+
+def _assert_sessions_equal(request, name: str, files: List[Path]):
+    extractor = SESSION_EXTRACTORS[name]
+    monitor = request.getfixturevalue(extractor.monitor)
+    compared = 0
+    for file_path in files:
+        if extractor.utf8_only and not is_utf8(file_path):
+            continue
+        actual = extractor.key(extractor.parse(monitor, file_path))
+        expected = extractor.reference_key(extractor.reference(monitor, file_path))
+        assert actual == expected, f"{name} 与基线不一致: {file_path}"
+        compared += 1
+    assert compared, f"{name} 没有可比较的文件"
+
+
+def test_todos_match_reference_on_corpus(corpus_root):
+    files = corpus_files(corpus_root)
+    assert files
+    _assert_todos_equal(files)
+
+
+def test_todos_match_reference_on_fuzzed(corpus_root, fuzz_dir):
+    _assert_todos_equal(fuzzed_files(corpus_root, fuzz_dir, FUZZ_CASES))
+
+
+@pytest.mark.parametrize('name', sorted(SESSION_EXTRACTORS))
+def test_sessions_match_reference_on_corpus(request, name, corpus_root):
+    _assert_sessions_equal(request, name, corpus_files(corpus_root))
+
+
+@pytest.mark.parametrize('name', sorted(SESSION_EXTRACTORS))
+def test_sessions_match_reference_on_fuzzed(request, name, corpus_root, fuzz_dir):
+    _assert_sessions_equal(request, name, fuzzed_files(corpus_root, fuzz_dir, FUZZ_CASES))
+
+
+def test_reference_sees_todowrite(corpus_root):
+    """确认语料确实覆盖了 TodoWrite 路径（避免两边都返回空列表而"一致"）"""
+    assert any(len(reference_parse_claude_todos(path)) for path in corpus_files(corpus_root))
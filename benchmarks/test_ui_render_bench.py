@@ -0,0 +1,178 @@
+"""
+界面渲染基准（pytest-qt，offscreen 平台）
+
+用合成会话列表反复调用界面的更新方法，记录每次更新的耗时和 Python 侧的内存分配：
+
+- MainWindow.refresh_sessions_display（通过 update_sessions）
+- MainWindow.update_stats
+- MainWindow.update_todos_summary（todo 面板由测试单独创建，主窗口没有使用它）
+- TrayPopup.update_sessions
+
+会话数 / 每个会话的 todo 数逐级增大，每次更新按 churn 比例替换会话（状态、活动时间、todo 进度变化），
+churn=0 对应"扫描结果没有变化"的刷新。结果在测试结束后汇总输出：
+
+    python -m pytest benchmarks/test_ui_render_bench.py
+    COLA_BENCH_JSON=ui.json COLA_UI_BENCH_UPDATES=100 python -m pytest benchmarks/test_ui_render_bench.py
+
+分配统计来自 tracemalloc（与计时分开单独跑），只包含 Python 对象，不包含 Qt 的 C++ 分配。
+缺少 PyQt6 或 pytest-qt 时跳过。
+"""
+import dataclasses
+import os
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+import pytest
+
+# 必须在创建 QApplication 之前设置
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+pytest.importorskip('PyQt6.QtWidgets')
+pytest.importorskip('pytestqt')
+
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+from src.data.models import Session, TodoItem, TodoList, TodoStatus  # noqa: E402
+
+UPDATES = int(os.environ.get('COLA_UI_BENCH_UPDATES', '30'))
+ALLOC_UPDATES = 5
+BASE_TIME = datetime(2025, 1, 1, 9, 0, 0)
+
+# (会话数, 每个会话的 todo 数)
+SIZES = [(20, 5), (200, 10), (2000, 20)]
+CHURNS = [0.0, 0.1, 1.0]
+STATUSES = list(TodoStatus)
+IGNORE_TRACEMALLOC = [tracemalloc.Filter(False, tracemalloc.__file__)]  # 快照本身的分配
+
+
+class SessionFeed:
+    """生成会话列表，每次 next() 按 churn 比例替换其中的会话（模拟监控器的一次扫描结果）"""
+
+    def __init__(self, sessions: int, todos: int, churn: float, seed: int = 42):
+        self.rng = random.Random(seed)
+        self.todos = todos
+        self.churn = churn
+        self.sessions = [self._session(i) for i in range(sessions)]
+
+    def _todo_list(self, index: int) -> TodoList:
+        return TodoList.intern(
+            TodoItem(content=f"session {index} task {j}", status=self.rng.choice(STATUSES),
+                     active_form=f"Working on session {index} task {j}")
+            for j in range(self.todos)
+        )
+
+    def _session(self, index: int) -> Session:
+        start = BASE_TIME + timedelta(minutes=index)
+        return Session(
+            session_id=f"{index:08d}-0000-4000-8000-{index:012d}",
+            project_path=f"/work/project-{index % 50}",
+            project_name=f"/work/project-{index % 50}",
+            start_time=start,
+            last_activity=start,
+            is_active=self.rng.random() < 0.3,
+            is_pinned=self.rng.random() < 0.05,
+            todos=self._todo_list(index),
+            message_count=self.rng.randint(1, 500),
+            source_type='claude' if index % 4 else 'qoder',
+        )
+
+    def next(self) -> List[Session]:
+        sessions = list(self.sessions)
+        changed = round(len(sessions) * self.churn)
+        for index in self.rng.sample(range(len(sessions)), changed):
+            old = sessions[index]
+            sessions[index] = dataclasses.replace(
+                old,
+                is_active=not old.is_active if self.rng.random() < 0.2 else old.is_active,
+                last_activity=old.last_activity + timedelta(seconds=self.rng.randint(1, 120)),
+                todos=self._todo_list(index),
+                message_count=old.message_count + 1,
+            )
+        self.sessions = sessions
+        return sessions
+
+
+# 名称 -> 更新函数(window, popup, sessions)
+TARGETS: Dict[str, Callable] = {
+    'MainWindow.refresh_sessions_display': lambda window, popup, sessions: window.update_sessions(sessions),
+    'MainWindow.update_stats': lambda window, popup, sessions: window.update_stats(sessions),
+    'MainWindow.update_todos_summary': lambda window, popup, sessions: window.update_todos_summary(sessions),
+    'TrayPopup.update_sessions': lambda window, popup, sessions: popup.update_sessions(sessions),
+}
+
+
+@pytest.fixture
+def ui(qtbot, tmp_path, monkeypatch):
+    """在临时 HOME 下创建主窗口和托盘弹窗（配置文件不写入真实目录）"""
+    monkeypatch.setenv('HOME', str(tmp_path))
+    from src.data.config import Config
+    from src.ui.main_window import MainWindow
+    from src.ui.tray_popup import TrayPopup
+
+    window = MainWindow(Config())
+    popup = TrayPopup()
+    # 主窗口没有把 todo 面板加入布局，单独创建（由窗口持有），update_todos_summary 才有控件可更新
+    window.create_todos_panel().setParent(window)
+    qtbot.addWidget(window)
+    qtbot.addWidget(popup)
+    window.show()
+    return window, popup
+
+
+def render(update: Callable, window, popup, sessions: List[Session]) -> float:
+    """执行一次更新并处理掉由此产生的事件（deleteLater、重绘），返回耗时（毫秒）"""
+    start = time.perf_counter()
+    update(window, popup, sessions)
+    QApplication.processEvents()
+    return (time.perf_counter() - start) * 1000
+
+
+@pytest.mark.parametrize('churn', CHURNS)
+@pytest.mark.parametrize('sessions,todos', SIZES)
+@pytest.mark.parametrize('target', sorted(TARGETS))
+def test_render_latency(ui, bench_report, target, sessions, todos, churn):
+    window, popup = ui
+    update = TARGETS[target]
+    feed = SessionFeed(sessions, todos, churn)
+
+    first_ms = render(update, window, popup, feed.sessions)
+    durations = [render(update, window, popup, feed.next()) for _ in range(UPDATES)]
+
+    # 分配统计单独跑，避免 tracemalloc 的开销影响计时
+    blocks = []
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(ALLOC_UPDATES):
+            next_sessions = feed.next()
+            before = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            render(update, window, popup, next_sessions)
+            _, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            stats = after.filter_traces(IGNORE_TRACEMALLOC).compare_to(before.filter_traces(IGNORE_TRACEMALLOC),
+                                                                       'filename')
+            blocks.append(sum(stat.count_diff for stat in stats))
+            peaks.append(peak - base)
+    finally:
+        tracemalloc.stop()
+
+    durations.sort()
+    bench_report.append({
+        'target': target,
+        'sessions': sessions,
+        'todos': todos,
+        'churn': churn,
+        'first_ms': round(first_ms, 3),
+        'median_ms': round(statistics.median(durations), 3),
+        'p95_ms': round(durations[min(len(durations) - 1, int(len(durations) * 0.95))], 3),
+        'max_ms': round(durations[-1], 3),
+        'net_blocks': round(statistics.mean(blocks)),
+        'peak_kb': round(statistics.mean(peaks) / 1024, 1),
+    })
+    assert len(durations) == UPDATES
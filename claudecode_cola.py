@@ -4,24 +4,27 @@ ClaudeCode-Cola 🥤 - 让你的Claude Code会话像可乐一样清爽
 作者: 哈雅
 
 使用说明:
-- 标记会话: python claudecode_cola_api.py pin <会话ID>
-- 取消标记: python claudecode_cola_api.py unpin <会话ID>
+- 标记会话: python claudecode_cola_api.py pin <会话ID或唯一前缀> [...]
+- 取消标记: python claudecode_cola_api.py unpin <会话ID或唯一前缀> [...]
 - 查看标记列表: python claudecode_cola_api.py list
+- 输出一次会话列表: python claudecode_cola.py --once [--json]
+- 持续输出会话变化（NDJSON）: python claudecode_cola.py --watch
 """
 
 import os
 import json
+import argparse
 import asyncio
+import codecs
 import signal
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Set
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
 from collections import defaultdict
-import aiofiles
+from concurrent.futures import ThreadPoolExecutor
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
-import psutil
 from rich.console import Console
 from rich.live import Live
 from rich.table import Table
@@ -33,7 +36,10 @@ from rich.syntax import Syntax
 import time
 import threading
 import sys
-import select
+
+from claudecode_cola_proc import ProcScanner
+from src.core.control_server import ControlClient, ControlError, ControlServer, asyncio_invoker, daemon_available
+from src.core.session_index import SessionIdIndex
 
 
 # 白色背景主题配色
@@ -155,26 +161,107 @@ class JSONLWatcher(FileSystemEventHandler):
 class ClaudeMonitor:
     """Claude Code全局监控器"""
 
+    MAX_FPS = 10  # 界面最高刷新率（只在数据变化时刷新）
+    PARSE_CONCURRENCY = 2  # 同时解析的会话文件数（解析受 GIL 限制，多了只会互相争抢）
+
     def __init__(self):
         self.sessions: Dict[str, ClaudeSession] = {}
+        self.session_ids = SessionIdIndex()  # 有序会话ID，用于输入时的前缀匹配
+        self.control_server: Optional[ControlServer] = None
+        self.daemon: Optional[ControlClient] = None  # 连接守护进程时不再自己扫描
         self.active_sessions: Set[str] = set()
         self.claude_processes = []
+        self.process_scanner = ProcScanner()  # 增量扫描 /proc，只读取新进程的信息
         self.console = Console()
         self.observer = Observer()
-        self.file_positions = {}  # 记录每个文件的读取位置
+        self.file_positions: Dict[str, int] = {}  # 每个文件已读取到的字节偏移
+        self._line_carry: Dict[str, bytes] = {}  # 每个文件末尾尚未写完的行（等待与后续内容拼接）
+        self.parse_executor: Optional[ThreadPoolExecutor] = None  # 解析会话文件的线程池（按需创建）
+        self._parse_semaphore: Optional[asyncio.Semaphore] = None
         self.running = True
         self.input_queue = []  # 用于存储用户输入
-        self.input_mode = False  # 是否处于输入模式
-        self.input_buffer = ""  # 输入缓冲区
-        self.status_message = ""  # 状态消息
+        self._stdin_fd: Optional[int] = None  # 键盘监听中的 stdin（事件循环 add_reader）
+        self._terminal_settings = None  # 进入 cbreak 模式前的终端设置
+        self._stdin_decoder = None
+
+        # 界面脏版本：会话数据、状态消息、输入缓冲区变化时递增，界面只在版本变化时重新渲染
+        self.version = 0
+        self.sessions_version = 0  # 只随会话数据递增（统计、会话列表、TodoWrite 汇总依赖它）
+        self._wake_ui = None  # 唤醒界面循环（run_ui 启动后设置，可在任意线程调用）
+        self._input_mode = False  # 是否处于输入模式
+        self._input_buffer = ""  # 输入缓冲区
+        self._status_message = ""  # 状态消息
+        self._status_message_time = 0.0
+
+        # 仪表板布局及各区域最近一次构建时依赖的数据
+        self._layout: Optional[Layout] = None
+        self._layout_sessions_version = -1
+        self._layout_footer_key = None
 
         # Claude项目根目录
         self.claude_root = Path.home() / '.claude' / 'projects'
 
+    def mark_dirty(self, sessions: bool = True):
+        """
+        记录界面数据发生了变化（可在任意线程调用）
+
+        Args:
+            sessions: 会话数据是否变化（为 False 时只有页脚需要重新构建）
+        """
+        if sessions:
+            self.sessions_version += 1
+        self.version += 1
+        if self._wake_ui is not None:
+            try:
+                self._wake_ui()
+            except RuntimeError:
+                pass  # 事件循环已关闭
+
+    @property
+    def status_message(self) -> str:
+        return self._status_message
+
+    @status_message.setter
+    def status_message(self, value: str):
+        self._status_message_time = time.time()  # 重复设置相同的消息也重新计时
+        if value != self._status_message:
+            self._status_message = value
+            self.mark_dirty(sessions=False)
+
+    @property
+    def input_mode(self) -> bool:
+        return self._input_mode
+
+    @input_mode.setter
+    def input_mode(self, value: bool):
+        if value != self._input_mode:
+            self._input_mode = value
+            self.mark_dirty(sessions=False)
+
+    @property
+    def input_buffer(self) -> str:
+        return self._input_buffer
+
+    @input_buffer.setter
+    def input_buffer(self, value: str):
+        if value != self._input_buffer:
+            self._input_buffer = value
+            self.mark_dirty(sessions=False)
+
+    def expire_status_message(self):
+        """状态消息显示 3 秒后清空（输入模式下的提示不清空）"""
+        if self.status_message and not self.input_mode and time.time() - self._status_message_time > 3:
+            self.status_message = ""
+
     async def start(self):
         """启动监控器"""
         self.console.print(f"[{THEME['primary']}]🥤 启动 ClaudeCode-Cola...[/]")
 
+        # 守护进程（src/daemon.py）在运行时直接订阅它的会话数据
+        if daemon_available():
+            await self.attach_daemon()
+            return
+
         # 扫描现有会话
         await self.scan_existing_sessions()
 
@@ -187,9 +274,67 @@ class ClaudeMonitor:
         # 启动键盘输入监听
         self.start_input_listener()
 
+        # 启动本地控制接口（claudecode_cola_api.py 通过它直接操作当前会话）
+        self.control_server = ControlServer(self.control_methods(),
+                                            invoker=asyncio_invoker(asyncio.get_running_loop()))
+        self.control_server.start()
+
         # 启动UI
         await self.run_ui()
 
+    async def attach_daemon(self):
+        """订阅守护进程推送的快照和变更集，不扫描文件、不监控进程"""
+        self.console.print(f"[{THEME['success']}]🔗 检测到守护进程，使用守护进程的会话数据[/]")
+        self.daemon = ControlClient()
+        loop = asyncio.get_running_loop()
+
+        def subscribe_thread():
+            while self.running:
+                try:
+                    for event in self.daemon.subscribe():
+                        loop.call_soon_threadsafe(self.apply_daemon_event, event)
+                        if not self.running:
+                            return
+                    message = "⚠️ 与守护进程的连接已断开，正在重连..."
+                except (OSError, ControlError, ValueError):
+                    message = "⚠️ 无法连接守护进程，正在重连..."
+                # 界面状态只在事件循环线程中修改
+                loop.call_soon_threadsafe(setattr, self, 'status_message', message)
+                time.sleep(2)
+
+        threading.Thread(target=subscribe_thread, daemon=True).start()
+        self.start_input_listener()
+        await self.run_ui()
+
+    def apply_daemon_event(self, event: dict):
+        """应用守护进程推送的事件（在事件循环线程中执行，只保留 Claude Code 会话）"""
+        kind = event.get('event')
+        if kind == 'snapshot':
+            self.sessions.clear()
+            self.session_ids.clear()
+            self.active_sessions.clear()
+            upserted = event.get('sessions', ())
+        elif kind == 'changes':
+            for session_id in event.get('removed', ()):
+                self.sessions.pop(session_id, None)
+                self.session_ids.remove(session_id)
+                self.active_sessions.discard(session_id)
+            upserted = event.get('upserted', ())
+        else:
+            return
+
+        for data in upserted:
+            if data.get('source_type', 'claude') != 'claude':
+                continue
+            session = self._session_from_dict(data)
+            self.sessions[session.session_id] = session
+            self.session_ids.add(session.session_id)
+            if session.is_active:
+                self.active_sessions.add(session.session_id)
+            else:
+                self.active_sessions.discard(session.session_id)
+        self.mark_dirty()
+
     def load_pinned_sessions(self):
         """从配置文件加载已标记的会话"""
         from claudecode_cola_api import load_pinned_sessions
@@ -204,7 +349,7 @@ class ClaudeMonitor:
             return set()
 
     async def scan_existing_sessions(self):
-        """扫描所有现有的Claude会话"""
+        """扫描所有现有的Claude会话（文件在线程池中并发解析，事件循环保持响应）"""
         self.console.print(f"[{THEME['warning']}]📂 扫描现有会话文件...[/]")
 
         session_count = 0
@@ -215,23 +360,70 @@ class ClaudeMonitor:
         ) as progress:
             task = progress.add_task("扫描中...", total=None)
 
-            if self.claude_root.exists():
-                for project_dir in self.claude_root.iterdir():
-                    if project_dir.is_dir():
-                        for jsonl_file in project_dir.glob('*.jsonl'):
-                            session = await self.parse_session(jsonl_file)
-                            if session:
-                                self.sessions[session.session_id] = session
-                                session_count += 1
-                                progress.update(task, description=f"已扫描 {session_count} 个会话")
+            loop = asyncio.get_running_loop()
+            files = await loop.run_in_executor(self._get_parse_executor(), self.list_session_files)
+            pending = [asyncio.ensure_future(self.parse_session(jsonl_file)) for jsonl_file in files]
+            for future in asyncio.as_completed(pending):
+                session = await future
+                if session:
+                    self.sessions[session.session_id] = session
+                    self.session_ids.add(session.session_id)
+                    session_count += 1
+                    progress.update(task, description=f"已扫描 {session_count} 个会话")
 
         # 加载已标记的会话状态
         self.load_pinned_sessions()
+        self.mark_dirty()
 
         self.console.print(f"[{THEME['success']}]✓ 扫描完成，找到 {session_count} 个会话[/]")
 
+    def list_session_files(self) -> List[Path]:
+        """列出所有项目目录下的会话文件"""
+        files = []
+        if self.claude_root.exists():
+            for project_dir in self.claude_root.iterdir():
+                if project_dir.is_dir():
+                    files.extend(project_dir.glob('*.jsonl'))
+        return files
+
+    def _get_parse_executor(self) -> ThreadPoolExecutor:
+        if self.parse_executor is None:
+            self.parse_executor = ThreadPoolExecutor(max_workers=self.PARSE_CONCURRENCY,
+                                                     thread_name_prefix='cola-parse')
+        return self.parse_executor
+
     async def parse_session(self, file_path: Path) -> Optional[ClaudeSession]:
-        """解析单个会话文件"""
+        """
+        解析单个会话文件
+
+        解析在线程池中执行，同时解析的文件数由信号量限制；
+        读取位置和活跃状态在事件循环线程中登记
+        """
+        if self._parse_semaphore is None:
+            self._parse_semaphore = asyncio.Semaphore(self.PARSE_CONCURRENCY)
+        async with self._parse_semaphore:
+            result = await asyncio.get_running_loop().run_in_executor(
+                self._get_parse_executor(), self.parse_session_file, file_path)
+        if result is None:
+            return None
+
+        session, offset, carry = result
+        self.file_positions[str(file_path)] = offset
+        if carry:
+            self._line_carry[str(file_path)] = carry
+        else:
+            self._line_carry.pop(str(file_path), None)
+        if session.is_active:
+            self.active_sessions.add(session.session_id)
+        return session
+
+    def parse_session_file(self, file_path: Path) -> Optional[Tuple[ClaudeSession, int, bytes]]:
+        """
+        同步解析单个会话文件（在工作线程中执行，不修改监控器的共享状态）
+
+        Returns:
+            (会话, 已读取的字节数, 末尾未写完的行)，不是有效会话时返回 None
+        """
         try:
             session_id = file_path.stem
             # 过滤掉看起来不是真实会话的ID（如agent-开头的）
@@ -262,13 +454,16 @@ class ClaudeMonitor:
                 file_path=str(file_path)
             )
 
-            # 读取文件内容，提取TodoWrite和其他信息
-            async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
-                lines = await f.readlines()
-                self.file_positions[str(file_path)] = len(lines)
-
-                for line in lines:
-                    await self.parse_line(line, session)
+            # 读取文件内容，提取TodoWrite和其他信息（按字节读取，偏移用于之后的增量读取）
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            lines = data.split(b'\n')
+            carry = lines.pop()
+            if carry and self.is_complete_line(carry):
+                # 最后一行没有换行符但内容完整
+                lines.append(carry)
+                carry = b''
+            self.parse_lines(lines, session)
 
             # 初始扫描时，检查文件最近是否有修改来确定是否活跃
             try:
@@ -278,24 +473,37 @@ class ClaudeMonitor:
                 # 只有文件在最近2分钟内有修改才标记为活跃
                 if time_diff < 120:  # 2分钟
                     session.is_active = True
-                    self.active_sessions.add(session_id)
             except:
                 # 如果无法获取文件状态，使用时间戳判断
                 time_diff = (datetime.now() - session.last_activity).total_seconds()
                 if time_diff < 120:  # 2分钟
                     session.is_active = True
-                    self.active_sessions.add(session_id)
 
-            return session
+            return session, len(data), carry
 
         except Exception as e:
             # 静默处理错误，避免影响其他文件的解析
             return None
 
-    async def parse_line(self, line: str, session: ClaudeSession) -> None:
-        """解析JSONL行，提取关键信息"""
+    @staticmethod
+    def is_complete_line(line: bytes) -> bool:
+        """没有换行符结尾的行是否已经是完整的 JSON"""
+        try:
+            json.loads(line.decode('utf-8'))
+            return True
+        except ValueError:
+            return False
+
+    def parse_lines(self, lines: Iterable[bytes], session: ClaudeSession) -> None:
+        """依次解析多行JSONL（同步批量解析，不为每一行创建协程）"""
+        for line in lines:
+            self.parse_line(line, session)
+
+    def parse_line(self, line: bytes, session: ClaudeSession) -> None:
+        """解析JSONL行（UTF-8 字节），提取关键信息"""
         try:
-            data = json.loads(line.strip())
+            # 按 UTF-8 文本解析（与按文本读取时一致：带 BOM 的行不是合法 JSON，跳过）
+            data = json.loads(line.decode('utf-8').strip())
 
             # 更新消息计数
             if data.get('type') in ['user', 'assistant']:
@@ -351,7 +559,7 @@ class ClaudeMonitor:
             pass
 
     async def handle_file_update(self, file_path: str):
-        """处理文件更新事件"""
+        """处理文件更新事件（只读取上次读取位置之后追加的内容）"""
         try:
             # 从文件路径提取session_id
             path = Path(file_path)
@@ -362,33 +570,74 @@ class ClaudeMonitor:
                 await self.handle_new_session(file_path)
                 return
 
-            # 读取新增的行
-            async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
-                lines = await f.readlines()
-
-                # 获取上次读取的位置
-                last_position = self.file_positions.get(file_path, 0)
-                new_lines = lines[last_position:]
-
-                if new_lines:
-                    self.file_positions[file_path] = len(lines)
+            # 读取新增的完整行
+            new_lines = self.read_appended_lines(file_path)
+            if new_lines is None:
+                # 文件被截断或重写，重新解析整个文件
+                await self.reload_session(file_path)
+                return
 
-                    # 解析新行
-                    session = self.sessions[session_id]
-                    for line in new_lines:
-                        await self.parse_line(line, session)
+            if new_lines:
+                # 解析新行
+                session = self.sessions[session_id]
+                self.parse_lines(new_lines, session)
 
-                    # 更新活动时间，但不立即标记为活跃，等待UI循环中的文件修改时间检查来更新状态
-                    session.last_activity = datetime.now()
+                # 更新活动时间，但不立即标记为活跃，等待UI循环中的文件修改时间检查来更新状态
+                session.last_activity = datetime.now()
+                self.mark_dirty()
 
         except Exception as e:
             pass
 
+    def read_appended_lines(self, file_path: str) -> Optional[List[bytes]]:
+        """
+        读取文件自上次读取以来追加的完整行（耗时只与追加的字节数有关）
+
+        没有以换行符结尾且不是完整 JSON 的部分保存在 _line_carry 中，下次与新追加的内容拼接；
+        文件比已读取的字节数还小（被截断或重写）时返回 None
+        """
+        offset = self.file_positions.get(file_path, 0)
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < offset:
+                return None
+            f.seek(offset)
+            data = f.read()
+        if not data:
+            return []
+
+        self.file_positions[file_path] = offset + len(data)
+        lines = (self._line_carry.pop(file_path, b'') + data).split(b'\n')
+        carry = lines.pop()
+        if carry and self.is_complete_line(carry):
+            # 最后一行没有换行符但内容完整（与 parse_session_file 一致）
+            lines.append(carry)
+        elif carry:
+            self._line_carry[file_path] = carry
+        return lines
+
+    async def reload_session(self, file_path: str):
+        """重新解析整个会话文件（文件被截断或重写时），保留标记状态"""
+        self.file_positions.pop(file_path, None)
+        self._line_carry.pop(file_path, None)
+        old_session = self.sessions.get(Path(file_path).stem)
+
+        session = await self.parse_session(Path(file_path))
+        if session is None:
+            return
+        if old_session is not None:
+            session.is_pinned = old_session.is_pinned
+        if not session.is_active:
+            self.active_sessions.discard(session.session_id)
+        self.sessions[session.session_id] = session
+        self.mark_dirty()
+
     async def handle_new_session(self, file_path: str):
         """处理新会话创建"""
         session = await self.parse_session(Path(file_path))
         if session:
             self.sessions[session.session_id] = session
+            self.session_ids.add(session.session_id)
+            self.mark_dirty()
             self.console.print(f"[{THEME['success']}]🆕 发现新会话: {session.project_name}[/]")
 
     def start_file_watcher(self):
@@ -401,163 +650,250 @@ class ClaudeMonitor:
         self.console.print(f"[{THEME['success']}]👁️  文件监控已启动[/]")
 
     def start_input_listener(self):
-        """启动键盘输入监听线程"""
-        def input_thread():
-            import termios
-            import tty
-
-            # 检查是否在终端环境中运行
-            if not sys.stdin.isatty():
-                self.console.print(f"[{THEME['warning']}]⚠️  非终端环境,键盘监听已禁用[/]")
-                return
+        """在事件循环中监听键盘输入（stdin 可读时由事件循环回调，不需要轮询线程）"""
+        import termios
+        import tty
 
-            try:
-                # 保存原始终端设置
-                old_settings = termios.tcgetattr(sys.stdin)
-            except termios.error:
-                self.console.print(f"[{THEME['warning']}]⚠️  无法访问终端,键盘监听已禁用[/]")
-                return
+        # 检查是否在终端环境中运行
+        if not sys.stdin.isatty():
+            self.console.print(f"[{THEME['warning']}]⚠️  非终端环境,键盘监听已禁用[/]")
+            return
 
-            try:
-                # 设置终端为原始模式
-                tty.setcbreak(sys.stdin.fileno())
+        fd = sys.stdin.fileno()
+        try:
+            # 保存原始终端设置
+            self._terminal_settings = termios.tcgetattr(fd)
+        except termios.error:
+            self.console.print(f"[{THEME['warning']}]⚠️  无法访问终端,键盘监听已禁用[/]")
+            return
 
-                while self.running:
-                    # 检查是否有输入可用
-                    if select.select([sys.stdin], [], [], 0.1)[0]:
-                        # 读取第一个字符
-                        char = sys.stdin.read(1)
+        # 设置终端为 cbreak 模式（按键立即可读，不回显）
+        tty.setcbreak(fd)
+        self._stdin_decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        asyncio.get_running_loop().add_reader(fd, self._on_stdin_readable, fd)
+        self._stdin_fd = fd
 
-                        # 如果还有更多字符可读(处理粘贴),继续读取
-                        import fcntl
-                        import os
+        self.console.print(f"[{THEME['success']}]⌨️  键盘监听已启动[/]")
 
-                        # 设置为非阻塞模式临时读取剩余字符
-                        fd = sys.stdin.fileno()
-                        flags = fcntl.fcntl(fd, fcntl.F_GETFL)
-                        fcntl.fcntl(fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+    def stop_input_listener(self):
+        """停止键盘监听并恢复终端设置"""
+        import termios
 
-                        try:
-                            while True:
-                                try:
-                                    next_char = sys.stdin.read(1)
-                                    if next_char:
-                                        char += next_char
-                                    else:
-                                        break
-                                except IOError:
-                                    break
-                        finally:
-                            # 恢复阻塞模式
-                            fcntl.fcntl(fd, fcntl.F_SETFL, flags)
-
-                        # 处理所有读取到的字符
-                        for c in char:
-                            if not self.input_mode:
-                                # 非输入模式,检查是否是命令触发键
-                                if c == 'p':
-                                    self.input_mode = True
-                                    self.input_buffer = "p "
-                                    self.status_message = "输入会话ID进行标记 (按 Enter 确认, Esc 取消):"
-                                elif c == 'u':
-                                    self.input_mode = True
-                                    self.input_buffer = "u "
-                                    self.status_message = "输入会话ID取消标记 (按 Enter 确认, Esc 取消):"
-                            else:
-                                # 输入模式
-                                if c == '\n' or c == '\r':
-                                    # 确认输入
-                                    self.process_input(self.input_buffer)
-                                    self.input_mode = False
-                                    self.input_buffer = ""
-                                elif c == '\x1b':  # ESC键
-                                    # 取消输入
-                                    self.input_mode = False
-                                    self.input_buffer = ""
-                                    self.status_message = "已取消操作"
-                                    self._status_message_time = time.time()
-                                elif c == '\x7f':  # 退格键
-                                    if len(self.input_buffer) > 2:  # 保留 "p " 或 "u "
-                                        self.input_buffer = self.input_buffer[:-1]
-                                elif c.isprintable():
-                                    self.input_buffer += c
-            finally:
-                # 恢复终端设置
-                try:
-                    termios.tcsetattr(sys.stdin, termios.TCSADRAIN, old_settings)
-                except:
-                    pass
+        if self._stdin_fd is None:
+            return
+        try:
+            asyncio.get_running_loop().remove_reader(self._stdin_fd)
+        except RuntimeError:
+            pass  # 事件循环已停止
+        try:
+            termios.tcsetattr(self._stdin_fd, termios.TCSADRAIN, self._terminal_settings)
+        except termios.error:
+            pass
+        self._stdin_fd = None
 
-        # 启动输入线程
-        thread = threading.Thread(target=input_thread, daemon=True)
-        thread.start()
+    def _on_stdin_readable(self, fd: int):
+        """stdin 可读（在事件循环线程中执行），一次读完当前可用的所有字节（处理粘贴）"""
+        try:
+            data = os.read(fd, 4096)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b''
+        if not data:
+            # 终端已关闭
+            self.stop_input_listener()
+            return
 
-        # 如果在终端环境,显示启动信息
-        if sys.stdin.isatty():
-            self.console.print(f"[{THEME['success']}]⌨️  键盘监听已启动[/]")
+        # 多字节字符可能被拆到两次读取中，由增量解码器拼接
+        for c in self._stdin_decoder.decode(data):
+            self.handle_key(c)
+
+    def handle_key(self, c: str):
+        """处理一个按键"""
+        if not self.input_mode:
+            # 非输入模式,检查是否是命令触发键
+            if c == 'p':
+                self.input_mode = True
+                self.input_buffer = "p "
+                self.status_message = "输入会话ID或唯一前缀进行标记，多个用空格分隔 (按 Enter 确认, Esc 取消):"
+            elif c == 'u':
+                self.input_mode = True
+                self.input_buffer = "u "
+                self.status_message = "输入会话ID或唯一前缀取消标记，多个用空格分隔 (按 Enter 确认, Esc 取消):"
+        else:
+            # 输入模式
+            if c == '\n' or c == '\r':
+                # 确认输入
+                self.process_input(self.input_buffer)
+                self.input_mode = False
+                self.input_buffer = ""
+            elif c == '\x1b':  # ESC键
+                # 取消输入
+                self.input_mode = False
+                self.input_buffer = ""
+                self.status_message = "已取消操作"
+            elif c == '\x7f':  # 退格键
+                if len(self.input_buffer) > 2:  # 保留 "p " 或 "u "
+                    self.input_buffer = self.input_buffer[:-1]
+            elif c.isprintable():
+                self.input_buffer += c
 
     def process_input(self, input_text):
-        """处理用户输入"""
-        from claudecode_cola_api import pin_session, unpin_session, save_pinned_sessions, load_pinned_sessions
-
+        """处理用户输入（会话ID支持唯一前缀，可一次输入多个）"""
         parts = input_text.strip().split()
         if len(parts) < 2:
             self.status_message = "❌ 输入格式错误"
-            self._status_message_time = time.time()
             return
 
-        command = parts[0]
-        session_id = parts[1]
-
-        if command == 'p':
-            # 标记会话
-            if session_id in self.sessions:
-                session = self.sessions[session_id]
-                if not session.is_pinned:
-                    session.is_pinned = True
-                    # 保存到配置文件
-                    pinned_sessions = load_pinned_sessions()
-                    pinned_sessions.add(session_id)
-                    save_pinned_sessions(pinned_sessions)
-                    self.status_message = f"✅ 已标记会话: {session.project_name}"
-                else:
-                    self.status_message = f"⚠️  会话已被标记: {session.project_name}"
+        pin = parts[0] == 'p'
+        result = self.set_pinned(parts[1:], pin)
+
+        messages = [f"❌ {error['session_id']}: {error['message']}" for error in result['errors']]
+        if result['changed']:
+            action = "已标记会话" if pin else "已取消标记会话"
+            names = ', '.join(item['project_name'] or item['session_id'] for item in result['changed'])
+            messages.insert(0, f"✅ {action}: {names}")
+        self.status_message = "  ".join(messages)
+
+    def set_pinned(self, session_ids, pinned: bool) -> dict:
+        """
+        批量标记/取消标记会话（会话ID支持唯一前缀），只读写一次配置文件
+
+        Returns:
+            {'changed': [{'session_id', 'project_name'}], 'errors': [{'session_id', 'message', 'candidates'}]}
+        """
+        if self.daemon is not None:
+            # 由守护进程修改，结果通过订阅推送回来
+            try:
+                return self.daemon.call('pin' if pinned else 'unpin', session_ids=list(session_ids))
+            except (OSError, ControlError, ValueError) as e:
+                return {'changed': [], 'errors': [{'session_id': ' '.join(session_ids),
+                                                   'message': f"守护进程调用失败: {e}", 'candidates': []}]}
+
+        from claudecode_cola_api import save_pinned_sessions, load_pinned_sessions
+
+        pinned_ids = load_pinned_sessions()
+        changed = []
+        errors = []
+
+        for prefix in session_ids:
+            match = self.session_ids.resolve(prefix)
+            if match.session_id is None and not pinned and not match.candidates:
+                # 会话文件已删除但仍在标记列表中
+                match = SessionIdIndex(pinned_ids).resolve(prefix)
+            session_id = match.session_id
+            if session_id is None:
+                message = "会话ID前缀不唯一" if match.candidates else "会话不存在"
+                errors.append({'session_id': prefix, 'message': message, 'candidates': match.candidates})
+                continue
+
+            session = self.sessions.get(session_id)
+            is_pinned = session.is_pinned if session is not None else session_id in pinned_ids
+            if is_pinned == pinned:
+                message = "会话已经被标记" if pinned else "会话未被标记"
+                errors.append({'session_id': session_id, 'message': message, 'candidates': []})
+                continue
+
+            if session is not None:
+                session.is_pinned = pinned
+            if pinned:
+                pinned_ids.add(session_id)
             else:
-                self.status_message = f"❌ 会话 {session_id} 不存在"
+                pinned_ids.discard(session_id)
+            changed.append({'session_id': session_id,
+                            'project_name': session.project_name if session is not None else ''})
+
+        if changed:
+            save_pinned_sessions(pinned_ids)
+            self.mark_dirty()
+        return {'changed': changed, 'errors': errors}
+
+    def control_methods(self) -> dict:
+        """控制接口可调用的方法（在事件循环线程中执行）"""
+        return {
+            'pin': lambda session_ids: self.set_pinned(session_ids, True),
+            'unpin': lambda session_ids: self.set_pinned(session_ids, False),
+            'list': self._rpc_list,
+            'get_session': self._rpc_get_session,
+            'snapshot': self._rpc_snapshot,
+        }
 
-        elif command == 'u':
-            # 取消标记会话
-            if session_id in self.sessions:
-                session = self.sessions[session_id]
-                if session.is_pinned:
-                    session.is_pinned = False
-                    # 从配置文件移除
-                    pinned_sessions = load_pinned_sessions()
-                    pinned_sessions.discard(session_id)
-                    save_pinned_sessions(pinned_sessions)
-                    self.status_message = f"✅ 已取消标记会话: {session.project_name}"
-                else:
-                    self.status_message = f"⚠️  会话未被标记: {session.project_name}"
+    def _rpc_list(self) -> dict:
+        from claudecode_cola_api import load_pinned_sessions
+
+        sessions = []
+        missing = []
+        for session_id in sorted(load_pinned_sessions()):
+            session = self.sessions.get(session_id)
+            if session is not None:
+                sessions.append(self._session_to_dict(session))
             else:
-                self.status_message = f"❌ 会话 {session_id} 不存在"
+                missing.append(session_id)
+        return {'sessions': sessions, 'missing': missing}
+
+    def _rpc_get_session(self, session_id: str) -> dict:
+        match = self.session_ids.resolve(session_id)
+        if match.session_id is None:
+            raise ControlError("会话ID前缀不唯一" if match.candidates else f"会话 {session_id} 不存在")
+        return self._session_to_dict(self.sessions[match.session_id])
+
+    def _rpc_snapshot(self) -> dict:
+        return {
+            'generated_at': datetime.now().isoformat(),
+            'sessions': [self._session_to_dict(s) for s in self.sessions.values()],
+        }
+
+    @staticmethod
+    def _session_to_dict(session: ClaudeSession) -> dict:
+        """转换为与桌面版 Session.to_dict() 相同结构的字典"""
+        return {
+            'session_id': session.session_id,
+            'project_path': session.project_path,
+            'project_name': session.project_name,
+            'start_time': session.start_time.isoformat(),
+            'last_activity': session.last_activity.isoformat(),
+            'is_active': session.is_active,
+            'is_pinned': session.is_pinned,
+            'custom_name': '',
+            'todos': [
+                {'content': t.content, 'status': t.status, 'activeForm': t.activeForm}
+                for t in session.todos
+            ],
+            'message_count': session.message_count,
+            'last_message': session.last_message,
+            'file_path': session.file_path,
+            'source_type': 'claude',
+        }
 
-        # 设置状态消息时间戳
-        self._status_message_time = time.time()
+    @staticmethod
+    def _session_from_dict(data: dict) -> ClaudeSession:
+        """由 Session.to_dict() 格式的字典还原会话"""
+        return ClaudeSession(
+            session_id=data['session_id'],
+            project_path=data.get('project_path', ''),
+            project_name=data.get('project_name', ''),
+            start_time=datetime.fromisoformat(data['start_time']),
+            last_activity=datetime.fromisoformat(data['last_activity']),
+            is_active=data.get('is_active', False),
+            is_pinned=data.get('is_pinned', False),
+            todos=[TodoItem(content=t['content'], status=t['status'], activeForm=t.get('activeForm', ''))
+                   for t in data.get('todos', ())],
+            message_count=data.get('message_count', 0),
+            last_message=data.get('last_message', ''),
+            file_path=data.get('file_path', ''),
+        )
 
     async def monitor_processes(self):
         """监控Claude进程"""
         while self.running:
             try:
-                # 查找Claude进程
-                claude_pids = []
-                for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                    try:
-                        if 'claude' in proc.info['name'].lower():
-                            claude_pids.append(proc.info['pid'])
-                    except:
-                        continue
+                # 查找Claude进程（增量扫描，已知进程不会重复读取）
+                self.process_scanner.scan()
+                claude_pids = sorted(self.process_scanner.matched)
 
-                self.claude_processes = claude_pids
+                if claude_pids != self.claude_processes:
+                    self.claude_processes = claude_pids
+                    self.mark_dirty(sessions=False)
 
                 # 每10秒检查一次
                 await asyncio.sleep(10)
@@ -567,7 +903,31 @@ class ClaudeMonitor:
 
 
     def create_dashboard(self) -> Layout:
-        """创建仪表板布局"""
+        """
+        创建仪表板布局
+
+        Layout 只创建一次，各区域只在所依赖的数据变化时重新构建：
+        标题不变，统计/会话列表/TodoWrite 汇总跟随 sessions_version，页脚跟随输入和状态消息
+        """
+        if self._layout is None:
+            self._layout = self._create_layout()
+        layout = self._layout
+
+        if self._layout_sessions_version != self.sessions_version:
+            self._layout_sessions_version = self.sessions_version
+            layout["stats"].update(Panel(self.create_stats_table(), title="📊 概览统计", style=THEME['info']))
+            layout["sessions"].update(Panel(self.create_sessions_table(), title="💻 会话列表", style=THEME['success']))
+            layout["todos"].update(Panel(self.create_todos_panel(), title="📝 TodoWrite 汇总", style=THEME['warning']))
+
+        footer_key = (self.input_mode, self.input_buffer, self.status_message, len(self.claude_processes))
+        if self._layout_footer_key != footer_key:
+            self._layout_footer_key = footer_key
+            layout["footer"].update(Panel(self.create_footer_text(), style=THEME['primary']))
+
+        return layout
+
+    def _create_layout(self) -> Layout:
+        """创建仪表板的区域划分和不变的标题"""
         layout = Layout()
 
         # 分割布局
@@ -582,7 +942,16 @@ class ClaudeMonitor:
         header_text = Text("🥤 ClaudeCode-Cola", style=THEME['header_text'], justify="center")
         layout["header"].update(Panel(header_text, style=THEME['header_bg']))
 
-        # 统计信息
+        # 主内容区域 - 使用垂直布局
+        layout["main"].split_column(
+            Layout(name="sessions", ratio=3),  # 会话列表占主要空间
+            Layout(name="todos", size=10)  # TodoWrite 固定高度
+        )
+
+        return layout
+
+    def create_stats_table(self) -> Table:
+        """创建概览统计表格"""
         stats_table = Table(show_header=False, box=None, padding=(0, 2))
         stats_table.add_column(justify="center")
         stats_table.add_column(justify="center")
@@ -606,27 +975,10 @@ class ClaudeMonitor:
             f"[{THEME['warning']}]TodoWrite项目[/]\n[{THEME['text']}]{todo_projects}[/]",
             f"[{THEME['error']}]待完成任务[/]\n[{THEME['text']}]{pending_todos}[/]"
         )
+        return stats_table
 
-        layout["stats"].update(Panel(stats_table, title="📊 概览统计", style=THEME['info']))
-
-        # 主内容区域 - 使用垂直布局
-        main_layout = Layout()
-        main_layout.split_column(
-            Layout(name="sessions", ratio=3),  # 会话列表占主要空间
-            Layout(name="todos", size=10)  # TodoWrite 固定高度
-        )
-
-        # 会话列表
-        sessions_table = self.create_sessions_table()
-        main_layout["sessions"].update(Panel(sessions_table, title="💻 会话列表", style=THEME['success']))
-
-        # TodoWrite汇总
-        todos_panel = self.create_todos_panel()
-        main_layout["todos"].update(Panel(todos_panel, title="📝 TodoWrite 汇总", style=THEME['warning']))
-
-        layout["main"].update(main_layout)
-
-        # 页脚
+    def create_footer_text(self) -> Text:
+        """创建页脚文本"""
         if self.input_mode:
             # 输入模式：显示输入提示和缓冲区
             # 如果输入太长,只显示最后的部分
@@ -635,35 +987,25 @@ class ClaudeMonitor:
             if len(display_buffer) > max_display_len:
                 display_buffer = "..." + display_buffer[-(max_display_len-3):]
 
-            footer_text = Text(
+            return Text(
                 f"{self.status_message} {display_buffer}▊",
                 style=THEME['warning'],
                 justify="left",
                 overflow="ignore"  # 不截断文本
             )
-        elif self.status_message:
-            # 显示状态消息
-            footer_text = Text(
+        if self.status_message:
+            # 显示状态消息（3秒后由 expire_status_message 清空）
+            return Text(
                 f"进程: {len(self.claude_processes)} | {self.status_message} | 按 p 标记, u 取消标记 | Ctrl+C 退出",
                 style=THEME['primary'],
                 justify="center"
             )
-            # 清空状态消息（3秒后）
-            if not hasattr(self, '_status_message_time'):
-                self._status_message_time = time.time()
-            elif time.time() - self._status_message_time > 3:
-                self.status_message = ""
-                delattr(self, '_status_message_time')
-        else:
-            # 默认状态
-            footer_text = Text(
-                f"进程: {len(self.claude_processes)} | 按 p 标记会话, u 取消标记 | Ctrl+C 退出",
-                style=THEME['primary'],
-                justify="center"
-            )
-        layout["footer"].update(Panel(footer_text, style=THEME['primary']))
-
-        return layout
+        # 默认状态
+        return Text(
+            f"进程: {len(self.claude_processes)} | 按 p 标记会话, u 取消标记 | Ctrl+C 退出",
+            style=THEME['primary'],
+            justify="center"
+        )
 
     def create_sessions_table(self) -> Table:
         """创建会话列表表格"""
@@ -775,88 +1117,142 @@ class ClaudeMonitor:
         if session_id in self.sessions:
             session = self.sessions[session_id]
             session.is_pinned = not session.is_pinned
+            self.mark_dirty()
             if session.is_pinned:
                 self.console.print(f"[{THEME['success']}]📌 会话已标记: {session.project_name}[/]")
             else:
                 self.console.print(f"[{THEME['warning']}]⚪ 会话已取消标记: {session.project_name}[/]")
 
+    def check_active_sessions(self, current_time: datetime):
+        """清理非活跃会话（2分钟内无活动）"""
+        # 注意:标记的会话也需要更新is_active状态，以便正确显示icon颜色
+        changed = False
+        for session_id in list(self.active_sessions):
+            if session_id in self.sessions:
+                session = self.sessions[session_id]
+                try:
+                    file_stat = Path(session.file_path).stat()
+                    file_mtime = datetime.fromtimestamp(file_stat.st_mtime)
+                    # 使用文件修改时间来判断是否活跃
+                    if (current_time - file_mtime).total_seconds() > 120:  # 2分钟
+                        session.is_active = False
+                        self.active_sessions.discard(session_id)
+                        changed = True
+                except:
+                    # 如果无法获取文件状态，使用时间戳判断
+                    if (current_time - session.last_activity).total_seconds() > 120:  # 2分钟
+                        session.is_active = False
+                        self.active_sessions.discard(session_id)
+                        changed = True
+        if changed:
+            self.mark_dirty()
+
+    def refresh_session_activity(self, current_time: datetime):
+        """按文件修改时间更新所有会话的最后活动时间和活跃状态"""
+        changed = False
+        for session in self.sessions.values():
+            try:
+                file_stat = Path(session.file_path).stat()
+                file_mtime = datetime.fromtimestamp(file_stat.st_mtime)
+
+                # 更新会话的最后活动时间为文件修改时间
+                if session.last_activity != file_mtime:
+                    session.last_activity = file_mtime
+                    changed = True
+
+                # 如果文件最近2分钟内有修改，但会话未标记为活跃
+                if (current_time - file_mtime).total_seconds() < 120:  # 2分钟
+                    if not session.is_active:
+                        session.is_active = True
+                        self.active_sessions.add(session.session_id)
+                        changed = True
+                # 如果文件超过2分钟没有修改，标记为非活跃
+                # 注意:即使是标记的会话，也要更新is_active状态，以便正确显示icon颜色
+                else:
+                    if session.is_active:
+                        session.is_active = False
+                        self.active_sessions.discard(session.session_id)
+                        changed = True
+            except:
+                pass
+        if changed:
+            self.mark_dirty()
+
     async def run_ui(self):
-        """运行UI循环"""
+        """
+        运行UI循环
+
+        只在脏版本变化（会话数据、状态消息、输入缓冲区）或终端尺寸变化时重新构建并渲染，
+        空闲时事件循环只做每秒一次的活跃状态检查
+        """
+        loop = asyncio.get_running_loop()
+        wakeup = asyncio.Event()
+        self._wake_ui = lambda: loop.call_soon_threadsafe(wakeup.set)
+
+        rendered_version = self.version
+        rendered_size = self.console.size
+        last_render = 0.0
+        next_activity_check = 0.0
+        next_full_check = 0.0
+
         with Live(
             self.create_dashboard(),
-            refresh_per_second=4,  # 提高刷新率以更好地显示输入
+            auto_refresh=False,  # 由下面的循环在数据变化时刷新
             console=self.console
         ) as live:
             try:
                 while self.running:
-                    # 检查是否有键盘输入来处理标记操作
-                    if self.console.is_terminal:
+                    now = time.monotonic()
+
+                    # 连接守护进程时活跃状态由守护进程维护
+                    if self.daemon is None and now >= next_activity_check:
+                        next_activity_check = now + 1
+                        current_time = datetime.now()
+                        self.check_active_sessions(current_time)
+
+                        # 定期检查所有会话的文件修改时间（每5秒）
+                        if now >= next_full_check:
+                            next_full_check = now + 5
+                            self.refresh_session_activity(current_time)
+
+                    self.expire_status_message()
+
+                    size = self.console.size
+                    if self.version != rendered_version or size != rendered_size:
+                        # 连续输入时最多每秒渲染 MAX_FPS 次
+                        delay = last_render + 1 / self.MAX_FPS - time.monotonic()
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+                        rendered_version = self.version
+                        rendered_size = size
+                        live.update(self.create_dashboard(), refresh=True)
+                        last_render = time.monotonic()
+
+                    # 等待数据变化，最长等到下一次活跃状态检查
+                    wakeup.clear()
+                    if self.version == rendered_version:
                         try:
-                            # 检查键盘输入（非阻塞）
-                            if self.console.size:
-                                # 这里我们模拟键盘输入检测
-                                # 实际上rich Live不直接支持键盘输入，我们需要使用其他方式
-                                pass
-                        except:
+                            await asyncio.wait_for(wakeup.wait(), timeout=1)
+                        except asyncio.TimeoutError:
                             pass
 
-                    # 更新UI
-                    live.update(self.create_dashboard())
-
-                    # 清理非活跃会话（2分钟内无活动）
-                    # 注意:标记的会话也需要更新is_active状态，以便正确显示icon颜色
-                    current_time = datetime.now()
-                    for session_id in list(self.active_sessions):
-                        if session_id in self.sessions:
-                            session = self.sessions[session_id]
-                            try:
-                                file_stat = Path(session.file_path).stat()
-                                file_mtime = datetime.fromtimestamp(file_stat.st_mtime)
-                                # 使用文件修改时间来判断是否活跃
-                                if (current_time - file_mtime).total_seconds() > 120:  # 2分钟
-                                    session.is_active = False
-                                    self.active_sessions.discard(session_id)
-                            except:
-                                # 如果无法获取文件状态，使用时间戳判断
-                                if (current_time - session.last_activity).total_seconds() > 120:  # 2分钟
-                                    session.is_active = False
-                                    self.active_sessions.discard(session_id)
-
-                    # 定期检查所有会话的文件修改时间（每5秒）
-                    if int(current_time.timestamp()) % 5 == 0:
-                        for session in self.sessions.values():
-                            try:
-                                file_stat = Path(session.file_path).stat()
-                                file_mtime = datetime.fromtimestamp(file_stat.st_mtime)
-
-                                # 更新会话的最后活动时间为文件修改时间
-                                session.last_activity = file_mtime
-
-                                # 如果文件最近2分钟内有修改，但会话未标记为活跃
-                                if (current_time - file_mtime).total_seconds() < 120:  # 2分钟
-                                    if not session.is_active:
-                                        session.is_active = True
-                                        self.active_sessions.add(session.session_id)
-                                # 如果文件超过2分钟没有修改，标记为非活跃
-                                # 注意:即使是标记的会话，也要更新is_active状态，以便正确显示icon颜色
-                                else:
-                                    if session.is_active:
-                                        session.is_active = False
-                                        self.active_sessions.discard(session.session_id)
-                            except:
-                                pass
-
-                    await asyncio.sleep(1)
-
             except KeyboardInterrupt:
                 self.running = False
                 raise
+            finally:
+                self._wake_ui = None
 
     def cleanup(self):
         """清理资源"""
         self.console.print("\n[yellow]🛑 正在停止监控器...[/yellow]")
-        self.observer.stop()
-        self.observer.join()
+        self.stop_input_listener()
+        if self.control_server is not None:
+            self.control_server.stop()
+        if self.observer.is_alive():
+            self.observer.stop()
+            self.observer.join()
+        if self.parse_executor is not None:
+            self.parse_executor.shutdown(wait=False, cancel_futures=True)
         self.console.print("[green]✅ 监控器已停止[/green]")
 
 
@@ -878,6 +1274,26 @@ async def main():
         monitor.cleanup()
 
 
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="ClaudeCode-Cola 🥤 命令行版")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--once', action='store_true', help="输出一次会话列表后退出")
+    mode.add_argument('--watch', action='store_true', help="持续输出会话变化（NDJSON，每行一个事件）")
+    parser.add_argument('--json', action='store_true', help="以 JSON 输出（单独使用时等同于 --once --json）")
+    parser.add_argument('--max-age', type=float, default=60,
+                        help="--once 时可直接使用的已保存快照的最大时长（秒），0 表示总是重新扫描")
+    args = parser.parse_args(argv)
+    if args.json and not args.watch:
+        args.once = True
+    return args
+
+
 if __name__ == "__main__":
+    args = parse_args()
+    if args.once or args.watch:
+        # 无界面输出模式（供脚本读取）
+        from claudecode_cola_headless import run_headless
+        sys.exit(run_headless(args))
+
     # 运行监控器
     asyncio.run(main())
\ No newline at end of file
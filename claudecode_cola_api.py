@@ -2,6 +2,9 @@
 """
 ClaudeCode-Cola API接口
 用于外部命令控制（如标记/取消标记会话）
+
+有监控器（桌面应用或命令行版）在运行时通过控制接口（~/.claudecode-cola/control.sock）
+直接修改运行中的会话，立即生效；没有监控器运行时退回直接读写配置文件。
 """
 import json
 import os
@@ -9,6 +12,9 @@ import sys
 from pathlib import Path
 from datetime import datetime
 
+from src.core.control_server import ControlClient, ControlError
+from src.core.session_index import SessionIdIndex, load_index_entries
+
 # ClaudeCode-Cola配置目录
 CONFIG_DIR = Path.home() / '.claudecode-cola'
 CONFIG_FILE = CONFIG_DIR / 'pinned_sessions.json'
@@ -37,8 +43,78 @@ def save_pinned_sessions(pinned_sessions):
     with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
         json.dump(list(pinned_sessions), f, ensure_ascii=False, indent=2)
 
+_index_entries = None
+_session_id_index = None
+_session_id_index_scanned = False
+
+def get_index_entries():
+    """读取会话索引（每个进程只读取一次）"""
+    global _index_entries
+    if _index_entries is None:
+        _index_entries = load_index_entries() or {}
+    return _index_entries
+
+def get_session_id_index():
+    """会话ID有序索引（用于前缀匹配），没有会话索引文件时扫描一次项目目录构建"""
+    global _session_id_index
+    if _session_id_index is None:
+        session_ids = list(get_index_entries())
+        if not session_ids:
+            return scan_session_id_index()
+        _session_id_index = SessionIdIndex(session_ids)
+    return _session_id_index
+
+def scan_session_id_index():
+    """遍历项目目录重建会话ID索引（每个进程只遍历一次）"""
+    global _session_id_index, _session_id_index_scanned
+    if not _session_id_index_scanned:
+        session_ids = [f.stem for f in CLAUDE_ROOT.glob('*/*.jsonl')] if CLAUDE_ROOT.exists() else []
+        _session_id_index = SessionIdIndex(session_ids)
+        _session_id_index_scanned = True
+    return _session_id_index
+
+def _session_id_indexes(candidates_index):
+    """按顺序给出用于解析会话ID的索引"""
+    if candidates_index is not None:
+        yield candidates_index
+    yield get_session_id_index()
+    if not _session_id_index_scanned:
+        # 会话索引文件可能已过期（例如桌面应用未运行时新建的会话），遍历项目目录后再查一次
+        yield scan_session_id_index()
+
+def resolve_session_id(prefix, candidates_index=None):
+    """
+    将会话ID或其唯一前缀解析为完整会话ID，失败时打印原因并返回 None
+
+    candidates_index 不为空时优先在其中查找（例如取消标记时优先匹配已标记的会话）
+    """
+    for index in _session_id_indexes(candidates_index):
+        match = index.resolve(prefix)
+        if match.session_id:
+            return match.session_id
+        if match.candidates:
+            print(f"❌ 错误: 会话ID前缀 {prefix} 不唯一，匹配到:")
+            for session_id in match.candidates:
+                print(f"   - {session_id}")
+            return None
+    print(f"❌ 错误: 会话 {prefix} 不存在")
+    print("   提示: 请确认会话ID是否正确,或者该会话是否已经创建")
+    return None
+
+def decode_project_name(project_path):
+    """将Claude的路径编码转换为标准路径"""
+    if project_path.startswith('-'):
+        path_without_prefix = project_path[1:]
+        return '/' + path_without_prefix.replace('-', '/')
+    return project_path
+
 def session_exists(session_id):
     """检查会话是否存在"""
+    # 优先查询桌面应用维护的会话索引（O(1)），文件不存在时再退回遍历项目目录
+    entry = get_index_entries().get(session_id)
+    if entry and os.path.exists(entry.get('file_path', '')):
+        return True, entry.get('project_name') or decode_project_name(entry.get('project_path', ''))
+
     if not CLAUDE_ROOT.exists():
         return False, None
 
@@ -48,70 +124,138 @@ def session_exists(session_id):
             session_file = project_dir / f"{session_id}.jsonl"
             if session_file.exists():
                 # 获取项目名称
-                project_path = project_dir.name
-                if project_path.startswith('-'):
-                    # 将Claude的路径编码转换为标准路径
-                    path_without_prefix = project_path[1:]
-                    project_name = '/' + path_without_prefix.replace('-', '/')
-                else:
-                    project_name = project_path
-                return True, project_name
+                return True, decode_project_name(project_dir.name)
     return False, None
 
-def pin_session(session_id):
-    """标记会话"""
-    # 首先检查会话是否存在
-    exists, project_name = session_exists(session_id)
-    if not exists:
-        print(f"❌ 错误: 会话 {session_id} 不存在")
-        print("   提示: 请确认会话ID是否正确,或者该会话是否已经创建")
-        return False
+def call_monitor(method, **params):
+    """
+    调用运行中监控器的控制接口
+
+    Returns:
+        (是否有监控器处理了请求, 返回结果)
+    """
+    try:
+        return True, ControlClient().call(method, **params)
+    except ControlError as e:
+        print(f"❌ 错误: {e}")
+        return True, None
+    except (OSError, ValueError):
+        # 没有监控器在运行（或连接异常），使用文件模式
+        return False, None
+
+def print_remote_changes(result, pinned):
+    """打印控制接口返回的标记结果，返回变化的会话ID列表"""
+    if result is None:
+        return []
+    for error in result.get('errors', []):
+        print(f"❌ {error['session_id']}: {error['message']}")
+        for candidate in error.get('candidates', []):
+            print(f"   - {candidate}")
+    for item in result.get('changed', []):
+        action = "已标记" if pinned else "已取消标记"
+        print(f"✅ 会话 {item['session_id']} {action}")
+        if item.get('project_name'):
+            print(f"   项目: {item['project_name']}")
+    return [item['session_id'] for item in result.get('changed', [])]
+
+def pin_sessions(session_ids):
+    """
+    批量标记会话（支持会话ID前缀），只读写一次配置文件
+
+    Returns:
+        本次新标记的完整会话ID列表
+    """
+    handled, result = call_monitor('pin', session_ids=list(session_ids))
+    if handled:
+        return print_remote_changes(result, pinned=True)
 
     pinned_sessions = load_pinned_sessions()
-    if session_id in pinned_sessions:
-        print(f"⚠️  会话 {session_id} 已经被标记")
+    newly_pinned = []
+
+    for prefix in session_ids:
+        session_id = resolve_session_id(prefix)
+        if session_id is None:
+            continue
+
+        # 检查会话文件是否仍然存在
+        exists, project_name = session_exists(session_id)
+        if not exists:
+            print(f"❌ 错误: 会话 {session_id} 不存在")
+            print("   提示: 请确认会话ID是否正确,或者该会话是否已经创建")
+            continue
+
+        if session_id in pinned_sessions:
+            print(f"⚠️  会话 {session_id} 已经被标记")
+            print(f"   项目: {project_name}")
+            continue
+
+        pinned_sessions.add(session_id)
+        newly_pinned.append(session_id)
+        print(f"✅ 会话 {session_id} 已标记")
         print(f"   项目: {project_name}")
-        return False
 
-    pinned_sessions.add(session_id)
-    save_pinned_sessions(pinned_sessions)
-    print(f"✅ 会话 {session_id} 已标记")
-    print(f"   项目: {project_name}")
-    return True
+    if newly_pinned:
+        save_pinned_sessions(pinned_sessions)
+    return newly_pinned
+
+def unpin_sessions(session_ids):
+    """
+    批量取消标记会话（支持会话ID前缀，优先匹配已标记的会话），只读写一次配置文件
+
+    Returns:
+        本次取消标记的完整会话ID列表
+    """
+    handled, result = call_monitor('unpin', session_ids=list(session_ids))
+    if handled:
+        return print_remote_changes(result, pinned=False)
+
+    pinned_sessions = load_pinned_sessions()
+    pinned_index = SessionIdIndex(pinned_sessions)
+    unpinned = []
+
+    for prefix in session_ids:
+        match = pinned_index.resolve(prefix)
+        session_id = match.session_id
+        if session_id is None and match.candidates:
+            print(f"❌ 错误: 会话ID前缀 {prefix} 不唯一，匹配到:")
+            for candidate in match.candidates:
+                print(f"   - {candidate}")
+            continue
+        if session_id is None or session_id not in pinned_sessions:
+            print(f"会话 {prefix} 未被标记")
+            continue
+
+        pinned_sessions.remove(session_id)
+        pinned_index.remove(session_id)
+        unpinned.append(session_id)
+        print(f"会话 {session_id} 已取消标记")
+
+    if unpinned:
+        save_pinned_sessions(pinned_sessions)
+    return unpinned
+
+def pin_session(session_id):
+    """标记会话"""
+    return bool(pin_sessions([session_id]))
 
 def unpin_session(session_id):
     """取消标记会话"""
-    pinned_sessions = load_pinned_sessions()
-    if session_id not in pinned_sessions:
-        print(f"会话 {session_id} 未被标记")
-        return False
-    pinned_sessions.remove(session_id)
-    save_pinned_sessions(pinned_sessions)
-    print(f"会话 {session_id} 已取消标记")
-    return True
+    return bool(unpin_sessions([session_id]))
 
-def list_pinned_sessions():
-    """列出所有已标记的会话"""
-    pinned_sessions = load_pinned_sessions()
-    if not pinned_sessions:
+def print_pinned_sessions(valid_sessions, invalid_sessions):
+    """打印已标记的会话列表（valid_sessions 为 (会话ID, 项目) 列表）"""
+    total = len(valid_sessions) + len(invalid_sessions)
+    if not total:
         print("📭 没有已标记的会话")
         return
 
-    print(f"📌 已标记的会话 (共 {len(pinned_sessions)} 个):")
+    print(f"📌 已标记的会话 (共 {total} 个):")
     print("=" * 80)
 
     # 为每个标记的会话显示详细信息
-    valid_count = 0
-    invalid_sessions = []
-
-    for session_id in sorted(pinned_sessions):
-        exists, project_name = session_exists(session_id)
-        if exists:
-            valid_count += 1
-            print(f"\n  {valid_count}. 会话ID: {session_id}")
-            print(f"     项目: {project_name}")
-        else:
-            invalid_sessions.append(session_id)
+    for valid_count, (session_id, project_name) in enumerate(valid_sessions, 1):
+        print(f"\n  {valid_count}. 会话ID: {session_id}")
+        print(f"     项目: {project_name}")
 
     # 如果有无效的会话，给出提示
     if invalid_sessions:
@@ -121,12 +265,31 @@ def list_pinned_sessions():
             print(f"  - {session_id}")
         print("\n提示: 可以使用 unpin 命令取消标记这些无效会话")
 
+def list_pinned_sessions():
+    """列出所有已标记的会话"""
+    handled, result = call_monitor('list')
+    if handled:
+        if result is not None:
+            print_pinned_sessions([(s['session_id'], s['project_name']) for s in result['sessions']],
+                                  result['missing'])
+        return
+
+    valid_sessions = []
+    invalid_sessions = []
+    for session_id in sorted(load_pinned_sessions()):
+        exists, project_name = session_exists(session_id)
+        if exists:
+            valid_sessions.append((session_id, project_name))
+        else:
+            invalid_sessions.append(session_id)
+    print_pinned_sessions(valid_sessions, invalid_sessions)
+
 def main():
     if len(sys.argv) < 2:
         print("用法:")
-        print("  python claudecode_cola_api.py pin <会话ID>     # 标记会话")
-        print("  python claudecode_cola_api.py unpin <会话ID>   # 取消标记会话")
-        print("  python claudecode_cola_api.py list            # 列出所有标记的会话")
+        print("  python claudecode_cola_api.py pin <会话ID> [...]     # 标记会话（支持唯一前缀，可一次多个）")
+        print("  python claudecode_cola_api.py unpin <会话ID> [...]   # 取消标记会话")
+        print("  python claudecode_cola_api.py list                  # 列出所有标记的会话")
         sys.exit(1)
 
     command = sys.argv[1].lower()
@@ -135,14 +298,12 @@ def main():
         if len(sys.argv) < 3:
             print("错误: 请提供会话ID")
             sys.exit(1)
-        session_id = sys.argv[2]
-        pin_session(session_id)
+        pin_sessions(sys.argv[2:])
     elif command == 'unpin':
         if len(sys.argv) < 3:
             print("错误: 请提供会话ID")
             sys.exit(1)
-        session_id = sys.argv[2]
-        unpin_session(session_id)
+        unpin_sessions(sys.argv[2:])
     elif command == 'list':
         list_pinned_sessions()
     else:
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+ClaudeCode-Cola 无界面输出模式（供脚本和其他工具读取）
+
+    python claudecode_cola.py --once            输出一次会话列表后退出（每行一个会话，制表符分隔）
+    python claudecode_cola.py --once --json     输出一次会话快照（一个 JSON 对象）
+    python claudecode_cola.py --watch           持续输出会话变化（NDJSON，每行一个事件）
+
+数据来源按以下顺序选择：
+1. 运行中的监控器（守护进程 / 桌面应用 / 命令行版）的控制接口：直接取引擎内存中的会话，
+   --watch 时订阅守护进程推送的变更集
+2. 持久化的会话快照（~/.claudecode-cola/snapshot.json）：仅 --once，且保存时间不超过 --max-age 秒
+3. 在本进程中运行扫描引擎（MultiSourceMonitor），结果写回快照和会话索引，下次 --once 可以直接使用；
+   扫描时复用快照中文件未变化的会话，只重新解析变化的文件
+
+事件格式与守护进程推送的相同（见 src/core/changeset.py）：
+    {"event": "snapshot", "version": 3, "sessions": [...], "source": "daemon"}
+    {"event": "changes", "version": 4, "upserted": [...], "removed": ["<session_id>"]}
+--once --json 的输出是一个 snapshot 事件，另外带有 source / generated_at / stale（以及 saved_at）字段。
+--watch 重新连接守护进程或切换数据来源后会再输出一个 snapshot 事件，读取方应以它替换已有数据。
+日志只写入 stderr 和日志文件，stdout 只有数据。
+"""
+import asyncio
+import json
+import signal
+import sys
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from src.core.changeset import ChangeTracker
+from src.core.control_server import ControlClient, ControlError, daemon_available
+from src.core.snapshot_store import SnapshotStore
+from src.data.models import Session
+from src.utils.logger import logger, redirect_console_logging
+
+RECONNECT_DELAY = 2  # 与守护进程的连接断开后重连的间隔（秒）
+
+
+def emit(event: dict):
+    """输出一行 JSON（读取方关闭管道时由调用方结束）"""
+    sys.stdout.write(json.dumps(event, ensure_ascii=False, separators=(',', ':'), default=str))
+    sys.stdout.write('\n')
+    sys.stdout.flush()
+
+
+def snapshot_from_monitor() -> Optional[dict]:
+    """从运行中的监控器取当前会话，没有监控器时返回 None"""
+    try:
+        result = ControlClient().call('snapshot')
+    except (OSError, ControlError, ValueError):
+        return None
+    return {
+        'event': 'snapshot',
+        'version': result.get('version', 0),
+        'sessions': result.get('sessions', []),
+        'source': 'daemon' if daemon_available() else 'monitor',
+        'generated_at': result.get('generated_at', datetime.now().isoformat()),
+        'stale': False,
+    }
+
+
+def snapshot_from_store(max_age: float) -> Optional[dict]:
+    """读取持久化快照，不存在或比 max_age 秒更旧时返回 None"""
+    if max_age <= 0:
+        return None
+    stored = SnapshotStore().load(full=True)
+    if stored is None:
+        return None
+    age = (datetime.now() - stored.saved_at).total_seconds()
+    if age > max_age:
+        return None
+    logger.info(f"⏳ 使用 {age:.0f} 秒前保存的会话快照")
+    return {
+        'event': 'snapshot',
+        'version': 0,
+        'sessions': [session.to_dict() for session in stored.sessions],
+        'source': 'snapshot',
+        'generated_at': datetime.now().isoformat(),
+        'saved_at': stored.saved_at.isoformat(),
+        'stale': True,
+    }
+
+
+def snapshot_from_scan() -> dict:
+    """
+    在本进程中扫描一次，并把结果写回快照和会话索引
+
+    快照中记录了保存时各会话文件的状态（mtime/size、是否有独立 todo 文件），
+    先用其中的会话预置扫描引擎，只重新解析状态变化的文件和新文件；
+    未变化会话的 todos 从按 mtime/size 校验的 todo 文件缓存读取
+    """
+    from src.core.multi_source_monitor import MultiSourceMonitor
+
+    snapshot_store = SnapshotStore()
+    monitor = MultiSourceMonitor()
+    stored = snapshot_store.load(full=True)
+    if stored is not None and stored.file_states:
+        monitor.seed_sessions(stored.sessions, stored.file_states)
+    monitor.scan_all_sessions()  # 同时保存会话索引
+    tracker = ChangeTracker()
+    tracker.update(monitor.get_all_sessions())
+    snapshot = tracker.snapshot_event()
+    snapshot_store.save(snapshot, monitor.file_states())
+    return {**snapshot, 'source': 'scan', 'generated_at': datetime.now().isoformat(), 'stale': False}
+
+
+def format_sessions(sessions: List[dict]) -> List[str]:
+    """文本输出：标记的在前，按最后活动时间倒序，每行一个会话"""
+    rows = sorted((Session.from_dict(data) for data in sessions),
+                  key=lambda s: (s.is_pinned, s.last_activity), reverse=True)
+    return [
+        '\t'.join((session.status_icon or '-', session.session_id, session.source_type,
+                   session.custom_name or session.project_name, session.todo_progress))
+        for session in rows
+    ]
+
+
+def run_once(as_json: bool, max_age: float) -> int:
+    snapshot = snapshot_from_monitor() or snapshot_from_store(max_age) or snapshot_from_scan()
+    if as_json:
+        emit(snapshot)
+    else:
+        for line in format_sessions(snapshot['sessions']):
+            sys.stdout.write(line + '\n')
+        sys.stdout.flush()
+    return 0
+
+
+def watch_daemon() -> bool:
+    """
+    转发守护进程推送的事件
+
+    Returns:
+        守护进程退出（重连失败）时返回 False，由调用方改为在本进程中运行引擎
+    """
+    client = ControlClient()
+    while True:
+        try:
+            for event in client.subscribe():
+                if event.get('event') == 'snapshot':
+                    event = {**event, 'source': 'daemon'}
+                emit(event)
+            logger.warning("⚠️ 与守护进程的连接已断开，正在重连...")
+        except (OSError, ControlError, ValueError) as e:
+            logger.warning(f"⚠️ 无法连接守护进程: {e}")
+        time.sleep(RECONNECT_DELAY)
+        if not daemon_available():
+            return False
+
+
+async def watch_local() -> int:
+    """在本进程中运行扫描引擎，输出初始快照和之后的变更集（与守护进程相同的刷新方式）"""
+    from src.core.multi_source_monitor import MultiSourceMonitor
+    from src.data.config import Config
+
+    loop = asyncio.get_running_loop()
+    config = Config()
+    monitor = MultiSourceMonitor(dispatcher=loop.call_soon_threadsafe)
+    tracker = ChangeTracker()
+    snapshot_store = SnapshotStore()
+
+    monitor.start()
+    tracker.update(monitor.get_all_sessions())
+    emit({**tracker.snapshot_event(), 'source': 'local'})
+    snapshot_store.save_in_background(tracker.snapshot_event(), monitor.file_states())
+
+    stop_event = asyncio.Event()
+    pipe_closed = False
+
+    def on_sessions_updated(sessions):
+        nonlocal pipe_closed
+        change_set = tracker.update(sessions)
+        if change_set is None:
+            return
+        try:
+            emit(change_set.to_event())
+        except BrokenPipeError:
+            # 读取方已关闭管道（Signal.emit 会吞掉槽函数的异常，需要在这里结束监视）
+            pipe_closed = True
+            stop_event.set()
+            return
+        snapshot_store.save_in_background(tracker.snapshot_event(), monitor.file_states())
+
+    monitor.sessions_updated.connect(on_sessions_updated)
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+    try:
+        while not stop_event.is_set():
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=config.refresh_interval)
+            except asyncio.TimeoutError:
+                if config.auto_refresh:
+                    monitor.scan_all_sessions()
+    finally:
+        monitor.stop()
+        snapshot_store.flush()
+    if pipe_closed:
+        raise BrokenPipeError  # 与其他输出位置一样由 run_headless 处理
+    return 0
+
+
+def run_watch() -> int:
+    if daemon_available() and watch_daemon():
+        return 0
+    logger.info("未检测到守护进程，在本进程中运行扫描引擎")
+    return asyncio.run(watch_local())
+
+
+def run_headless(args) -> int:
+    """命令行版 --once / --watch / --json 的入口"""
+    # stdout 只输出数据，日志改到 stderr
+    redirect_console_logging()
+    try:
+        if args.watch:
+            return run_watch()
+        return run_once(args.json, args.max_age)
+    except KeyboardInterrupt:
+        return 0
+    except BrokenPipeError:
+        # 读取方已关闭管道（如 | head），不再输出
+        sys.stdout = None
+        return 0
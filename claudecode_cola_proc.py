@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+ClaudeCode-Cola 进程跟踪
+
+增量扫描 /proc，找出名称包含 claude 的进程及其工作目录：
+- 每轮只 listdir /proc，已知的 PID 不再重复读取
+- 新 PID 读取 /proc/<pid>/comm 判断是否匹配，按启动时间识别 PID 复用
+- 只有新匹配的进程才读取 cwd / cmdline
+稳态开销与进程的创建/退出数量相关，而不是与进程总数相关。
+非 Linux 平台（没有 /proc）退化为 psutil 实现。
+
+PidExitWatcher 基于 pidfd 在进程退出时立即通知，匹配到会话的进程不必等待下一轮扫描。
+TranscriptFdMapper 通过进程打开的文件找到它对应的会话文件，实现进程到会话的精确匹配。
+"""
+import asyncio
+import os
+import re
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Set
+
+# comm 最长 15 个字符（TASK_COMM_LEN - 1），达到长度上限时需要从 cmdline 取完整名称
+COMM_MAX_LEN = 15
+
+
+class ProcInfo(NamedTuple):
+    """单个进程的缓存信息"""
+    start_time: float      # /proc/<pid>/stat 第 22 个字段（启动时间，clock ticks）；psutil 实现中为 create_time
+    name: str
+    matched: bool
+    cwd: Optional[str]     # 仅匹配的进程才读取
+    cmdline: tuple         # 仅匹配的进程才读取
+
+
+class ProcScanner:
+    """
+    增量进程扫描器
+
+    用法:
+        scanner = ProcScanner()
+        processes = scanner.scan()  # {pid: cwd}
+    """
+
+    def __init__(self, name_keyword: str = 'claude', proc_root: str = '/proc',
+                 probe_scans: int = 3, revalidate_every: int = 30):
+        """
+        Args:
+            name_keyword: 进程名包含该关键字（不区分大小写）即视为匹配
+            proc_root: proc 文件系统挂载点
+            probe_scans: 新出现但未匹配的 PID 在之后几轮内继续检查（fork 之后才 exec 的情况）
+            revalidate_every: 每隔多少轮重新校验一次所有已知 PID（兜底 exec 改名和漏掉的 PID 复用）
+        """
+        self.name_keyword = name_keyword.lower()
+        self.proc_root = proc_root
+        self.probe_scans = probe_scans
+        self.revalidate_every = revalidate_every
+        self.use_proc = os.path.isdir(os.path.join(proc_root, 'self'))
+
+        self._known: Dict[int, ProcInfo] = {}
+        self._probing: Dict[int, int] = {}    # 未匹配的新 PID -> 剩余复查轮数
+        self._scan_count = 0
+
+    @property
+    def matched(self) -> Dict[int, ProcInfo]:
+        """当前匹配的进程"""
+        return {pid: info for pid, info in self._known.items() if info.matched}
+
+    def scan(self) -> Dict[int, str]:
+        """
+        扫描一次进程
+
+        Returns:
+            {pid: cwd}，无法读取工作目录的进程（如权限不足）不包含在内
+        """
+        if not self.use_proc:
+            return self._scan_psutil()
+
+        self._scan_count += 1
+        revalidate = self.revalidate_every > 0 and self._scan_count % self.revalidate_every == 0
+
+        try:
+            pids = {int(name) for name in os.listdir(self.proc_root) if name.isdigit()}
+        except OSError:
+            return {}
+
+        # 已退出的进程
+        for pid in self._known.keys() - pids:
+            del self._known[pid]
+            self._probing.pop(pid, None)
+
+        for pid in pids:
+            info = self._known.get(pid)
+            if info is None:
+                self._discover(pid)
+            elif revalidate or info.matched or pid in self._probing:
+                # 匹配的进程数量很少，每轮都确认启动时间，避免 PID 复用后误判为活跃
+                self._revalidate(pid, info, revalidate)
+
+        return {pid: info.cwd for pid, info in self._known.items()
+                if info.matched and info.cwd is not None}
+
+    def _discover(self, pid: int):
+        """第一次见到某个 PID：读取 comm 和启动时间"""
+        start_time = self._read_start_time(pid)
+        if start_time is None:
+            return
+        name = self._read_name(pid)
+        if name is None:
+            return
+        self._store(pid, start_time, name)
+        if not self._known[pid].matched and self.probe_scans > 0:
+            self._probing[pid] = self.probe_scans
+
+    def _revalidate(self, pid: int, info: ProcInfo, full: bool):
+        """确认 PID 没有被复用；复查期内或定期校验（full）时重新读取进程名"""
+        start_time = self._read_start_time(pid)
+        if start_time != info.start_time:
+            # 进程已退出或 PID 已被复用
+            del self._known[pid]
+            self._probing.pop(pid, None)
+            if start_time is not None:
+                self._discover(pid)
+            return
+
+        remaining = self._probing.get(pid)
+        if remaining is not None:
+            if remaining <= 1:
+                del self._probing[pid]
+            else:
+                self._probing[pid] = remaining - 1
+        elif not full:
+            return
+
+        name = self._read_name(pid)
+        if name is None:
+            return
+        if name != info.name:
+            # exec 后进程名发生变化
+            self._probing.pop(pid, None)
+            self._store(pid, start_time, name)
+        elif info.matched and full:
+            # 定期刷新工作目录
+            self._known[pid] = info._replace(cwd=self._read_cwd(pid))
+
+    def _store(self, pid: int, start_time: int, name: str):
+        """记录进程信息，匹配的进程额外读取 cwd 和 cmdline"""
+        matched = self.name_keyword in name.lower()
+        if matched:
+            self._known[pid] = ProcInfo(start_time, name, True,
+                                        self._read_cwd(pid), self._read_cmdline(pid))
+        else:
+            self._known[pid] = ProcInfo(start_time, name, False, None, ())
+
+    def _read_start_time(self, pid: int) -> Optional[int]:
+        """读取进程启动时间（进程名可能包含空格和括号，从最后一个 ')' 之后解析）"""
+        try:
+            with open(f'{self.proc_root}/{pid}/stat', 'rb') as f:
+                stat = f.read()
+            return int(stat[stat.rindex(b')') + 2:].split()[19])
+        except (OSError, ValueError, IndexError):
+            return None
+
+    def _read_name(self, pid: int) -> Optional[str]:
+        """读取进程名，comm 被截断时使用 cmdline 第一个参数的文件名"""
+        try:
+            with open(f'{self.proc_root}/{pid}/comm', 'rb') as f:
+                name = f.read().rstrip(b'\n').decode('utf-8', errors='replace')
+        except OSError:
+            return None
+        if len(name) >= COMM_MAX_LEN:
+            cmdline = self._read_cmdline(pid)
+            if cmdline:
+                exe_name = os.path.basename(cmdline[0])
+                if exe_name.startswith(name):
+                    return exe_name
+        return name
+
+    def _read_cmdline(self, pid: int) -> tuple:
+        try:
+            with open(f'{self.proc_root}/{pid}/cmdline', 'rb') as f:
+                data = f.read()
+        except OSError:
+            return ()
+        return tuple(arg.decode('utf-8', errors='replace') for arg in data.split(b'\0') if arg)
+
+    def _read_cwd(self, pid: int) -> Optional[str]:
+        try:
+            return os.readlink(f'{self.proc_root}/{pid}/cwd')
+        except OSError:
+            return None
+
+    def _scan_psutil(self) -> Dict[int, str]:
+        """
+        非 Linux 平台：psutil 遍历进程名
+
+        只有匹配的进程记录在 _known 中（供 matched 使用），工作目录和命令行按 (pid, 创建时间) 缓存
+        """
+        import psutil
+
+        seen = set()
+        for proc in psutil.process_iter(['pid', 'name', 'create_time']):
+            try:
+                name = proc.info['name'] or ''
+                if self.name_keyword not in name.lower():
+                    continue
+                pid = proc.info['pid']
+                seen.add(pid)
+                info = self._known.get(pid)
+                if info is not None and info.start_time == proc.info['create_time'] and info.name == name:
+                    continue
+                try:
+                    cwd = proc.cwd()
+                except (psutil.Error, OSError):
+                    cwd = None
+                try:
+                    cmdline = tuple(proc.cmdline())
+                except (psutil.Error, OSError):
+                    cmdline = ()
+                self._known[pid] = ProcInfo(proc.info['create_time'], name, True, cwd, cmdline)
+            except Exception:
+                continue
+
+        for pid in self._known.keys() - seen:
+            del self._known[pid]
+        return {pid: info.cwd for pid, info in self._known.items() if info.cwd is not None}
+
+
+class PidExitWatcher:
+    """
+    进程退出通知
+
+    Linux 5.3+ 使用 os.pidfd_open：进程退出时 pidfd 变为可读，注册到 asyncio 事件循环后
+    可以立即收到通知；不支持时退化为定时轮询。回调在事件循环线程中执行。
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, on_exit: Callable[[int], None],
+                 poll_interval: float = 1.0):
+        self.loop = loop
+        self.on_exit = on_exit
+        self.poll_interval = poll_interval
+        self.use_pidfd = hasattr(os, 'pidfd_open')
+        self._pidfds: Dict[int, int] = {}   # pid -> pidfd
+        self._polled: Set[int] = set()      # 轮询模式下监听的 PID
+        self._poll_task: Optional[asyncio.Task] = None
+
+    def is_watching(self, pid: int) -> bool:
+        return pid in self._pidfds or pid in self._polled
+
+    def watch(self, pid: int):
+        """开始监听进程退出（重复调用无副作用）"""
+        if self.is_watching(pid):
+            return
+
+        if self.use_pidfd:
+            try:
+                fd = os.pidfd_open(pid)
+            except ProcessLookupError:
+                # 进程已经退出
+                self.loop.call_soon(self.on_exit, pid)
+                return
+            except OSError:
+                # 内核不支持 pidfd（ENOSYS）或其他限制，改为轮询
+                self.use_pidfd = False
+            else:
+                self._pidfds[pid] = fd
+                self.loop.add_reader(fd, self._on_pidfd_readable, pid)
+                return
+
+        self._polled.add(pid)
+        if self._poll_task is None or self._poll_task.done():
+            self._poll_task = self.loop.create_task(self._poll())
+
+    def unwatch(self, pid: int):
+        """停止监听（不触发回调）"""
+        fd = self._pidfds.pop(pid, None)
+        if fd is not None:
+            self.loop.remove_reader(fd)
+            os.close(fd)
+        self._polled.discard(pid)
+
+    def close(self):
+        """停止监听所有进程"""
+        for pid in list(self._pidfds):
+            self.unwatch(pid)
+        self._polled.clear()
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            self._poll_task = None
+
+    def _on_pidfd_readable(self, pid: int):
+        self.unwatch(pid)
+        self.on_exit(pid)
+
+    async def _poll(self):
+        """轮询模式：定期检查被监听的进程是否还存在"""
+        while self._polled:
+            await asyncio.sleep(self.poll_interval)
+            for pid in list(self._polled):
+                if not pid_exists(pid):
+                    self._polled.discard(pid)
+                    self.on_exit(pid)
+
+
+def pid_exists(pid: int) -> bool:
+    """检查进程是否存在（发送 0 号信号，不会影响进程）"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # 进程存在但属于其他用户
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def encode_project_dir(cwd: str) -> str:
+    """
+    Claude Code 的项目目录名编码：路径中非字母数字的字符都替换为 '-'
+    例如 /Users/haya/Code/ClaudeCode-Cola -> -Users-haya-Code-ClaudeCode-Cola
+    """
+    return re.sub(r'[^A-Za-z0-9]', '-', cwd)
+
+
+class TranscriptFdMapper:
+    """
+    通过进程打开的文件描述符找出它正在写入的会话文件（.jsonl）
+
+    Linux 读取 /proc/<pid>/fd 下的符号链接，其他平台使用 psutil 的 open_files()。
+    链接指向的是真实路径，这里统一换回 transcript_root 下的路径，方便与会话的 file_path 比较。
+    """
+
+    def __init__(self, transcript_root: Path, proc_root: str = '/proc', suffix: str = '.jsonl'):
+        self.transcript_root = str(transcript_root)
+        self.real_root = os.path.realpath(transcript_root)
+        self.proc_root = proc_root
+        self.suffix = suffix
+        self.use_proc = os.path.isdir(os.path.join(proc_root, 'self'))
+
+    def open_transcripts(self, pid: int) -> List[str]:
+        """返回进程当前打开的会话文件路径（无权限或进程已退出时返回空列表）"""
+        if self.use_proc:
+            fd_dir = f'{self.proc_root}/{pid}/fd'
+            try:
+                fds = os.listdir(fd_dir)
+            except OSError:
+                return []
+            targets = []
+            for fd in fds:
+                try:
+                    targets.append(os.readlink(f'{fd_dir}/{fd}'))
+                except OSError:
+                    continue
+        else:
+            try:
+                import psutil
+                targets = [f.path for f in psutil.Process(pid).open_files()]
+            except Exception:
+                return []
+
+        return [self._normalize(path) for path in targets if path.endswith(self.suffix)]
+
+    def _normalize(self, path: str) -> str:
+        if path.startswith(self.real_root + os.sep):
+            return self.transcript_root + path[len(self.real_root):]
+        return path
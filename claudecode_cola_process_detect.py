@@ -10,13 +10,12 @@ import asyncio
 import signal
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional
 from dataclasses import dataclass, field
 from collections import defaultdict
 import aiofiles
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
-import psutil
 from rich.console import Console
 from rich.live import Live
 from rich.table import Table
@@ -27,6 +26,9 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.syntax import Syntax
 import time
 
+from claudecode_cola_proc import PidExitWatcher, ProcScanner, TranscriptFdMapper, encode_project_dir
+from src.core.session_index import SessionIndex
+
 
 # 白色背景主题配色
 THEME = {
@@ -149,8 +151,11 @@ class ClaudeMonitor:
 
     def __init__(self):
         self.sessions: Dict[str, ClaudeSession] = {}
-        self.active_sessions: Set[str] = set()
+        self.index = SessionIndex()  # 按会话文件、项目目录、活跃状态索引会话
         self.claude_processes = []
+        self.pid_sessions: Dict[int, str] = {}  # 进程PID -> 匹配到的会话ID（进程退出时直接找到会话）
+        self.process_scanner = ProcScanner()  # 增量扫描 /proc，只读取新进程的信息
+        self.exit_watcher: Optional[PidExitWatcher] = None  # 进程退出通知，在事件循环中创建
         self.console = Console()
         self.observer = Observer()
         self.file_positions = {}  # 记录每个文件的读取位置
@@ -158,6 +163,7 @@ class ClaudeMonitor:
 
         # Claude项目根目录
         self.claude_root = Path.home() / '.claude' / 'projects'
+        self.fd_mapper = TranscriptFdMapper(self.claude_root)  # 通过打开的文件匹配进程和会话
 
     async def start(self):
         """启动监控器"""
@@ -193,7 +199,7 @@ class ClaudeMonitor:
                         for jsonl_file in project_dir.glob('*.jsonl'):
                             session = await self.parse_session(jsonl_file)
                             if session:
-                                self.sessions[session.session_id] = session
+                                self.add_session(session)
                                 session_count += 1
                                 progress.update(task, description=f"已扫描 {session_count} 个会话")
 
@@ -357,9 +363,14 @@ class ClaudeMonitor:
         """处理新会话创建"""
         session = await self.parse_session(Path(file_path))
         if session:
-            self.sessions[session.session_id] = session
+            self.add_session(session)
             self.console.print(f"[{THEME['success']}]🆕 发现新会话: {session.project_name}[/]")
 
+    def add_session(self, session: ClaudeSession):
+        """记录会话并更新索引"""
+        self.sessions[session.session_id] = session
+        self.index.update(session)
+
     def start_file_watcher(self):
         """启动文件系统监控"""
         event_handler = JSONLWatcher(self)
@@ -371,22 +382,13 @@ class ClaudeMonitor:
 
     async def monitor_processes(self):
         """监控Claude进程"""
+        self.exit_watcher = PidExitWatcher(asyncio.get_running_loop(), self.handle_process_exit)
+        sweep_interval = 2
+
         while self.running:
             try:
-                # 查找Claude进程并获取工作目录
-                claude_process_info = {}
-                for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'cwd']):
-                    try:
-                        if 'claude' in proc.info['name'].lower():
-                            pid = proc.info['pid']
-                            # 获取进程工作目录
-                            try:
-                                cwd = proc.cwd()
-                                claude_process_info[pid] = cwd
-                            except:
-                                pass
-                    except:
-                        continue
+                # 查找Claude进程并获取工作目录（已知进程不会重复读取）
+                claude_process_info = self.process_scanner.scan()
 
                 # 更新进程列表
                 self.claude_processes = list(claude_process_info.keys())
@@ -394,40 +396,76 @@ class ClaudeMonitor:
                 # 匹配进程到会话
                 await self.match_processes_to_sessions(claude_process_info)
 
-                # 每2秒检查一次，以便快速检测进程变化
-                await asyncio.sleep(2)
+                # 监听进程退出
+                for pid in claude_process_info:
+                    self.exit_watcher.watch(pid)
+
+                # 进程退出由 pidfd 立即通知，全量扫描只用于发现新进程，可以降低频率；
+                # 不支持 pidfd 时仍每2秒检查一次
+                sweep_interval = 10 if self.exit_watcher.use_pidfd else 2
+                await asyncio.sleep(sweep_interval)
 
             except Exception:
-                await asyncio.sleep(2)
+                await asyncio.sleep(sweep_interval)
+
+    def handle_process_exit(self, pid: int):
+        """Claude进程退出：立即将对应会话标记为非活跃"""
+        if pid in self.claude_processes:
+            self.claude_processes.remove(pid)
+
+        session = self.sessions.get(self.pid_sessions.pop(pid, None))
+        if session is None or session.process_pid != pid:
+            return
+        session.process_pid = None
+        if session.is_active:
+            session.is_active = False
+            self.index.update(session)
+            self.console.print(f"[{THEME['warning']}]💤 会话已关闭: {session.project_name}[/]")
 
     async def match_processes_to_sessions(self, claude_process_info: Dict[int, str]):
-        """匹配Claude进程到对应的会话"""
-        # 首先，重置所有会话的进程PID
-        for session in self.sessions.values():
-            session.process_pid = None
+        """
+        匹配Claude进程到对应的会话
+
+        1. 优先使用进程打开的会话文件（/proc/<pid>/fd），精确匹配
+        2. 找不到时按工作目录对应的项目目录，选择最近活动且未被其他进程占用的会话
+        """
+        matched: Dict[str, int] = {}  # session_id -> pid
+        unresolved = []
 
-        # 匹配进程到会话
         for pid, cwd in claude_process_info.items():
-            # 标准化工作目录路径
-            cwd_normalized = cwd.replace('/', '-')
-            if cwd_normalized.startswith('/'):
-                cwd_normalized = cwd_normalized[1:]
-
-            # 查找匹配的会话
-            for session in self.sessions.values():
-                # 检查项目路径是否匹配
-                if cwd_normalized.endswith(session.project_path):
-                    session.process_pid = pid
-                    session.is_active = True
-                    self.active_sessions.add(session.session_id)
+            session = None
+            for transcript in self.fd_mapper.open_transcripts(pid):
+                session = self.index.by_file(transcript)
+                if session is not None:
                     break
-
-        # 立即将没有进程的会话标记为非活跃
-        for session in self.sessions.values():
-            if session.process_pid is None and session.is_active:
-                # 只有之前是活跃的，现在没有进程了，才立即标记为非活跃
+            if session is not None and session.session_id not in matched:
+                matched[session.session_id] = pid
+            else:
+                unresolved.append((pid, cwd))
+
+        for pid, cwd in unresolved:
+            candidates = self.index.by_project_path(encode_project_dir(cwd)) or \
+                self.index.by_project_path(cwd.replace('/', '-'))
+            free = [s for s in candidates if s.session_id not in matched]
+            if free:
+                session = max(free, key=lambda s: s.last_activity)
+                matched[session.session_id] = pid
+
+        # 更新匹配到进程的会话
+        self.pid_sessions = {pid: session_id for session_id, pid in matched.items()}
+        for session_id, pid in matched.items():
+            session = self.sessions[session_id]
+            session.process_pid = pid
+            session.is_active = True
+            self.index.update(session)
+
+        # 立即将没有进程的会话标记为非活跃（只需检查之前活跃的会话）
+        for session_id in self.index.active - matched.keys():
+            session = self.sessions[session_id]
+            session.process_pid = None
+            if session.is_active:
                 session.is_active = False
-                self.active_sessions.discard(session.session_id)
+                self.index.update(session)
                 self.console.print(f"[{THEME['warning']}]💤 会话已关闭: {session.project_name}[/]")
 
     def create_dashboard(self) -> Layout:
@@ -455,7 +493,7 @@ class ClaudeMonitor:
 
         # 计算统计数据
         total_sessions = len(self.sessions)
-        active_sessions = len(self.active_sessions)
+        active_sessions = len(self.index.active)
         todo_projects = sum(1 for s in self.sessions.values() if s.todos)
         pending_todos = sum(
             sum(1 for t in s.todos if t.status == 'pending')
@@ -608,6 +646,8 @@ class ClaudeMonitor:
     def cleanup(self):
         """清理资源"""
         self.console.print("\n[yellow]🛑 正在停止监控器...[/yellow]")
+        if self.exit_watcher is not None:
+            self.exit_watcher.close()
         self.observer.stop()
         self.observer.join()
         self.console.print("[green]✅ 监控器已停止[/green]")
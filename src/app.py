@@ -1,16 +1,24 @@
 """
 ClaudeCode-Cola 主应用类
+
+启动顺序（尽快让托盘出现）：
+1. 创建并显示系统托盘（托盘弹窗在第一次点击时才创建），先显示上次保存的会话快照（标记为旧数据）
+2. 进入事件循环后再导入会话监控器，在后台线程中完成首次扫描，再启动控制接口
+3. 主窗口在第一次显示时才导入和创建
 """
-from pathlib import Path
-from PyQt6.QtWidgets import QMainWindow
+import threading
+from typing import List, Optional
+
 from PyQt6.QtCore import QTimer, Qt
 
-from src.ui.main_window import MainWindow
-from src.ui.system_tray import SystemTray
-from src.core.multi_source_monitor import MultiSourceMonitor
+from src.core.changeset import ChangeTracker
+from src.core.qt_invoker import MainThreadInvoker
+from src.core.snapshot_store import SnapshotStore
 from src.data.config import Config
+from src.data.models import Session
+from src.ui.system_tray import SystemTray
 from src.utils.logger import logger
-from PyQt6.QtGui import QShortcut, QKeySequence
+from src.utils.startup_profiler import profiler
 
 
 class ColaApp:
@@ -23,25 +31,32 @@ class ColaApp:
         # 加载配置
         self.config = Config()
 
-        # 创建主窗口
-        self.main_window = MainWindow(config=self.config)
+        # 主窗口延迟到第一次显示时创建
+        self.main_window = None
+        self.sessions: List[Session] = []
+        self.stale = False  # 当前显示的是否是上次保存的快照
+
+        # 本地扫描时把每次变化后的会话快照保存下来，供下次启动时立即显示
+        self.snapshot_store = SnapshotStore()
+        self.tracker: Optional[ChangeTracker] = None
 
         # 创建系统托盘
-        self.system_tray = SystemTray(parent=self.main_window)
+        self.system_tray = SystemTray()
+        profiler.mark('tray_created')
 
-        # 创建会话监控器（多源：Claude Code + Qoder）
-        self.session_monitor = MultiSourceMonitor()
+        # 监控器是纯 Python 的，后台线程的回调通过 invoker 排队到 Qt 主线程
+        self.invoker = MainThreadInvoker()
+        self.session_monitor = None
+        self.monitor_ready = False  # 首次扫描完成前不接受刷新/标记等操作
+        self._pending_sessions: Optional[List[Session]] = None  # 首次扫描过程中的中间结果
+        self.control_server = None
 
         # 设置连接
         self.setup_connections()
 
-        # 启动监控器
-        self.session_monitor.start()
-
-        # 设置定时刷新
+        # 设置定时刷新（监控器启动后开始计时）
         self.refresh_timer = QTimer()
         self.refresh_timer.timeout.connect(self.on_timer_refresh)
-        self.refresh_timer.start(self.config.refresh_interval * 1000)  # 转换为毫秒
 
         logger.info("✅ 应用初始化完成")
 
@@ -52,49 +67,186 @@ class ColaApp:
         self.system_tray.refresh_requested.connect(self.on_refresh)
         self.system_tray.quit_requested.connect(self.quit)
 
-        # 主窗口信号
-        self.main_window.refresh_requested.connect(self.on_refresh)
-        self.main_window.pin_toggled.connect(self.on_pin_toggled)
-        self.main_window.session_renamed.connect(self.on_session_renamed)
-
-        # 会话监控器信号
-        self.session_monitor.sessions_updated.connect(self.on_sessions_updated)
-
     def show(self):
         """显示应用"""
-        # 显示系统托盘
+        # 显示系统托盘，并立即显示上次保存的会话快照
         self.system_tray.show()
+        self.show_cached_snapshot()
+        profiler.mark('tray_shown')
 
         # 根据配置决定是否显示主窗口
         if self.config.show_window_on_start:
             self.show_main_window()
 
+        # 首帧绘制之后再启动监控器（扫描会话文件是启动中最慢的部分）
+        QTimer.singleShot(0, self.on_first_frame)
+
+    def show_cached_snapshot(self):
+        """显示上次保存的会话快照（标记为旧数据），等后台扫描完成后替换"""
+        snapshot = self.snapshot_store.load()
+        if snapshot is None:
+            return
+        logger.info(f"📦 显示 {snapshot.saved_at:%m-%d %H:%M} 保存的会话快照，共 {snapshot.total} 个会话")
+        self.set_stale(True)
+        self.render_sessions(snapshot.sessions, total_count=snapshot.total)
+        profiler.mark('snapshot_rendered')
+
+    def on_first_frame(self):
+        """事件循环第一次空闲：托盘（和主窗口）已经绘制"""
+        profiler.mark('first_paint')
+        self.start_monitor()
+
+    def start_monitor(self):
+        """导入并启动会话监控器：守护进程在运行时订阅它的推送，否则自己扫描（多源：Claude Code + Qoder）"""
+        from src.core.control_server import daemon_available
+
+        with profiler.measure_import('src.core monitor'):
+            if daemon_available():
+                from src.core.remote_monitor import RemoteSessionMonitor
+                logger.info("🔗 检测到守护进程，使用守护进程的会话数据")
+                self.session_monitor = RemoteSessionMonitor(dispatcher=self.invoker.post)
+                self.session_monitor.disconnected.connect(self.on_daemon_disconnected)
+                self.session_monitor.daemon_lost.connect(self.on_daemon_lost)
+            else:
+                self.create_local_monitor()
+
+        self.launch_monitor()
+
+    def create_local_monitor(self):
+        """创建本地扫描的监控器"""
+        from src.core.multi_source_monitor import MultiSourceMonitor
+        self.session_monitor = MultiSourceMonitor(dispatcher=self.invoker.post)
+        self.tracker = ChangeTracker()
+
+    def launch_monitor(self):
+        """连接监控器信号，并在后台线程中启动（首次扫描）"""
+        # 会话监控器信号：首次扫描在后台线程中进行，统一排队到主线程处理
+        self.session_monitor.sessions_updated.connect(
+            lambda sessions: self.invoker.post(lambda: self.on_sessions_updated(sessions))
+        )
+
+        def start_in_background():
+            self.session_monitor.start()
+            self.invoker.post(self.on_monitor_started)
+
+        threading.Thread(target=start_in_background, name='cola-initial-scan', daemon=True).start()
+
+    def on_daemon_disconnected(self):
+        """与守护进程的连接断开（主线程）：重连后收到新快照之前，显示的会话标记为旧数据"""
+        self.set_stale(True)
+
+    def on_daemon_lost(self):
+        """守护进程已退出（主线程）：改为本地扫描，扫描完成前继续显示旧数据"""
+        logger.warning("⚠️ 守护进程已退出，改为本地扫描会话")
+        self.session_monitor.sessions_updated.disconnect()
+        self.session_monitor.stop()
+        self.monitor_ready = False
+        self.set_stale(True)
+        self.create_local_monitor()
+        self.launch_monitor()
+
+    def on_monitor_started(self):
+        """首次扫描完成（主线程）：启动控制接口和定时刷新"""
+        from src.core.control_server import ControlServer
+
+        self.monitor_ready = True
+        if self._pending_sessions is not None:
+            self.on_sessions_updated(self._pending_sessions)
+            self._pending_sessions = None
+        profiler.mark('monitor_started')
+        profiler.save()
+        logger.info(f"⏱️ 启动耗时(ms): {profiler.marks}")
+
+        # 本地控制接口（claudecode_cola_api.py 通过它直接操作运行中的应用）
+        if hasattr(self.session_monitor, 'control_methods'):
+            self.control_server = ControlServer(
+                self.session_monitor.control_methods(),
+                invoker=self.invoker
+            )
+            self.control_server.start()
+
+        self.refresh_timer.start(self.config.refresh_interval * 1000)  # 转换为毫秒
+
+    def ensure_main_window(self):
+        """第一次需要时导入并创建主窗口"""
+        if self.main_window is not None:
+            return self.main_window
+
+        with profiler.measure_import('src.ui.main_window'):
+            from src.ui.main_window import MainWindow
+        self.main_window = MainWindow(config=self.config)
+        profiler.mark('main_window_created')
+
+        # 主窗口信号
+        self.main_window.refresh_requested.connect(self.on_refresh)
+        self.main_window.pin_toggled.connect(self.on_pin_toggled)
+        self.main_window.session_renamed.connect(self.on_session_renamed)
+
+        self.main_window.set_stale(self.stale)
+        if self.sessions:
+            self.main_window.update_sessions(self.sessions)
+        return self.main_window
+
     def show_main_window(self):
         """显示主窗口"""
-        self.main_window.show()
-        self.main_window.raise_()
-        self.main_window.activateWindow()
+        main_window = self.ensure_main_window()
+        main_window.show()
+        main_window.raise_()
+        main_window.activateWindow()
 
     def on_refresh(self):
         """刷新数据"""
+        if not self.monitor_ready:
+            return
         logger.info("手动刷新数据...")
         self.session_monitor.scan_all_sessions()
 
     def on_timer_refresh(self):
-        """定时刷新"""
-        if self.config.auto_refresh:
+        """定时刷新（守护进程模式下由守护进程自己定时扫描，只有本地扫描时才有 tracker）"""
+        if self.config.auto_refresh and self.tracker is not None:
             logger.info("🔄 自动刷新数据...")
             self.session_monitor.scan_all_sessions()
 
     def on_sessions_updated(self, sessions):
-        """会话数据更新"""
-        # 更新主窗口
-        self.main_window.update_sessions(sessions)
-
-        # 计算需要关注的会话数（被标记且不活跃）
-        need_attention_count = sum(1 for s in sessions if s.is_pinned and not s.is_active)
-        total_count = len(sessions)
-        
+        """会话数据更新（主线程）"""
+        if not self.monitor_ready:
+            # 首次扫描还没完成（可能只扫描了部分来源），继续显示快照，扫描完成后再替换
+            self._pending_sessions = sessions
+            return
+
+        if self.stale:
+            self.set_stale(False)
+
+        self.render_sessions(sessions)
+
+        # 有变化时保存快照（守护进程模式下由守护进程保存）
+        if self.tracker is not None and self.tracker.update(sessions) is not None:
+            self.snapshot_store.save_in_background(self.tracker.snapshot_event(),
+                                                   self.session_monitor.file_states())
+
+    def set_stale(self, stale: bool):
+        """标记托盘和主窗口显示的是否是旧数据"""
+        self.stale = stale
+        self.system_tray.set_stale(stale)
+        if self.main_window is not None:
+            self.main_window.set_stale(stale)
+
+    def render_sessions(self, sessions: List[Session], total_count: Optional[int] = None):
+        """把会话列表显示到主窗口和托盘（快照只包含需要显示的会话，总数单独传入）"""
+        self.sessions = sessions
+
+        # 更新主窗口（还没创建时，第一次显示时再填充）
+        if self.main_window is not None:
+            self.main_window.update_sessions(sessions)
+
+        # 计算需要关注的会话数（被标记且不活跃）；首次扫描完成前索引还在后台线程中更新
+        if self.monitor_ready:
+            need_attention_count = len(self.session_monitor.index.pinned_inactive())
+        else:
+            need_attention_count = sum(1 for s in sessions if s.is_pinned and not s.is_active)
+        if total_count is None:
+            total_count = len(sessions)
+
         # 更新系统托盘
         self.system_tray.update_status(total_count, need_attention_count)
 
@@ -103,107 +255,47 @@ class ColaApp:
 
     def on_pin_toggled(self, session_id: str, pin: bool):
         """处理标记/取消标记会话"""
-        import json
-        from pathlib import Path
-        
-        # 配置文件路径
-        config_dir = Path.home() / '.claudecode-cola'
-        config_file = config_dir / 'pinned_sessions.json'
-        
-        # 确保配置目录存在
-        config_dir.mkdir(exist_ok=True)
-        
-        # 加载已标记的会话列表
-        pinned_sessions = set()
-        if config_file.exists():
-            try:
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    pinned_sessions = set(json.load(f))
-            except:
-                pass
-        
-        # 更新标记状态
-        if pin:
-            pinned_sessions.add(session_id)
-            logger.info(f"✅ 会话 {session_id} 已标记")
-        else:
-            if session_id in pinned_sessions:
-                pinned_sessions.remove(session_id)
-                logger.info(f"📌 会话 {session_id} 已取消标记")
-        
-        # 保存到配置文件
-        with open(config_file, 'w', encoding='utf-8') as f:
-            json.dump(list(pinned_sessions), f, ensure_ascii=False, indent=2)
-        
-        # 重新加载标记的会话列表到所有监控器
-        self.session_monitor.claude_monitor.load_pinned_sessions()
-        self.session_monitor.qoder_monitor.load_pinned_sessions()
-
-        # 刷新会话列表
-        self.session_monitor.scan_all_sessions()
+        if not self.monitor_ready:
+            logger.warning("会话扫描尚未完成，请稍后再标记")
+            return
+        # 直接更新内存中的会话并保存配置，界面通过 sessions_updated 立即刷新
+        self.session_monitor.set_pinned([session_id], pin)
 
     def on_session_renamed(self, session_id: str, new_name: str):
         """处理会话重命名"""
-        import json
-        from pathlib import Path
-        
-        # 配置文件路径
-        config_dir = Path.home() / '.claudecode-cola'
-        config_file = config_dir / 'session_names.json'
-        
-        # 确保配置目录存在
-        config_dir.mkdir(exist_ok=True)
-        
-        # 加载已有的自定义名称
-        session_names = {}
-        if config_file.exists():
-            try:
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    session_names = json.load(f)
-            except:
-                pass
-        
-        # 更新名称
-        if new_name:
-            session_names[session_id] = new_name
-            logger.info(f"✏️ 会话 {session_id} 重命名为: {new_name}")
-        else:
-            # 如果新名称为空，删除自定义名称
-            if session_id in session_names:
-                del session_names[session_id]
-                logger.info(f"🗑️ 会话 {session_id} 的自定义名称已删除")
-        
-        # 保存到配置文件
-        with open(config_file, 'w', encoding='utf-8') as f:
-            json.dump(session_names, f, ensure_ascii=False, indent=2)
-        
-        # 重新加载自定义名称到所有监控器
-        self.session_monitor.claude_monitor.load_session_names()
-        self.session_monitor.qoder_monitor.load_session_names()
-
-        # 刷新会话列表
-        self.session_monitor.scan_all_sessions()
+        if not self.monitor_ready:
+            logger.warning("会话扫描尚未完成，请稍后再重命名")
+            return
+        self.session_monitor.set_session_name(session_id, new_name)
 
     def quit(self):
         """退出应用"""
         logger.info("正在退出应用...")
-        
+
         # 先断开所有信号连接，避免在退出过程中触发更新
-        try:
+        if self.session_monitor is not None:
             self.session_monitor.sessions_updated.disconnect()
-        except:
-            pass
-        
-        # 停止会话监控器
-        self.session_monitor.stop()
-        
+
+        # 保存最新的会话快照，下次启动时立即显示
+        if self.tracker is not None and self.monitor_ready:
+            self.tracker.update(self.sessions)
+            self.snapshot_store.flush()
+            self.snapshot_store.save(self.tracker.snapshot_event(), self.session_monitor.file_states())
+
+        # 停止控制接口和会话监控器
+        if self.control_server is not None:
+            self.control_server.stop()
+        if self.session_monitor is not None:
+            self.session_monitor.stop()
+
         # 停止定时器
         self.refresh_timer.stop()
-        
+
         # 强制关闭主窗口
-        self.main_window.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
-        self.main_window.close()
-        
+        if self.main_window is not None:
+            self.main_window.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+            self.main_window.close()
+
         # 退出应用
         from PyQt6.QtWidgets import QApplication
         logger.info("👋 应用即将退出")
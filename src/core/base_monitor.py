@@ -4,29 +4,61 @@
 import json
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Set
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
-from PyQt6.QtCore import QObject, pyqtSignal
-
-from src.data.models import Session, TodoItem
+from src.core.events import Dispatcher, Signal, call_directly
+from src.core.file_watcher import DirectoryWatcher
+from src.core.session_index import SessionIndex
+from src.core.todo_cache import TodoFileCache
+from src.data.models import Session, TodoList
 from src.utils.logger import logger
 
 PINNED_SESSIONS_FILE = Path.home() / '.claudecode-cola' / 'pinned_sessions.json'
 SESSION_NAMES_FILE = Path.home() / '.claudecode-cola' / 'session_names.json'
 
+# 会话文件状态：(mtime_ns, size, 是否有独立 todo 文件)，与上次解析时相同则复用解析结果
+FileState = Tuple[int, int, bool]
+
+
+def save_pinned_sessions(pinned_sessions: Set[str]):
+    """保存标记的会话列表（所有来源共用）"""
+    PINNED_SESSIONS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(PINNED_SESSIONS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(sorted(pinned_sessions), f, ensure_ascii=False, indent=2)
+
 
-class BaseSessionMonitor(QObject):
-    """基础会话监控器抽象类"""
 
-    sessions_updated = pyqtSignal(list)
+def save_session_names(session_names: Dict[str, str]):
+    """保存自定义会话名称（所有来源共用）"""
+    SESSION_NAMES_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(SESSION_NAMES_FILE, 'w', encoding='utf-8') as f:
+        json.dump(session_names, f, ensure_ascii=False, indent=2)
 
-    def __init__(self, projects_dir: Path, source_type: str):
-        super().__init__()
+
+class BaseSessionMonitor:
+    """
+    基础会话监控器抽象类（纯 Python，不依赖 Qt）
+
+    Args:
+        dispatcher: 把后台线程（watchdog）的回调切换到监控器所属线程执行，默认直接执行
+    """
+
+    def __init__(self, projects_dir: Path, source_type: str, index: Optional[SessionIndex] = None,
+                 dispatcher: Dispatcher = call_directly):
+        self.sessions_updated = Signal()  # 参数: List[Session]
+        self.dispatcher = dispatcher
         self.projects_dir = projects_dir
         self.source_type = source_type  # "claude" 或 "qoder"
         self.sessions: Dict[str, Session] = {}
+        # 二级索引（多个来源的监控器可以共用同一个索引）
+        self.index = index if index is not None else SessionIndex()
         self.pinned_sessions: Set[str] = set()
         self.session_names: Dict[str, str] = {}
+        self.file_states: Dict[str, FileState] = {}  # 会话文件路径 -> 解析时的文件状态
+
+        # 独立 todo 文件的目录缓存（由子类按需设置）
+        self.todo_cache: Optional[TodoFileCache] = None
+        self.todo_watcher: Optional[DirectoryWatcher] = None
 
         logger.info(f"{source_type} 监控器初始化，监控目录: {projects_dir}")
 
@@ -43,9 +75,17 @@ class BaseSessionMonitor(QObject):
 
         self.scan_sessions()
 
+        # 监听 todos 目录，单个 todo 文件变化时只刷新对应会话
+        if self.todo_cache is not None:
+            self.todo_watcher = DirectoryWatcher(self.todo_cache.todos_dir, self.todo_file_changed)
+            self.todo_watcher.start()
+
     def stop(self):
         """停止监控"""
         logger.info(f"停止 {self.source_type} 会话监控")
+        if self.todo_watcher is not None:
+            self.todo_watcher.stop()
+            self.todo_watcher = None
 
     def load_pinned_sessions(self):
         """加载标记的会话列表（所有来源共用）"""
@@ -72,22 +112,106 @@ class BaseSessionMonitor(QObject):
         jsonl_files = list(self.projects_dir.rglob("*.jsonl"))
         logger.info(f"找到 {len(jsonl_files)} 个 {self.source_type} 会话文件")
 
+        # 一次性批量刷新 todos 目录缓存，避免逐个会话读取文件
+        if self.todo_cache is not None:
+            self.todo_cache.refresh()
+
+        previous_ids = set(self.sessions)
+        previous_by_file = {session.file_path: session for session in self.sessions.values()}
+        previous_states = self.file_states
         self.sessions.clear()
+        self.file_states = {}
+        reused = 0
 
         for file_path in jsonl_files:
             try:
-                session = self.parse_session_file(file_path)
+                # 先取文件状态再解析：解析过程中文件又被写入时，下次扫描会重新解析
+                state = self.file_state(file_path)
+                previous = previous_by_file.get(str(file_path))
+                if previous is not None and previous_states.get(str(file_path)) == state:
+                    session = self.refresh_session(previous, file_path)
+                    reused += 1
+                else:
+                    session = self.parse_session_file(file_path)
                 if session:
                     self.sessions[session.session_id] = session
+                    self.file_states[str(file_path)] = state
+                    self.index.update(session)
             except Exception as e:
                 logger.error(f"解析 {self.source_type} 会话文件失败 {file_path}: {e}")
 
+        # 会话文件已被删除的会话从索引中移除
+        for session_id in previous_ids - self.sessions.keys():
+            self.index.remove(session_id)
+
         sessions_list = list(self.sessions.values())
         self.sessions_updated.emit(sessions_list)
 
-        logger.info(f"{self.source_type} 会话扫描完成，共 {len(self.sessions)} 个会话")
+        logger.info(f"{self.source_type} 会话扫描完成，共 {len(self.sessions)} 个会话"
+                    f"（{reused} 个文件未变化）")
         return sessions_list
 
+    def file_state(self, file_path: Path) -> FileState:
+        """
+        会话文件当前的状态
+
+        是否有独立 todo 文件也是状态的一部分：Claude Code 会话没有 todo 文件时 todos 来自会话文件本身
+        """
+        stat = file_path.stat()
+        has_todo_file = self.todo_cache is not None and self.todo_cache.get(file_path.stem) is not None
+        return stat.st_mtime_ns, stat.st_size, has_todo_file
+
+    def refresh_session(self, session: Session, file_path: Path) -> Session:
+        """
+        会话文件未变化时复用上次的解析结果，只更新与文件内容无关的字段
+
+        独立 todo 文件的内容从 todo 缓存读取（按 mtime/size 校验）；没有 todo 文件时沿用上次的 todos
+        """
+        session.is_active = self.check_session_active(file_path)
+        session.is_pinned = session.session_id in self.pinned_sessions
+        session.custom_name = self.session_names.get(session.session_id, "")
+        if self.todo_cache is not None:
+            todos = self.todo_cache.get(session.session_id)
+            if todos is not None:
+                session.todos = todos
+        return session
+
+    def seed_sessions(self, sessions: Iterable[Session], file_states: Dict[str, FileState]):
+        """
+        用之前保存的会话（如快照）预置解析结果，下次 scan_sessions() 只解析状态变化的文件
+
+        Args:
+            file_states: 保存这些会话时各会话文件的状态
+        """
+        for session in sessions:
+            state = file_states.get(session.file_path)
+            if session.source_type != self.source_type or state is None:
+                continue
+            self.sessions[session.session_id] = session
+            self.file_states[session.file_path] = tuple(state)
+
+    def todo_file_changed(self, path: str):
+        """watchdog 在后台线程触发，切回所属线程处理"""
+        self.dispatcher(lambda: self._on_todo_file_changed(path))
+
+    def _on_todo_file_changed(self, path: str):
+        """todo 文件变化时只刷新受影响的会话"""
+        if self.todo_cache is None:
+            return
+
+        session_id = self.todo_cache.reload_path(Path(path))
+        if not session_id or session_id not in self.sessions:
+            return
+
+        session = self.sessions[session_id]
+        todos = self.parse_todos(session_id, Path(session.file_path))
+        if todos is session.todos:
+            # TodoList 是驻留的，同一对象说明内容没有变化
+            return
+        session.todos = todos
+        logger.info(f"📝 {self.source_type} 会话 {session_id} 的 todos 已更新，共 {len(session.todos)} 个")
+        self.sessions_updated.emit(list(self.sessions.values()))
+
     def parse_session_file(self, file_path: Path) -> Session:
         """
         解析会话文件（子类必须实现）
@@ -96,7 +220,7 @@ class BaseSessionMonitor(QObject):
         """
         raise NotImplementedError("子类必须实现 parse_session_file 方法")
 
-    def parse_todos(self, session_id: str, file_path: Path) -> List[TodoItem]:
+    def parse_todos(self, session_id: str, file_path: Path) -> TodoList:
         """
         解析 todos（子类必须实现）
         """
@@ -117,10 +241,19 @@ class BaseSessionMonitor(QObject):
             logger.debug(f"检查文件修改时间失败: {e}")
             return False
 
+    @staticmethod
+    def file_mtime(file_path: Path) -> datetime:
+        """文件修改时间（会话文件中没有时间戳时作为默认时间）"""
+        return datetime.fromtimestamp(file_path.stat().st_mtime)
+
     def get_session(self, session_id: str) -> Session:
         """获取指定会话"""
         return self.sessions.get(session_id)
 
+    def get_sessions_by_project(self, project_path: str) -> List[Session]:
+        """获取指定项目目录（会话文件所在目录的完整路径）下的会话"""
+        return [s for s in self.index.by_project_path(project_path) if s.source_type == self.source_type]
+
     def get_all_sessions(self) -> List[Session]:
         """获取所有会话"""
         return list(self.sessions.values())
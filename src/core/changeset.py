@@ -0,0 +1,88 @@
+"""
+会话快照与变更集
+
+守护进程（src/daemon.py）用 ChangeTracker 把每次扫描结果与上次发布的内容比较，
+只把变化的会话作为变更集推送给订阅者；前端用 SessionMirror 应用快照和变更集，
+在本地还原出与守护进程一致的会话列表。
+
+事件格式（每行一个 JSON）：
+    {"event": "snapshot", "version": 3, "sessions": [...]}
+    {"event": "changes", "version": 4, "upserted": [...], "removed": ["<session_id>"]}
+"""
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from src.data.models import Session
+
+
+class ChangeSet(NamedTuple):
+    """一次发布的变化"""
+    version: int
+    upserted: List[dict]   # 新增或发生变化的会话（Session.to_dict() 格式）
+    removed: List[str]     # 被移除的会话ID
+
+    def to_event(self) -> dict:
+        return {'event': 'changes', 'version': self.version,
+                'upserted': self.upserted, 'removed': self.removed}
+
+
+class ChangeTracker:
+    """记录最近一次发布的会话内容，计算变更集"""
+
+    def __init__(self):
+        self.version = 0
+        self._published: Dict[str, dict] = {}
+
+    def update(self, sessions: Iterable[Session]) -> Optional[ChangeSet]:
+        """
+        与上次发布的内容比较
+
+        Returns:
+            有变化时返回变更集（版本号加一），没有变化返回 None
+        """
+        current = {session.session_id: session.to_dict() for session in sessions}
+        upserted = [data for session_id, data in current.items()
+                    if self._published.get(session_id) != data]
+        removed = [session_id for session_id in self._published if session_id not in current]
+        self._published = current
+
+        if not upserted and not removed:
+            return None
+        self.version += 1
+        return ChangeSet(self.version, upserted, removed)
+
+    def snapshot_event(self) -> dict:
+        """当前完整快照（新订阅者首先收到）"""
+        return {'event': 'snapshot', 'version': self.version,
+                'sessions': list(self._published.values())}
+
+
+class SessionMirror:
+    """在前端应用守护进程推送的快照和变更集"""
+
+    def __init__(self):
+        self.version = -1
+        self.sessions: Dict[str, Session] = {}
+
+    def apply(self, event: dict) -> bool:
+        """
+        应用一个事件
+
+        Returns:
+            会话列表是否发生变化
+        """
+        kind = event.get('event')
+        if kind == 'snapshot':
+            self.sessions = {data['session_id']: Session.from_dict(data)
+                             for data in event.get('sessions', ())}
+            self.version = event.get('version', 0)
+            return True
+
+        if kind == 'changes':
+            for session_id in event.get('removed', ()):
+                self.sessions.pop(session_id, None)
+            for data in event.get('upserted', ()):
+                self.sessions[data['session_id']] = Session.from_dict(data)
+            self.version = event.get('version', self.version)
+            return True
+
+        return False
@@ -0,0 +1,334 @@
+"""
+本地控制接口（Unix domain socket + 按行分隔的 JSON-RPC）
+
+运行中的监控器（桌面应用或命令行版）监听 ~/.claudecode-cola/control.sock，
+claudecode_cola_api.py 等外部命令通过它直接操作内存中的会话，修改立即生效。
+
+请求:  {"id": 1, "method": "pin", "params": {"session_ids": ["3f2a"]}}\\n
+响应:  {"id": 1, "result": ...}\\n  或  {"id": 1, "error": {"message": "..."}}\\n
+
+订阅:  {"id": 1, "method": "subscribe"}\\n 之后连接保持打开，服务端先推送一个快照事件，
+       再持续推送 publish() 发布的事件（每行一个 JSON，格式见 src/core/changeset.py）
+"""
+import asyncio
+import concurrent.futures
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from src.utils.logger import logger
+
+CONTROL_SOCKET = Path.home() / '.claudecode-cola' / 'control.sock'
+
+# 在所属线程中执行一个无参函数并返回结果
+Invoker = Callable[[Callable[[], Any]], Any]
+
+
+class ControlError(Exception):
+    """控制接口返回的错误"""
+
+
+def direct_invoker(fn: Callable[[], Any]) -> Any:
+    """直接在 socket 处理线程中执行（方法本身线程安全时使用）"""
+    return fn()
+
+
+def asyncio_invoker(loop: asyncio.AbstractEventLoop, timeout: float = 5.0) -> Invoker:
+    """把调用切换到 asyncio 事件循环线程中执行"""
+    def invoke(fn: Callable[[], Any]) -> Any:
+        future = concurrent.futures.Future()
+
+        def run():
+            try:
+                future.set_result(fn())
+            except Exception as e:
+                future.set_exception(e)
+
+        loop.call_soon_threadsafe(run)
+        return future.result(timeout)
+    return invoke
+
+
+def daemon_available(socket_path: Path = CONTROL_SOCKET) -> bool:
+    """控制接口后面是否是守护进程（src/daemon.py），而不是桌面应用/命令行版"""
+    try:
+        info = ControlClient(socket_path, timeout=0.5).call('info')
+    except (OSError, ControlError, ValueError):
+        return False
+    return isinstance(info, dict) and info.get('mode') == 'daemon'
+
+
+class _Subscriber:
+    """一个订阅连接的待发送事件队列"""
+    MAX_PENDING = 1000  # 客户端长时间不读取时断开，重连后会重新收到快照
+
+    def __init__(self):
+        self.events: 'queue.Queue[Optional[bytes]]' = queue.Queue(self.MAX_PENDING)
+        self.closed = False
+
+    def push(self, data: Optional[bytes]):
+        try:
+            self.events.put_nowait(data)
+        except queue.Full:
+            self.closed = True
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """每个连接可以连续发送多条请求，每行一条；subscribe 请求之后连接转为事件推送"""
+
+    def handle(self):
+        control = self.server.control
+        for line in self.rfile:
+            line = line.strip()
+            if not line:
+                continue
+            if control.subscribable and _is_subscribe(line):
+                self._stream(control)
+                return
+            response = control.dispatch(line)
+            if not self._send(response):
+                return
+
+    def _stream(self, control: 'ControlServer'):
+        subscriber = _Subscriber()
+        try:
+            snapshot = control.invoker(lambda: control._add_subscriber(subscriber))
+            if not self._send(_encode(snapshot)):
+                return
+            while not subscriber.closed:
+                try:
+                    data = subscriber.events.get(timeout=1.0)
+                except queue.Empty:
+                    continue
+                if data is None or not self._send(data):
+                    return
+        except Exception as e:
+            logger.error(f"控制接口订阅失败: {e}")
+        finally:
+            control._remove_subscriber(subscriber)
+
+    def _send(self, data: bytes) -> bool:
+        try:
+            self.wfile.write(data + b'\n')
+            self.wfile.flush()
+            return True
+        except OSError:
+            return False
+
+
+def _is_subscribe(line: bytes) -> bool:
+    try:
+        request = json.loads(line)
+    except ValueError:
+        return False
+    return isinstance(request, dict) and request.get('method') == 'subscribe'
+
+
+def _encode(data: Any) -> bytes:
+    return json.dumps(data, ensure_ascii=False, default=str).encode('utf-8')
+
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class ControlServer:
+    """
+    控制接口服务端
+
+    Args:
+        methods: 方法名 -> 处理函数（以 params 作为关键字参数调用，返回值需可 JSON 序列化）
+        socket_path: socket 文件路径
+        invoker: 把处理函数切换到会话数据所属线程中执行（Qt 主线程 / asyncio 事件循环）
+        snapshot: 提供订阅时的初始快照事件；为 None 时不支持 subscribe
+    """
+
+    def __init__(self, methods: Dict[str, Callable[..., Any]],
+                 socket_path: Path = CONTROL_SOCKET, invoker: Invoker = direct_invoker,
+                 snapshot: Optional[Callable[[], dict]] = None):
+        self.methods = dict(methods)
+        self.socket_path = Path(socket_path)
+        self.invoker = invoker
+        self.snapshot = snapshot
+        self._server: Optional[_UnixServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._subscribers: List[_Subscriber] = []
+        self._subscribers_lock = threading.Lock()
+
+    @property
+    def subscribable(self) -> bool:
+        return self.snapshot is not None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event: dict):
+        """
+        向所有订阅者推送事件
+
+        需要在 invoker 对应的线程中调用，保证与订阅时的快照顺序一致
+        """
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+        if not subscribers:
+            return
+        data = _encode(event)
+        for subscriber in subscribers:
+            subscriber.push(data)
+
+    def _add_subscriber(self, subscriber: _Subscriber) -> dict:
+        """在所属线程中获取快照并登记订阅者（两步之间不会漏掉发布的事件）"""
+        snapshot = self.snapshot()
+        with self._subscribers_lock:
+            self._subscribers.append(subscriber)
+        logger.info(f"新的订阅者，当前 {len(self._subscribers)} 个")
+        return snapshot
+
+    def _remove_subscriber(self, subscriber: _Subscriber):
+        with self._subscribers_lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    def start(self) -> bool:
+        """启动服务，已有其他监控器在监听时返回 False"""
+        if self._server is not None:
+            return True
+
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            if ControlClient(self.socket_path, timeout=0.5).is_available():
+                logger.warning(f"控制接口已被其他监控器占用: {self.socket_path}")
+                return False
+            # 上次异常退出残留的 socket 文件
+            self.socket_path.unlink()
+
+        try:
+            server = _UnixServer(str(self.socket_path), _RequestHandler)
+        except OSError as e:
+            logger.error(f"启动控制接口失败 {self.socket_path}: {e}")
+            return False
+        os.chmod(self.socket_path, 0o600)
+        server.control = self
+        self._server = server
+        self._thread = threading.Thread(target=server.serve_forever, name='cola-control', daemon=True)
+        self._thread.start()
+        logger.info(f"🔌 控制接口已启动: {self.socket_path}")
+        return True
+
+    def stop(self):
+        """停止服务并删除 socket 文件"""
+        if self._server is None:
+            return
+        with self._subscribers_lock:
+            for subscriber in self._subscribers:
+                subscriber.push(None)
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        self._thread = None
+        try:
+            self.socket_path.unlink()
+        except OSError:
+            pass
+        logger.info("控制接口已停止")
+
+    def dispatch(self, line: bytes) -> bytes:
+        """处理一条请求，返回编码后的响应"""
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get('id')
+            method = self.methods.get(request.get('method'))
+            if method is None:
+                raise ControlError(f"未知方法: {request.get('method')}")
+            params = request.get('params') or {}
+            if not isinstance(params, dict):
+                raise ControlError("params 必须是对象")
+            result = self.invoker(lambda: method(**params))
+            response = {'id': request_id, 'result': result}
+        except Exception as e:
+            if not isinstance(e, ControlError):
+                logger.error(f"控制接口请求处理失败: {e}")
+            response = {'id': request_id, 'error': {'message': str(e)}}
+        return _encode(response)
+
+
+class ControlClient:
+    """控制接口客户端（同步，每次调用使用一条短连接）"""
+
+    def __init__(self, socket_path: Path = CONTROL_SOCKET, timeout: float = 2.0):
+        self.socket_path = Path(socket_path)
+        self.timeout = timeout
+        self._next_id = 1
+
+    def is_available(self) -> bool:
+        """是否有监控器在监听"""
+        try:
+            with self._connect():
+                return True
+        except OSError:
+            return False
+
+    def call(self, method: str, **params) -> Any:
+        """
+        调用远程方法
+
+        Raises:
+            ConnectionError / OSError: 没有监控器在运行
+            ControlError: 服务端返回错误
+        """
+        request_id = self._next_id
+        self._next_id += 1
+        payload = json.dumps({'id': request_id, 'method': method, 'params': params},
+                             ensure_ascii=False).encode('utf-8') + b'\n'
+
+        with self._connect() as sock:
+            sock.sendall(payload)
+            with sock.makefile('rb') as reader:
+                line = reader.readline()
+        if not line:
+            raise ConnectionError("控制接口连接已关闭")
+
+        response = json.loads(line)
+        if 'error' in response:
+            raise ControlError(response['error'].get('message', '未知错误'))
+        return response.get('result')
+
+    def subscribe(self) -> Iterator[dict]:
+        """
+        订阅事件流：先得到快照事件，之后是变更事件；连接断开时迭代结束
+
+        Raises:
+            ConnectionError / OSError: 没有监控器在运行
+            ControlError: 服务端不支持订阅
+        """
+        sock = self._connect()
+        try:
+            sock.settimeout(None)  # 事件推送没有固定间隔
+            sock.sendall(b'{"id": 0, "method": "subscribe"}\n')
+            with sock.makefile('rb') as reader:
+                for line in reader:
+                    event = json.loads(line)
+                    if 'error' in event:
+                        raise ControlError(event['error'].get('message', '未知错误'))
+                    yield event
+        finally:
+            sock.close()
+
+    def _connect(self) -> socket.socket:
+        if not hasattr(socket, 'AF_UNIX'):
+            raise ConnectionError("当前平台不支持 Unix domain socket")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(str(self.socket_path))
+        except OSError:
+            sock.close()
+            raise
+        return sock
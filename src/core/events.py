@@ -0,0 +1,54 @@
+"""
+纯 Python 的信号/回调机制
+
+扫描引擎（src/core 下的监控器）不依赖 Qt：监控器用 Signal 通知观察者，
+后台线程（watchdog、socket）的回调通过 Dispatcher 切换到引擎所属线程执行。
+
+- 桌面应用：Dispatcher 由 src/core/qt_invoker.py 提供（排队到 Qt 主线程）
+- 守护进程 / 脚本：使用 asyncio 的 loop.call_soon_threadsafe，或直接调用
+"""
+import threading
+from typing import Any, Callable, List, Optional
+
+from src.utils.logger import logger
+
+# 把一个无参函数交给所属线程执行（不等待结果）
+Dispatcher = Callable[[Callable[[], None]], Any]
+
+
+def call_directly(fn: Callable[[], None]):
+    """在当前线程直接执行（单线程使用或回调本身线程安全时）"""
+    fn()
+
+
+class Signal:
+    """
+    同步信号：emit() 在调用线程中依次执行已连接的回调
+
+    接口与 pyqtSignal 的 connect / disconnect / emit 一致，界面代码可以直接连接
+    """
+
+    def __init__(self):
+        self._slots: List[Callable[..., Any]] = []
+        self._lock = threading.Lock()
+
+    def connect(self, slot: Callable[..., Any]):
+        with self._lock:
+            self._slots.append(slot)
+
+    def disconnect(self, slot: Optional[Callable[..., Any]] = None):
+        """断开指定回调；不传参数时断开全部"""
+        with self._lock:
+            if slot is None:
+                self._slots.clear()
+            elif slot in self._slots:
+                self._slots.remove(slot)
+
+    def emit(self, *args):
+        with self._lock:
+            slots = list(self._slots)
+        for slot in slots:
+            try:
+                slot(*args)
+            except Exception as e:
+                logger.error(f"信号回调执行失败 {getattr(slot, '__qualname__', slot)}: {e}")
@@ -0,0 +1,81 @@
+"""
+目录监听器（基于 watchdog）
+"""
+from pathlib import Path
+from typing import Callable, Optional
+
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+from src.utils.logger import logger
+
+
+class _SuffixEventHandler(FileSystemEventHandler):
+    """只转发指定后缀文件的事件"""
+
+    def __init__(self, suffix: str, callback: Callable[[str], None]):
+        self.suffix = suffix
+        self.callback = callback
+
+    def _dispatch_path(self, path: str):
+        if path and path.endswith(self.suffix):
+            self.callback(path)
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self._dispatch_path(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self._dispatch_path(event.src_path)
+
+    def on_deleted(self, event):
+        if not event.is_directory:
+            self._dispatch_path(event.src_path)
+
+    def on_moved(self, event):
+        # 原子写入（先写临时文件再 rename）会产生 moved 事件
+        if not event.is_directory:
+            self._dispatch_path(event.src_path)
+            self._dispatch_path(event.dest_path)
+
+
+class DirectoryWatcher:
+    """
+    监听单个目录（不递归）中指定后缀文件的变化
+
+    注意：回调在 watchdog 的后台线程中执行，调用方需要自行切换到所属线程
+    """
+
+    def __init__(self, directory: Path, callback: Callable[[str], None], suffix: str = '.json'):
+        self.directory = directory
+        self.callback = callback
+        self.suffix = suffix
+        self.observer: Optional[Observer] = None
+
+    def start(self):
+        """启动监听"""
+        if self.observer is not None:
+            return
+        if not self.directory.is_dir():
+            logger.info(f"目录不存在，跳过监听: {self.directory}")
+            return
+
+        self.observer = Observer()
+        self.observer.schedule(
+            _SuffixEventHandler(self.suffix, self.callback),
+            str(self.directory),
+            recursive=False
+        )
+        self.observer.daemon = True
+        self.observer.start()
+        logger.info(f"👁️ 开始监听目录: {self.directory}")
+
+    def stop(self):
+        """停止监听"""
+        if self.observer is None:
+            return
+        self.observer.stop()
+        self.observer.join(timeout=2)
+        self.observer = None
+        logger.info(f"停止监听目录: {self.directory}")
@@ -1,32 +1,41 @@
 """
 多源会话监控聚合器
 """
+from datetime import datetime
 from pathlib import Path
-from typing import List
-
-from PyQt6.QtCore import QObject, pyqtSignal
+from typing import Callable, Dict, Iterable, List
 
+from src.core.base_monitor import FileState, save_pinned_sessions, save_session_names
+from src.core.control_server import ControlError
+from src.core.events import Dispatcher, Signal, call_directly
+from src.core.session_index import SessionIdIndex, SessionIndex
 from src.core.session_monitor import ClaudeSessionMonitor
 from src.core.qoder_monitor import QoderSessionMonitor
 from src.data.models import Session
 from src.utils.logger import logger
 
 
-class MultiSourceMonitor(QObject):
-    """多源会话监控聚合器（支持 Claude Code 和 Qoder）"""
+class MultiSourceMonitor:
+    """
+    多源会话监控聚合器（支持 Claude Code 和 Qoder）
 
-    sessions_updated = pyqtSignal(list)
+    Args:
+        dispatcher: 后台线程回调切换到所属线程的方式（桌面应用传入 Qt 主线程调用器）
+    """
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, dispatcher: Dispatcher = call_directly):
+        self.sessions_updated = Signal()  # 参数: List[Session]
 
         claude_projects_dir = Path.home() / '.claude' / 'projects'
         qoder_projects_dir = Path.home() / '.qoder' / 'projects'
 
-        self.claude_monitor = ClaudeSessionMonitor(claude_projects_dir)
-        self.qoder_monitor = QoderSessionMonitor(qoder_projects_dir)
+        # 两个来源共用一个二级索引，按项目/来源/状态查询会话时不需要遍历
+        self.index = SessionIndex()
+        self.claude_monitor = ClaudeSessionMonitor(claude_projects_dir, index=self.index, dispatcher=dispatcher)
+        self.qoder_monitor = QoderSessionMonitor(qoder_projects_dir, index=self.index, dispatcher=dispatcher)
 
-        # 连接子监控器的信号
+        # 连接子监控器的信号（全量扫描期间不转发，扫描完成后只发出一次聚合结果）
+        self._scanning = False
         self.claude_monitor.sessions_updated.connect(self._on_sessions_updated)
         self.qoder_monitor.sessions_updated.connect(self._on_sessions_updated)
 
@@ -35,8 +44,14 @@ class MultiSourceMonitor(QObject):
     def start(self):
         """启动所有监控器"""
         logger.info("启动多源监控器...")
-        self.claude_monitor.start()
-        self.qoder_monitor.start()
+        self._scanning = True
+        try:
+            self.claude_monitor.start()
+            self.qoder_monitor.start()
+        finally:
+            self._scanning = False
+        self.index.save_if_dirty()
+        self.sessions_updated.emit(self.get_all_sessions())
 
     def stop(self):
         """停止所有监控器"""
@@ -52,8 +67,12 @@ class MultiSourceMonitor(QObject):
         """
         # 触发子监控器重新扫描
         logger.info("开始重新扫描所有来源的会话...")
-        self.claude_monitor.scan_sessions()
-        self.qoder_monitor.scan_sessions()
+        self._scanning = True
+        try:
+            self.claude_monitor.scan_sessions()
+            self.qoder_monitor.scan_sessions()
+        finally:
+            self._scanning = False
 
         # 聚合结果
         claude_sessions = self.claude_monitor.get_all_sessions()
@@ -64,14 +83,19 @@ class MultiSourceMonitor(QObject):
         logger.info(f"所有会话聚合完成，共 {len(all_sessions)} 个会话 "
                    f"(Claude: {len(claude_sessions)}, Qoder: {len(qoder_sessions)})")
 
+        # 会话位置有变化时持久化索引，供命令行工具直接查询
+        self.index.save_if_dirty()
+
         self.sessions_updated.emit(all_sessions)
 
     def _on_sessions_updated(self, sessions: List[Session]):
         """
         子监控器会话更新时触发
 
-        注意：这里只聚合数据，不重新扫描，避免循环触发
+        注意：这里只聚合数据，不重新扫描，避免循环触发；全量扫描期间由扫描结束时统一发出
         """
+        if self._scanning:
+            return
         claude_sessions = self.claude_monitor.get_all_sessions()
         qoder_sessions = self.qoder_monitor.get_all_sessions()
         all_sessions = claude_sessions + qoder_sessions
@@ -87,7 +111,134 @@ class MultiSourceMonitor(QObject):
 
     def get_session(self, session_id: str) -> Session:
         """获取指定会话"""
-        session = self.claude_monitor.get_session(session_id)
-        if session:
-            return session
-        return self.qoder_monitor.get_session(session_id)
+        return self.index.get(session_id)
+
+    def file_states(self) -> Dict[str, FileState]:
+        """所有来源的会话文件解析时的状态（与会话一起保存到快照）"""
+        return {**self.claude_monitor.file_states, **self.qoder_monitor.file_states}
+
+    def seed_sessions(self, sessions: List[Session], file_states: Dict[str, FileState]):
+        """用快照中的会话预置各来源的解析结果，之后的扫描只解析状态变化的文件"""
+        self.claude_monitor.seed_sessions(sessions, file_states)
+        self.qoder_monitor.seed_sessions(sessions, file_states)
+
+    def get_sessions_by_project(self, project_path: str) -> List[Session]:
+        """获取指定项目目录（会话文件所在目录的完整路径）下的会话（所有来源）"""
+        return self.index.by_project_path(project_path)
+
+    def get_sessions_by_source(self, source_type: str) -> List[Session]:
+        """获取指定来源的会话"""
+        return self.index.by_source(source_type)
+
+    def set_pinned(self, session_ids: Iterable[str], pinned: bool) -> dict:
+        """
+        批量标记/取消标记会话（会话ID支持唯一前缀）
+
+        直接修改内存中的会话并保存配置文件，不需要重新扫描即可刷新界面
+
+        Returns:
+            {'changed': [{'session_id', 'project_name'}], 'errors': [{'session_id', 'message', 'candidates'}]}
+        """
+        # 重新读取配置文件，合并其他进程（如命令行版）的修改
+        self.claude_monitor.load_pinned_sessions()
+        pinned_ids = set(self.claude_monitor.pinned_sessions)
+        pinned_index = SessionIdIndex(pinned_ids)
+
+        changed = []
+        errors = []
+        for prefix in session_ids:
+            match = self.index.resolve_prefix(prefix)
+            if match.session_id is None and not pinned and not match.candidates:
+                # 会话文件已删除但仍在标记列表中
+                match = pinned_index.resolve(prefix)
+            session_id = match.session_id
+            if session_id is None:
+                message = "会话ID前缀不唯一" if match.candidates else "会话不存在"
+                errors.append({'session_id': prefix, 'message': message, 'candidates': match.candidates})
+                continue
+
+            if (session_id in pinned_ids) == pinned:
+                message = "会话已经被标记" if pinned else "会话未被标记"
+                errors.append({'session_id': session_id, 'message': message, 'candidates': []})
+                continue
+
+            if pinned:
+                pinned_ids.add(session_id)
+            else:
+                pinned_ids.discard(session_id)
+            session = self.index.get(session_id)
+            if session is not None:
+                session.is_pinned = pinned
+                self.index.update(session)
+            changed.append({'session_id': session_id,
+                            'project_name': session.project_name if session is not None else ''})
+            logger.info(f"{'✅ 会话已标记' if pinned else '📌 会话已取消标记'}: {session_id}")
+
+        if changed:
+            save_pinned_sessions(pinned_ids)
+            self.claude_monitor.pinned_sessions = set(pinned_ids)
+            self.qoder_monitor.pinned_sessions = set(pinned_ids)
+            self.sessions_updated.emit(self.get_all_sessions())
+
+        return {'changed': changed, 'errors': errors}
+
+    def set_session_name(self, session_id: str, name: str) -> dict:
+        """设置（name 为空时删除）会话的自定义名称"""
+        self.claude_monitor.load_session_names()
+        session_names = dict(self.claude_monitor.session_names)
+        if name:
+            session_names[session_id] = name
+            logger.info(f"✏️ 会话 {session_id} 重命名为: {name}")
+        elif session_names.pop(session_id, None) is not None:
+            logger.info(f"🗑️ 会话 {session_id} 的自定义名称已删除")
+
+        save_session_names(session_names)
+        self.claude_monitor.session_names = dict(session_names)
+        self.qoder_monitor.session_names = dict(session_names)
+
+        session = self.index.get(session_id)
+        if session is not None and session.custom_name != name:
+            session.custom_name = name
+            self.sessions_updated.emit(self.get_all_sessions())
+        return {'session_id': session_id, 'custom_name': name}
+
+    def control_methods(self) -> Dict[str, Callable]:
+        """控制接口（ControlServer）可调用的方法"""
+        return {
+            'pin': lambda session_ids: self.set_pinned(session_ids, True),
+            'unpin': lambda session_ids: self.set_pinned(session_ids, False),
+            'list': self._rpc_list,
+            'get_session': self._rpc_get_session,
+            'snapshot': self._rpc_snapshot,
+            'rename': self.set_session_name,
+            'refresh': self._rpc_refresh,
+        }
+
+    def _rpc_list(self) -> dict:
+        """已标记的会话（文件已删除的会话ID放在 missing 中）"""
+        self.claude_monitor.load_pinned_sessions()
+        sessions = []
+        missing = []
+        for session_id in sorted(self.claude_monitor.pinned_sessions):
+            session = self.index.get(session_id)
+            if session is not None:
+                sessions.append(session.to_dict())
+            else:
+                missing.append(session_id)
+        return {'sessions': sessions, 'missing': missing}
+
+    def _rpc_get_session(self, session_id: str) -> dict:
+        match = self.index.resolve_prefix(session_id)
+        if match.session_id is None:
+            raise ControlError("会话ID前缀不唯一" if match.candidates else f"会话 {session_id} 不存在")
+        return self.index.get(match.session_id).to_dict()
+
+    def _rpc_refresh(self) -> dict:
+        self.scan_all_sessions()
+        return {'sessions': len(self.index)}
+
+    def _rpc_snapshot(self) -> dict:
+        return {
+            'generated_at': datetime.now().isoformat(),
+            'sessions': [session.to_dict() for session in self.get_all_sessions()],
+        }
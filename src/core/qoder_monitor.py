@@ -4,24 +4,29 @@ Qoder 会话监控器
 import json
 from pathlib import Path
 from datetime import datetime
-from typing import List
 
 from src.core.base_monitor import BaseSessionMonitor
-from src.core.todo_parser import TodoParser
-from src.data.models import Session, TodoItem
+from src.core.events import Dispatcher, call_directly
+from src.core.session_index import SessionIndex
+from src.core.todo_cache import TodoFileCache
+from src.data.models import EMPTY_TODOS, MessageRef, Session, TodoList
 from src.utils.logger import logger
+from src.utils.message_preview import build_message_preview
 from src.utils.path_decoder import decode_encoded_dirname
 
 
 class QoderSessionMonitor(BaseSessionMonitor):
     """Qoder 会话监控器"""
 
-    def __init__(self, projects_dir: Path):
-        super().__init__(projects_dir, source_type="qoder")
+    def __init__(self, projects_dir: Path, todos_dir: Path = None, index: SessionIndex = None,
+                 dispatcher: Dispatcher = call_directly):
+        super().__init__(projects_dir, source_type="qoder", index=index, dispatcher=dispatcher)
+        self.todo_cache = TodoFileCache(todos_dir or Path.home() / '.qoder' / 'todos')
 
-    def parse_todos(self, session_id: str, file_path: Path) -> List[TodoItem]:
-        """解析 Qoder 的 todos（从独立的 json 文件）"""
-        return TodoParser.parse_qoder_todos(session_id)
+    def parse_todos(self, session_id: str, file_path: Path) -> TodoList:
+        """解析 Qoder 的 todos（从独立的 json 文件，经目录缓存读取）"""
+        todos = self.todo_cache.get(session_id)
+        return todos if todos is not None else EMPTY_TODOS
 
     def parse_session_file(self, file_path: Path) -> Session:
         """
@@ -48,11 +53,16 @@ class QoderSessionMonitor(BaseSessionMonitor):
         start_time = None
         last_activity = None
         message_count = 0
-        last_message = ""
+        last_message_data = None
+        last_message_offset = -1
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
+            # 以二进制方式读取，记录每行的字节偏移，供按需读取完整消息
+            with open(file_path, 'rb') as f:
+                offset = 0
                 for line in f:
+                    line_offset = offset
+                    offset += len(line)
                     try:
                         data = json.loads(line.strip())
 
@@ -66,14 +76,21 @@ class QoderSessionMonitor(BaseSessionMonitor):
                         # 统计消息
                         if 'role' in data:
                             message_count += 1
-                            last_message = str(data)
+                            last_message_data = data
+                            last_message_offset = line_offset
 
                     except json.JSONDecodeError:
                         continue
 
-            # 默认值处理
+            # 只保留有字节预算的预览文本和消息位置，不持有完整消息对象
+            last_message = build_message_preview(last_message_data) if last_message_data is not None else ""
+            last_message_ref = MessageRef(str(file_path), last_message_offset, "") \
+                if last_message_offset >= 0 else None
+            last_message_data = None
+
+            # 默认值处理（没有时间戳时使用文件修改时间，重复扫描未变化的文件得到相同结果）
             if not start_time:
-                start_time = datetime.now()
+                start_time = self.file_mtime(file_path)
             if not last_activity:
                 last_activity = start_time
 
@@ -92,9 +109,8 @@ class QoderSessionMonitor(BaseSessionMonitor):
                 project_display_name = decode_encoded_dirname(dir_name)
 
             custom_name = self.session_names.get(session_id, "")
-            logger.info(f"🔍 正在解析 Qoder 会话 todos: {session_id}")
-            todos = self.parse_todos(session_id, file_path)  # 从独立文件解析
-            logger.info(f"📊 Qoder 会话 {session_id} 解析到 {len(todos)} 个 todos")
+            todos = self.parse_todos(session_id, file_path)  # 从独立文件解析（目录缓存）
+            logger.debug(f"📊 Qoder 会话 {session_id} 解析到 {len(todos)} 个 todos")
 
             session = Session(
                 session_id=session_id,
@@ -108,6 +124,7 @@ class QoderSessionMonitor(BaseSessionMonitor):
                 todos=todos,
                 message_count=message_count,
                 last_message=last_message,
+                last_message_ref=last_message_ref,
                 file_path=str(file_path),
                 source_type="qoder"  # 关键：标记来源
             )
@@ -0,0 +1,44 @@
+"""
+Qt 主线程调用器（扫描引擎的 Qt 适配层）
+
+src/core 下的监控器是纯 Python 的，桌面应用通过这里把后台线程的调用
+切换到 Qt 主线程：
+- __call__: 控制接口请求在 socket 线程中处理，排队到主线程执行并等待结果
+- post: 作为监控器的 Dispatcher，排队到主线程执行，不等待
+"""
+import concurrent.futures
+from typing import Any, Callable
+
+from PyQt6.QtCore import QObject, QThread, Qt, pyqtSignal
+
+
+class MainThreadInvoker(QObject):
+    """在创建该对象的线程（Qt 主线程）中执行函数"""
+
+    _call_requested = pyqtSignal(object)
+
+    def __init__(self, timeout: float = 5.0):
+        super().__init__()
+        self.timeout = timeout
+        self._call_requested.connect(self._run, Qt.ConnectionType.QueuedConnection)
+
+    def __call__(self, fn: Callable[[], Any]) -> Any:
+        if QThread.currentThread() is self.thread():
+            return fn()
+        future = concurrent.futures.Future()
+        self._call_requested.emit((fn, future))
+        return future.result(self.timeout)
+
+    def post(self, fn: Callable[[], Any]):
+        """排队到主线程执行，不等待结果"""
+        self._call_requested.emit((fn, None))
+
+    def _run(self, request):
+        fn, future = request
+        if future is None:
+            fn()
+            return
+        try:
+            future.set_result(fn())
+        except Exception as e:
+            future.set_exception(e)
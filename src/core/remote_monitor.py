@@ -0,0 +1,126 @@
+"""
+守护进程客户端监控器
+
+守护进程（src/daemon.py）运行时，桌面应用不再自己扫描文件，
+而是订阅守护进程推送的快照和变更集，接口与 MultiSourceMonitor 保持一致。
+
+连接断开时发出 disconnected（重连后收到新快照之前，当前会话都是旧数据）；
+重连时发现守护进程已经退出则发出 daemon_lost 并停止订阅，由前端改为本地扫描。
+"""
+import threading
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from src.core.changeset import SessionMirror
+from src.core.control_server import CONTROL_SOCKET, ControlClient, ControlError, daemon_available
+from src.core.events import Dispatcher, Signal, call_directly
+from src.core.session_index import SessionIndex
+from src.data.models import Session
+from src.utils.logger import logger
+
+RECONNECT_INTERVAL = 2.0  # 秒
+
+
+class RemoteSessionMonitor:
+    """
+    订阅守护进程的会话监控器
+
+    Args:
+        dispatcher: 订阅线程收到的事件切换到所属线程处理的方式
+    """
+
+    def __init__(self, socket_path: Path = CONTROL_SOCKET, dispatcher: Dispatcher = call_directly):
+        self.sessions_updated = Signal()  # 参数: List[Session]
+        self.disconnected = Signal()      # 与守护进程的连接断开
+        self.daemon_lost = Signal()       # 守护进程已退出，不再重连
+        self.dispatcher = dispatcher
+        self.socket_path = socket_path
+        self.client = ControlClient(socket_path)
+        self.mirror = SessionMirror()
+        self.index = SessionIndex()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """启动订阅线程"""
+        if self._thread is not None:
+            return
+        logger.info(f"连接守护进程: {self.socket_path}")
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._subscribe_loop, name='cola-subscribe', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """停止订阅（线程在下次收到事件或断开时退出）"""
+        self._stop_event.set()
+        self._thread = None
+
+    def _subscribe_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                for event in self.client.subscribe():
+                    if self._stop_event.is_set():
+                        return
+                    self.dispatcher(lambda event=event: self._apply_event(event))
+                logger.warning("与守护进程的连接已断开，稍后重连")
+            except (OSError, ControlError, ValueError) as e:
+                logger.warning(f"订阅守护进程失败: {e}")
+            if self._stop_event.is_set():
+                return
+            self.dispatcher(self.disconnected.emit)
+            self._stop_event.wait(RECONNECT_INTERVAL)
+            if not self._stop_event.is_set() and not daemon_available(self.socket_path):
+                logger.warning("守护进程已退出，停止订阅")
+                self.dispatcher(self.daemon_lost.emit)
+                return
+
+    def _apply_event(self, event: dict):
+        """在所属线程中应用快照/变更集，并增量更新索引"""
+        if not self.mirror.apply(event):
+            return
+        if event.get('event') == 'snapshot':
+            self.index.clear()
+            changed_ids = self.mirror.sessions.keys()
+        else:
+            for session_id in event.get('removed', ()):
+                self.index.remove(session_id)
+            changed_ids = [data['session_id'] for data in event.get('upserted', ())]
+        for session_id in changed_ids:
+            self.index.update(self.mirror.sessions[session_id])
+        self.sessions_updated.emit(self.get_all_sessions())
+
+    def scan_all_sessions(self):
+        """请求守护进程重新扫描，结果通过订阅推送回来"""
+        self._call('refresh')
+
+    def get_all_sessions(self) -> List[Session]:
+        """获取所有会话"""
+        return list(self.mirror.sessions.values())
+
+    def get_session(self, session_id: str) -> Session:
+        """获取指定会话"""
+        return self.index.get(session_id)
+
+    def get_sessions_by_project(self, project_path: str) -> List[Session]:
+        """获取指定项目目录（会话文件所在目录的完整路径）下的会话（所有来源）"""
+        return self.index.by_project_path(project_path)
+
+    def get_sessions_by_source(self, source_type: str) -> List[Session]:
+        """获取指定来源的会话"""
+        return self.index.by_source(source_type)
+
+    def set_pinned(self, session_ids: Iterable[str], pinned: bool) -> dict:
+        """批量标记/取消标记会话（由守护进程修改并推送变化）"""
+        result = self._call('pin' if pinned else 'unpin', session_ids=list(session_ids))
+        return result or {'changed': [], 'errors': []}
+
+    def set_session_name(self, session_id: str, name: str) -> dict:
+        """设置会话的自定义名称（由守护进程修改并推送变化）"""
+        return self._call('rename', session_id=session_id, name=name)
+
+    def _call(self, method: str, **params):
+        try:
+            return self.client.call(method, **params)
+        except (OSError, ControlError, ValueError) as e:
+            logger.error(f"调用守护进程 {method} 失败: {e}")
+            return None
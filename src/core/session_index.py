@@ -0,0 +1,290 @@
+"""
+会话二级索引
+
+按项目路径、解码后的项目名、来源类型、会话文件以及标记/活跃状态维护会话ID集合，
+会话变化时增量更新，"某个项目下有哪些会话" 之类的查询不再需要遍历所有会话。
+
+索引只依赖会话对象的属性（session_id / project_path / project_name / file_path /
+source_type / is_pinned / is_active），不依赖 Qt，命令行脚本也可以直接使用。
+
+SessionIdIndex 是按会话ID排序的列表，用二分查找支持唯一前缀解析（O(log n)）。
+"""
+import bisect
+import json
+import os
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+from src.utils.logger import logger
+
+SESSION_INDEX_FILE = Path.home() / '.claudecode-cola' / 'session_index.json'
+
+
+class PrefixMatch(NamedTuple):
+    """会话ID前缀解析结果"""
+    session_id: Optional[str]  # 唯一匹配（或完全相等）的会话ID，没有或不唯一时为 None
+    candidates: List[str]      # 以该前缀开头的会话ID（最多 limit 个，用于提示歧义）
+
+
+class SessionIdIndex:
+    """
+    有序的会话ID集合
+
+    - resolve(): 完全相等或唯一前缀匹配时返回会话ID
+    - with_prefix(): 列出以前缀开头的会话ID
+    查找都是二分查找，新增/删除是有序列表插入
+    """
+
+    def __init__(self, session_ids: Iterable[str] = ()):
+        # 持久化的索引按键排序写入，已排序的输入 sorted() 只需线性时间
+        self._ids: List[str] = sorted(set(session_ids))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, session_id: str) -> bool:
+        i = bisect.bisect_left(self._ids, session_id)
+        return i < len(self._ids) and self._ids[i] == session_id
+
+    def add(self, session_id: str):
+        i = bisect.bisect_left(self._ids, session_id)
+        if i == len(self._ids) or self._ids[i] != session_id:
+            self._ids.insert(i, session_id)
+
+    def remove(self, session_id: str):
+        i = bisect.bisect_left(self._ids, session_id)
+        if i < len(self._ids) and self._ids[i] == session_id:
+            del self._ids[i]
+
+    def clear(self):
+        self._ids.clear()
+
+    def with_prefix(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """以 prefix 开头的会话ID（按字典序）"""
+        ids = self._ids
+        i = bisect.bisect_left(ids, prefix)
+        matches = []
+        while i < len(ids) and ids[i].startswith(prefix):
+            matches.append(ids[i])
+            if limit is not None and len(matches) >= limit:
+                break
+            i += 1
+        return matches
+
+    def resolve(self, prefix: str, limit: int = 5) -> PrefixMatch:
+        """解析会话ID前缀：完全相等优先，其次是唯一的前缀匹配"""
+        if not prefix:
+            return PrefixMatch(None, [])
+        candidates = self.with_prefix(prefix, limit=max(limit, 2))
+        if candidates and (candidates[0] == prefix or len(candidates) == 1):
+            return PrefixMatch(candidates[0], candidates[:1])
+        return PrefixMatch(None, candidates[:limit])
+
+
+class _IndexKey(NamedTuple):
+    """会话在各个索引中的位置（用于增量更新时移除旧的索引项）"""
+    project_path: str
+    project_name: str
+    file_path: str
+    source_type: str
+    is_pinned: bool
+    is_active: bool
+
+
+class SessionIndex:
+    """
+    会话二级索引
+
+    - update(): 新增或更新会话，只有被索引的字段变化时才会调整索引
+    - remove(): 移除会话
+    - by_project_path() / by_project_name() / by_source() / by_file(): O(1) 查询
+    - pinned / active: 标记、活跃会话ID集合
+    """
+
+    def __init__(self):
+        self._sessions: Dict[str, object] = {}
+        self._keys: Dict[str, _IndexKey] = {}
+        self._by_project_path: Dict[str, Set[str]] = defaultdict(set)
+        self._by_project_name: Dict[str, Set[str]] = defaultdict(set)
+        self._by_source: Dict[str, Set[str]] = defaultdict(set)
+        self._by_file: Dict[str, str] = {}
+        self.pinned: Set[str] = set()
+        self.active: Set[str] = set()
+        self.ids = SessionIdIndex()  # 会话ID前缀查询
+        self.dirty = False  # 持久化字段自上次 save() 之后是否变化
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def get(self, session_id: str):
+        return self._sessions.get(session_id)
+
+    def session_ids(self) -> Set[str]:
+        return set(self._sessions)
+
+    def update(self, session) -> bool:
+        """
+        新增或更新会话
+
+        Returns:
+            被索引的字段是否发生变化
+        """
+        session_id = session.session_id
+        key = _IndexKey(
+            session.project_path,
+            session.project_name,
+            getattr(session, 'file_path', ''),
+            getattr(session, 'source_type', 'claude'),
+            bool(getattr(session, 'is_pinned', False)),
+            bool(getattr(session, 'is_active', False)),
+        )
+        self._sessions[session_id] = session
+
+        old_key = self._keys.get(session_id)
+        if old_key == key:
+            return False
+        if old_key is not None:
+            self._unindex(session_id, old_key)
+        else:
+            self.ids.add(session_id)
+        self._index(session_id, key)
+        self._keys[session_id] = key
+
+        if old_key is None or old_key[:4] != key[:4]:
+            self.dirty = True
+        return True
+
+    def remove(self, session_id: str) -> bool:
+        """移除会话，返回会话是否存在"""
+        key = self._keys.pop(session_id, None)
+        if key is None:
+            return False
+        del self._sessions[session_id]
+        self.ids.remove(session_id)
+        self._unindex(session_id, key)
+        self.dirty = True
+        return True
+
+    def clear(self):
+        """清空索引"""
+        if self._sessions:
+            self.dirty = True
+        self._sessions.clear()
+        self._keys.clear()
+        self._by_project_path.clear()
+        self._by_project_name.clear()
+        self._by_source.clear()
+        self._by_file.clear()
+        self.pinned.clear()
+        self.active.clear()
+        self.ids.clear()
+
+    def by_project_path(self, project_path: str) -> List:
+        """
+        按会话的 project_path 查询会话
+
+        桌面版的监控器中是会话文件所在目录的完整路径（如 ~/.claude/projects/-Users-haya-Code-demo），
+        命令行进程检测脚本中是编码后的项目目录名（如 -Users-haya-Code-demo）
+        """
+        return self._lookup(self._by_project_path, project_path)
+
+    def by_project_name(self, project_name: str) -> List:
+        """按解码后的项目路径（如 /Users/haya/Code/demo）查询会话"""
+        return self._lookup(self._by_project_name, project_name)
+
+    def by_source(self, source_type: str) -> List:
+        """按来源（claude / qoder）查询会话"""
+        return self._lookup(self._by_source, source_type)
+
+    def by_file(self, file_path: str):
+        """按会话文件路径查询会话"""
+        session_id = self._by_file.get(file_path)
+        return self._sessions.get(session_id) if session_id is not None else None
+
+    def project_paths(self) -> List[str]:
+        """所有项目目录名（用于按项目分组）"""
+        return list(self._by_project_path)
+
+    def resolve_prefix(self, prefix: str) -> PrefixMatch:
+        """按会话ID前缀查询（O(log n)）"""
+        return self.ids.resolve(prefix)
+
+    def pinned_inactive(self) -> Set[str]:
+        """被标记但已不活跃（需要关注）的会话ID"""
+        return self.pinned - self.active
+
+    def _lookup(self, index: Dict[str, Set[str]], value: str) -> List:
+        session_ids = index.get(value)
+        if not session_ids:
+            return []
+        return [self._sessions[session_id] for session_id in session_ids]
+
+    def _index(self, session_id: str, key: _IndexKey):
+        self._by_project_path[key.project_path].add(session_id)
+        self._by_project_name[key.project_name].add(session_id)
+        self._by_source[key.source_type].add(session_id)
+        if key.file_path:
+            self._by_file[key.file_path] = session_id
+        if key.is_pinned:
+            self.pinned.add(session_id)
+        if key.is_active:
+            self.active.add(session_id)
+
+    def _unindex(self, session_id: str, key: _IndexKey):
+        for index, value in ((self._by_project_path, key.project_path),
+                             (self._by_project_name, key.project_name),
+                             (self._by_source, key.source_type)):
+            session_ids = index.get(value)
+            if session_ids is not None:
+                session_ids.discard(session_id)
+                if not session_ids:
+                    del index[value]
+        if self._by_file.get(key.file_path) == session_id:
+            del self._by_file[key.file_path]
+        self.pinned.discard(session_id)
+        self.active.discard(session_id)
+
+    def save(self, path: Path = SESSION_INDEX_FILE):
+        """
+        持久化会话ID -> 位置信息，供其他进程（如 claudecode_cola_api.py）直接查询
+
+        按会话ID排序写入，读取方可以直接据此构建 SessionIdIndex；
+        先写临时文件再替换，避免读取方看到写了一半的文件
+        """
+        entries = {
+            session_id: {
+                'project_path': key.project_path,
+                'project_name': key.project_name,
+                'file_path': key.file_path,
+                'source_type': key.source_type,
+            }
+            for session_id, key in self._keys.items()
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(path.name + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+            os.replace(tmp_path, path)
+            self.dirty = False
+        except OSError as e:
+            logger.error(f"保存会话索引失败 {path}: {e}")
+
+    def save_if_dirty(self, path: Path = SESSION_INDEX_FILE):
+        """持久化字段有变化时才写入"""
+        if self.dirty:
+            self.save(path)
+
+
+def load_index_entries(path: Path = SESSION_INDEX_FILE) -> Optional[Dict[str, dict]]:
+    """读取持久化的会话索引，文件不存在或损坏时返回 None"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return entries if isinstance(entries, dict) else None
@@ -4,23 +4,55 @@ Claude Code 会话监控器
 import json
 from pathlib import Path
 from datetime import datetime
-from typing import List
+from typing import Optional
 
 from src.core.base_monitor import BaseSessionMonitor
+from src.core.events import Dispatcher, call_directly
+from src.core.session_index import SessionIndex
+from src.core.todo_cache import TodoFileCache, claude_session_id_from_filename
 from src.core.todo_parser import TodoParser
-from src.data.models import Session, TodoItem
+from src.data.models import MessageRef, Session, TodoList
 from src.utils.logger import logger
+from src.utils.message_preview import build_message_preview
 from src.utils.path_decoder import decode_encoded_dirname
 
 
+def parse_timestamp(value) -> Optional[datetime]:
+    """
+    解析 Claude Code 写入的 timestamp 字段（ISO 8601，UTC 以 Z 结尾）
+
+    与命令行版一致，去掉时区信息；无法解析时返回 None
+    """
+    try:
+        timestamp = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        return None
+    if timestamp.tzinfo:
+        timestamp = timestamp.replace(tzinfo=None)
+    return timestamp
+
+
 class ClaudeSessionMonitor(BaseSessionMonitor):
     """Claude Code 会话监控器"""
 
-    def __init__(self, projects_dir: Path):
-        super().__init__(projects_dir, source_type="claude")
+    def __init__(self, projects_dir: Path, todos_dir: Path = None, index: SessionIndex = None,
+                 dispatcher: Dispatcher = call_directly):
+        super().__init__(projects_dir, source_type="claude", index=index, dispatcher=dispatcher)
+        self.todo_cache = TodoFileCache(
+            todos_dir or Path.home() / '.claude' / 'todos',
+            session_id_from_name=claude_session_id_from_filename
+        )
+
+    def parse_todos(self, session_id: str, file_path: Path) -> TodoList:
+        """
+        解析 Claude Code 的 todos
 
-    def parse_todos(self, session_id: str, file_path: Path) -> List[TodoItem]:
-        """解析 Claude Code 的 todos"""
+        优先读取 ~/.claude/todos 下的独立 todo 文件（经目录缓存），
+        只有该会话没有 todo 文件时才回放 jsonl 中的 TodoWrite 调用
+        """
+        todos = self.todo_cache.get(session_id)
+        if todos is not None:
+            return todos
         return TodoParser.parse_claude_todos(file_path)
 
     def parse_session_file(self, file_path: Path) -> Session:
@@ -49,17 +81,27 @@ class ClaudeSessionMonitor(BaseSessionMonitor):
         start_time = None
         last_activity = None
         message_count = 0
-        last_message = ""
+        last_message_data = None
+        last_message_offset = -1
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
+            # 以二进制方式读取，记录每行的字节偏移，供按需读取完整消息
+            with open(file_path, 'rb') as f:
+                offset = 0
                 for line in f:
+                    line_offset = offset
+                    offset += len(line)
                     try:
-                        data = json.loads(line.strip())
-
-                        # 解析时间戳（ISO 8601 格式）
-                        if 'ts' in data:
+                        # 按 UTF-8 文本解析（与按文本读取时一致：带 BOM 的行不是合法 JSON，跳过）
+                        data = json.loads(line.decode('utf-8').strip())
+
+                        # 解析时间戳（ISO 8601 格式；Claude Code 写 timestamp，旧格式写 ts）
+                        ts = None
+                        if 'timestamp' in data:
+                            ts = parse_timestamp(data['timestamp'])
+                        elif 'ts' in data:
                             ts = datetime.fromisoformat(data['ts'])
+                        if ts:
                             if not start_time:
                                 start_time = ts
                             last_activity = ts
@@ -67,14 +109,21 @@ class ClaudeSessionMonitor(BaseSessionMonitor):
                         # 统计消息
                         if 'message' in data:
                             message_count += 1
-                            last_message = data['message']
+                            last_message_data = data['message']
+                            last_message_offset = line_offset
 
                     except json.JSONDecodeError:
                         continue
 
-            # 默认值处理
+            # 只保留有字节预算的预览文本和消息位置，不持有完整消息对象
+            last_message = build_message_preview(last_message_data) if last_message_data is not None else ""
+            last_message_ref = MessageRef(str(file_path), last_message_offset, 'message') \
+                if last_message_offset >= 0 else None
+            last_message_data = None
+
+            # 默认值处理（没有时间戳时使用文件修改时间，重复扫描未变化的文件得到相同结果）
             if not start_time:
-                start_time = datetime.now()
+                start_time = self.file_mtime(file_path)
             if not last_activity:
                 last_activity = start_time
 
@@ -107,6 +156,7 @@ class ClaudeSessionMonitor(BaseSessionMonitor):
                 todos=todos,
                 message_count=message_count,
                 last_message=last_message,
+                last_message_ref=last_message_ref,
                 file_path=str(file_path),
                 source_type="claude"  # 关键：标记来源
             )
@@ -0,0 +1,134 @@
+"""
+会话快照持久化
+
+每次发布的会话变化和退出时保存最近一次的完整快照（紧凑 JSON），
+下次启动时界面先显示这份快照（标记为"旧数据"），后台扫描完成后再用最新结果替换。
+
+文件分两行：
+    第一行: {"format", "saved_at", "version", "total", "sessions": [活跃或被标记的会话]}
+    第二行: {"sessions": [其余会话], "file_states": {会话文件路径: [mtime_ns, size, 是否有独立 todo 文件]}}
+主窗口和托盘只显示活跃或被标记的会话，启动时只需要解析第一行，
+读取耗时与会话总数无关。file_states 是保存这些会话时各会话文件的状态，
+读取完整快照的一方（命令行版 --once）据此只重新解析变化的文件。
+"""
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from src.data.models import Session
+from src.utils.logger import logger
+
+SNAPSHOT_FILE = Path.home() / '.claudecode-cola' / 'snapshot.json'
+SNAPSHOT_FORMAT = 2
+
+
+class StoredSnapshot(NamedTuple):
+    """从磁盘读取的快照"""
+    saved_at: datetime
+    total: int               # 保存时的会话总数
+    sessions: List[Session]  # 活跃或被标记的会话（full=True 时为全部会话）
+    file_states: Optional[Dict[str, list]] = None  # 会话文件路径 -> 保存时的文件状态（只在 full=True 时读取）
+
+
+def _is_hot(data: dict) -> bool:
+    return bool(data.get('is_active') or data.get('is_pinned'))
+
+
+class SnapshotStore:
+    """最近一次会话快照的读写"""
+
+    def __init__(self, path: Path = SNAPSHOT_FILE):
+        self.path = path
+        self._pending: Optional[tuple] = None  # (快照, 文件状态)
+        self._lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+        self._writing = False  # 后台线程是否还会继续取走 _pending
+
+    def save(self, snapshot_event: dict, file_states: Optional[Dict[str, tuple]] = None):
+        """
+        同步保存快照（ChangeTracker.snapshot_event() 的格式）
+
+        先写临时文件再替换，进程在写入中途退出也不会留下损坏的快照
+
+        Args:
+            file_states: 各会话文件解析时的状态（MultiSourceMonitor.file_states()）
+        """
+        sessions = snapshot_event.get('sessions', [])
+        hot = [data for data in sessions if _is_hot(data)]
+        cold = [data for data in sessions if not _is_hot(data)]
+        header = {
+            'format': SNAPSHOT_FORMAT,
+            'saved_at': datetime.now().isoformat(),
+            'version': snapshot_event.get('version', 0),
+            'total': len(sessions),
+            'sessions': hot,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for part in (header, {'sessions': cold, 'file_states': file_states or {}}):
+                    f.write(json.dumps(part, ensure_ascii=False, separators=(',', ':'), default=str))
+                    f.write('\n')
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"保存会话快照失败 {self.path}: {e}")
+
+    def save_in_background(self, snapshot_event: dict, file_states: Optional[Dict[str, tuple]] = None):
+        """
+        在后台线程中保存，不阻塞界面/事件循环
+
+        写入过程中又有新的快照时只保留最新的一份（快照中的字典发布后不再修改，可以跨线程读取）
+        """
+        with self._lock:
+            self._pending = (snapshot_event, file_states)
+            if self._writing:
+                return
+            self._writing = True
+            self._writer = threading.Thread(target=self._write_pending, name='cola-snapshot', daemon=True)
+            self._writer.start()
+
+    def flush(self):
+        """等待后台写入完成（退出前调用）"""
+        writer = self._writer
+        if writer is not None:
+            writer.join()
+
+    def _write_pending(self):
+        while True:
+            with self._lock:
+                pending, self._pending = self._pending, None
+                if pending is None:
+                    self._writing = False
+                    return
+            self.save(*pending)
+
+    def load(self, full: bool = False) -> Optional[StoredSnapshot]:
+        """
+        读取快照，文件不存在、格式不兼容或损坏时返回 None
+
+        Args:
+            full: 为 False 时只读取活跃或被标记的会话（启动时显示用）
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                header = json.loads(f.readline())
+                if header.get('format') != SNAPSHOT_FORMAT:
+                    return None
+                items = header.get('sessions', [])
+                file_states = None
+                if full:
+                    rest = json.loads(f.readline())
+                    items = items + rest.get('sessions', [])
+                    file_states = rest.get('file_states', {})
+            sessions = [Session.from_dict(item) for item in items]
+            return StoredSnapshot(datetime.fromisoformat(header['saved_at']),
+                                  header.get('total', len(sessions)), sessions, file_states)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning(f"读取会话快照失败，忽略: {e}")
+            return None
@@ -0,0 +1,144 @@
+"""
+Todo 文件缓存
+
+按目录批量加载独立的 todo json 文件
+（~/.qoder/todos/<session_id>.json、~/.claude/todos/<session_id>-agent-<agent_id>.json），
+以 (路径, mtime, size) 作为缓存键，未变化的文件不会被重复解析
+"""
+import os
+from pathlib import Path
+from typing import Callable, Dict, NamedTuple, Optional, Set
+
+from src.core.todo_parser import TodoParser
+from src.data.models import TodoList
+from src.utils.logger import logger
+
+
+class _CacheEntry(NamedTuple):
+    """单个 todo 文件的缓存记录"""
+    path: str
+    mtime_ns: int
+    size: int
+    todos: TodoList
+
+
+def session_id_from_filename(filename: str) -> Optional[str]:
+    """默认的文件名 -> 会话ID 映射：<session_id>.json"""
+    if not filename.endswith('.json'):
+        return None
+    return filename[:-len('.json')] or None
+
+
+def claude_session_id_from_filename(filename: str) -> Optional[str]:
+    """
+    Claude Code 的 todo 文件名 -> 会话ID 映射
+
+    文件名格式为 <session_id>-agent-<agent_id>.json，主会话的 agent_id 与 session_id 相同，
+    子 agent（Task 工具）的 todo 文件会被忽略
+    """
+    stem = session_id_from_filename(filename)
+    if not stem:
+        return None
+    if '-agent-' not in stem:
+        return stem
+    session_id, agent_id = stem.split('-agent-', 1)
+    return session_id if session_id and agent_id == session_id else None
+
+
+class TodoFileCache:
+    """
+    Todo 文件目录缓存
+
+    - refresh(): 一次 scandir 扫描整个目录，只重新解析 (mtime, size) 变化的文件
+    - reload_path(): 供目录监听器调用，只刷新单个文件
+    - get(): 按会话ID读取缓存的 todos，文件不存在时返回 None
+    """
+
+    def __init__(self, todos_dir: Path,
+                 session_id_from_name: Callable[[str], Optional[str]] = session_id_from_filename):
+        self.todos_dir = todos_dir
+        self.session_id_from_name = session_id_from_name
+        self._entries: Dict[str, _CacheEntry] = {}
+
+    def refresh(self) -> Set[str]:
+        """
+        扫描 todos 目录并更新缓存
+
+        Returns:
+            todos 发生变化（新增、修改、删除）的会话ID集合
+        """
+        changed: Set[str] = set()
+        seen: Set[str] = set()
+
+        try:
+            entries = os.scandir(self.todos_dir)
+        except FileNotFoundError:
+            entries = None
+        except OSError as e:
+            logger.error(f"扫描 todos 目录失败 {self.todos_dir}: {e}")
+            return changed
+
+        if entries is not None:
+            with entries:
+                for entry in entries:
+                    session_id = self.session_id_from_name(entry.name)
+                    if not session_id:
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    seen.add(session_id)
+                    if self._update(session_id, entry.path, stat.st_mtime_ns, stat.st_size):
+                        changed.add(session_id)
+
+        removed = set(self._entries) - seen
+        for session_id in removed:
+            del self._entries[session_id]
+        changed |= removed
+
+        if changed:
+            logger.debug(f"todos 目录 {self.todos_dir} 有 {len(changed)} 个会话的 todos 发生变化")
+        return changed
+
+    def reload_path(self, path: Path) -> Optional[str]:
+        """
+        重新加载单个 todo 文件（文件被删除时移除缓存）
+
+        Returns:
+            todos 发生变化的会话ID，未变化或不相关的文件返回 None
+        """
+        path = Path(path)
+        if path.parent != self.todos_dir:
+            return None
+        session_id = self.session_id_from_name(path.name)
+        if not session_id:
+            return None
+
+        try:
+            stat = path.stat()
+        except OSError:
+            if self._entries.pop(session_id, None) is not None:
+                return session_id
+            return None
+
+        if self._update(session_id, str(path), stat.st_mtime_ns, stat.st_size):
+            return session_id
+        return None
+
+    def get(self, session_id: str) -> Optional[TodoList]:
+        """获取缓存的 todos，没有对应文件时返回 None"""
+        entry = self._entries.get(session_id)
+        return entry.todos if entry is not None else None
+
+    def _update(self, session_id: str, path: str, mtime_ns: int, size: int) -> bool:
+        """缓存键变化时重新解析文件，返回 todos 内容是否发生变化"""
+        entry = self._entries.get(session_id)
+        if entry is not None and entry.path == path and \
+           entry.mtime_ns == mtime_ns and entry.size == size:
+            return False
+
+        todos = TodoParser.parse_todo_file(Path(path))
+        self._entries[session_id] = _CacheEntry(path, mtime_ns, size, todos)
+        # TodoList 是驻留的，内容未变时重新解析得到的是同一个对象
+        return entry is None or todos is not entry.todos
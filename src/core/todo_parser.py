@@ -3,9 +3,9 @@ Todo 解析策略
 """
 import json
 from pathlib import Path
-from typing import List
+from typing import Iterable
 
-from src.data.models import TodoItem, TodoStatus
+from src.data.models import EMPTY_TODOS, TodoItem, TodoList, TodoStatus
 from src.utils.logger import logger
 
 
@@ -13,7 +13,27 @@ class TodoParser:
     """Todo 解析器"""
 
     @staticmethod
-    def parse_claude_todos(jsonl_path: Path) -> List[TodoItem]:
+    def build_todos(todos_data: Iterable) -> TodoList:
+        """
+        将 TodoWrite 的 input.todos（或独立 todo 文件中的数组）转换为 TodoList
+
+        无法解析的项会被跳过；内容相同的输入返回同一个共享的 TodoList 对象
+        """
+        todos = []
+        for todo_item in todos_data:
+            try:
+                todo = TodoItem(
+                    content=todo_item.get('content', ''),
+                    status=TodoStatus(todo_item.get('status', 'pending')),
+                    active_form=todo_item.get('activeForm', ''),
+                )
+                todos.append(todo)
+            except Exception as e:
+                logger.debug(f"解析 Todo 项失败: {e}")
+        return TodoList.intern(todos)
+
+    @staticmethod
+    def parse_claude_todos(jsonl_path: Path) -> TodoList:
         """
         解析 Claude Code 的 todos（从 jsonl 文件中的 TodoWrite 工具调用）
 
@@ -22,8 +42,10 @@ class TodoParser:
         2. 查找 message.content 中 type="tool_use" 且 name="TodoWrite" 的记录
         3. 从 input.todos 中提取 todo 列表
         4. 每次找到新的 TodoWrite 都会覆盖之前的（保留最新）
+
+        只记录最后一次 TodoWrite 的原始输入，读取结束后再构建一次 TodoItem
         """
-        todos = []
+        latest_todos_data = None
         try:
             with open(jsonl_path, 'r', encoding='utf-8') as f:
                 for line in f:
@@ -39,65 +61,55 @@ class TodoParser:
                                     if 'input' in item and 'todos' in item['input']:
                                         todos_list = item['input']['todos']
                                         if isinstance(todos_list, list):
-                                            todos = []  # 清空，使用最新的
-                                            for todo_item in todos_list:
-                                                try:
-                                                    todo = TodoItem(
-                                                        content=todo_item.get('content', ''),
-                                                        status=TodoStatus(todo_item.get('status', 'pending')),
-                                                        active_form=todo_item.get('activeForm', ''),
-                                                    )
-                                                    todos.append(todo)
-                                                except Exception as e:
-                                                    logger.debug(f"解析 Claude Todo 项失败: {e}")
+                                            latest_todos_data = todos_list  # 覆盖，使用最新的
                     except json.JSONDecodeError:
                         continue
         except Exception as e:
             logger.error(f"读取 Claude Code todos 失败 {jsonl_path}: {e}")
 
-        return todos
+        if latest_todos_data is None:
+            return EMPTY_TODOS
+        return TodoParser.build_todos(latest_todos_data)
 
     @staticmethod
-    def parse_qoder_todos(session_id: str) -> List[TodoItem]:
+    def parse_qoder_todos(session_id: str) -> TodoList:
         """
         解析 Qoder 的 todos（从独立的 json 文件）
 
         实现逻辑：
         1. 构造 todos 文件路径：~/.qoder/todos/<session_id>.json
         2. 如果文件不存在，返回空列表
-        3. 读取 JSON 数组并转换为 TodoItem 列表
+        3. 读取 JSON 数组并转换为 TodoList
+
+        注意：监控器使用 TodoFileCache 按目录批量加载，这里保留单文件的读取方式
         """
-        todos = []
         todos_file = Path.home() / '.qoder' / 'todos' / f'{session_id}.json'
 
-        logger.info(f"📝 开始解析 Qoder todos: {session_id}")
-        logger.info(f"📂 Todos 文件路径: {todos_file}")
-        logger.info(f"📄 文件是否存在: {todos_file.exists()}")
-
         if not todos_file.exists():
-            logger.info(f"⚠️ Qoder todos 文件不存在: {todos_file}")
-            return todos
+            logger.debug(f"Qoder todos 文件不存在: {todos_file}")
+            return EMPTY_TODOS
 
+        return TodoParser.parse_todo_file(todos_file)
+
+    @staticmethod
+    def parse_todo_file(todos_file: Path) -> TodoList:
+        """
+        解析独立的 todos json 文件（JSON 数组，元素包含 content/status/activeForm）
+
+        文件不存在或格式错误时返回空列表
+        """
         try:
             with open(todos_file, 'r', encoding='utf-8') as f:
                 todos_data = json.load(f)
-                logger.info(f"✅ 成功读取 todos 文件，包含 {len(todos_data) if isinstance(todos_data, list) else 0} 个任务")
-
-                if isinstance(todos_data, list):
-                    for item in todos_data:
-                        try:
-                            todo = TodoItem(
-                                content=item.get('content', ''),
-                                status=TodoStatus(item.get('status', 'pending')),
-                                active_form=item.get('activeForm', ''),
-                            )
-                            todos.append(todo)
-                            logger.info(f"  ✓ 解析任务: {todo.status_icon} {todo.content}")
-                        except Exception as e:
-                            logger.error(f"  ✗ 解析 Qoder Todo 项失败: {e}")
-
-                logger.info(f"🎉 Qoder todos 解析完成，共 {len(todos)} 个任务")
+        except FileNotFoundError:
+            return EMPTY_TODOS
         except Exception as e:
-            logger.error(f"❌ 读取 Qoder todos 文件失败 {todos_file}: {e}")
+            logger.error(f"❌ 读取 todos 文件失败 {todos_file}: {e}")
+            return EMPTY_TODOS
+
+        if not isinstance(todos_data, list):
+            return EMPTY_TODOS
 
+        todos = TodoParser.build_todos(todos_data)
+        logger.debug(f"解析 todos 文件 {todos_file}，共 {len(todos)} 个任务")
         return todos
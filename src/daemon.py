@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+ClaudeCode-Cola 无界面守护进程
+
+守护进程独占扫描引擎（MultiSourceMonitor），通过本地控制接口
+(~/.claudecode-cola/control.sock) 发布会话快照和变更集：
+桌面应用、命令行版和脚本作为客户端订阅，同一份解析结果供所有前端共用。
+
+守护进程基于 asyncio 事件循环运行，不导入 Qt。
+
+用法:
+    python src/daemon.py
+"""
+import asyncio
+import os
+import signal
+import sys
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.changeset import ChangeTracker
+from src.core.control_server import ControlClient, ControlServer, asyncio_invoker
+from src.core.multi_source_monitor import MultiSourceMonitor
+from src.core.snapshot_store import SnapshotStore
+from src.data.config import Config
+from src.utils.logger import logger, setup_logger
+
+DAEMON_MODE = 'daemon'
+
+
+class ColaDaemon:
+    """无界面守护进程：扫描会话并向订阅者推送变化"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.config = Config()
+        # watchdog 回调切换到事件循环线程执行
+        self.session_monitor = MultiSourceMonitor(dispatcher=loop.call_soon_threadsafe)
+        self.tracker = ChangeTracker()
+        self.snapshot_store = SnapshotStore()  # 前端启动时先显示的快照
+
+        methods = self.session_monitor.control_methods()
+        methods['info'] = self._rpc_info
+        self.control_server = ControlServer(
+            methods,
+            invoker=asyncio_invoker(loop),
+            snapshot=self.tracker.snapshot_event
+        )
+
+        self.session_monitor.sessions_updated.connect(self.on_sessions_updated)
+        self._refresh_handle = None
+
+    def start(self) -> bool:
+        """启动守护进程，控制接口已被占用时返回 False"""
+        # 已有应用/守护进程在运行时不重复扫描
+        if ControlClient(self.control_server.socket_path, timeout=0.5).is_available():
+            return False
+
+        # 首次扫描完成后再启动控制接口：扫描期间事件循环被占用，无法响应请求，
+        # 这时启动的前端检测不到守护进程，会自己扫描
+        self.session_monitor.start()
+        self.tracker.update(self.session_monitor.get_all_sessions())
+        if not self.control_server.start():
+            self.session_monitor.stop()
+            return False
+
+        self.snapshot_store.save_in_background(self.tracker.snapshot_event(),
+                                              self.session_monitor.file_states())
+        self._schedule_refresh()
+        logger.info(f"✅ 守护进程已启动，共 {len(self.session_monitor.index)} 个会话")
+        return True
+
+    def stop(self):
+        """停止守护进程"""
+        if self._refresh_handle is not None:
+            self._refresh_handle.cancel()
+            self._refresh_handle = None
+        self.control_server.stop()
+        self.session_monitor.stop()
+        self.snapshot_store.flush()
+        self.snapshot_store.save(self.tracker.snapshot_event(), self.session_monitor.file_states())
+
+    def _schedule_refresh(self):
+        self._refresh_handle = self.loop.call_later(self.config.refresh_interval, self.on_timer_refresh)
+
+    def on_timer_refresh(self):
+        """定时刷新"""
+        try:
+            if self.config.auto_refresh:
+                self.session_monitor.scan_all_sessions()
+        finally:
+            self._schedule_refresh()
+
+    def on_sessions_updated(self, sessions):
+        """扫描结果有变化时向订阅者推送变更集"""
+        change_set = self.tracker.update(sessions)
+        if change_set is None:
+            return
+        logger.debug(f"发布变更集 v{change_set.version}: "
+                     f"{len(change_set.upserted)} 个更新, {len(change_set.removed)} 个移除")
+        self.control_server.publish(change_set.to_event())
+        self.snapshot_store.save_in_background(self.tracker.snapshot_event(),
+                                              self.session_monitor.file_states())
+
+    def _rpc_info(self) -> dict:
+        return {
+            'mode': DAEMON_MODE,
+            'pid': os.getpid(),
+            'version': self.tracker.version,
+            'subscribers': self.control_server.subscriber_count,
+        }
+
+
+async def run_daemon() -> int:
+    loop = asyncio.get_running_loop()
+    daemon = ColaDaemon(loop)
+    if not daemon.start():
+        logger.error("已有 ClaudeCode-Cola 实例在运行，守护进程退出")
+        return 1
+
+    # Ctrl+C / kill 时正常退出并删除 socket 文件
+    stop_event = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+    try:
+        await stop_event.wait()
+    finally:
+        daemon.stop()
+    return 0
+
+
+def main():
+    """守护进程入口"""
+    logger = setup_logger()
+    logger.info("🥤 ClaudeCode-Cola 守护进程启动中...")
+    exit_code = asyncio.run(run_daemon())
+    logger.info("👋 守护进程已退出")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,19 @@
 """
 数据模型定义
 """
+import hashlib
+import json
+import sys
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
+from typing import Iterable, NamedTuple, Optional, Sequence
 from enum import Enum
 
+# Python 3.10+ 的 dataclass 支持 slots（无 __dict__），旧版本退化为普通 dataclass
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 
 class TodoStatus(Enum):
     """Todo状态枚举"""
@@ -14,13 +22,13 @@ class TodoStatus(Enum):
     COMPLETED = "completed"
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class TodoItem:
-    """TodoWrite任务项"""
+    """TodoWrite任务项（不可变）"""
     content: str
     status: TodoStatus
     active_form: str
-    created_at: datetime = field(default_factory=datetime.now)
+    created_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
 
     @property
@@ -42,7 +50,124 @@ class TodoItem:
         return f"{self.status_icon} {self.content}"
 
 
-@dataclass
+class TodoList(tuple):
+    """
+    不可变的 todo 列表（hash-consing）
+
+    通过 TodoList.intern() 创建时，内容相同的 todo 列表共享同一个对象，
+    并带有预先计算的内容指纹，变化检测只需比较对象身份（is）
+    """
+    POOL_MAX_SIZE = 4096  # 驻留池最多保留的不同列表数量（LRU 淘汰）
+
+    _pool: 'OrderedDict[tuple, TodoList]' = OrderedDict()
+    _pool_lock = threading.Lock()
+
+    def __new__(cls, items: Iterable[TodoItem] = ()):
+        self = super().__new__(cls, items)
+        digest = hashlib.blake2b(digest_size=8)
+        for todo in self:
+            digest.update(f"{todo.content}\x1f{todo.status.value}\x1f{todo.active_form}\x1e"
+                          .encode('utf-8', errors='surrogatepass'))
+        self.fingerprint = digest.hexdigest()  # 内容指纹（跨进程稳定）
+        return self
+
+    @classmethod
+    def intern(cls, items: Iterable[TodoItem]) -> 'TodoList':
+        """返回与 items 内容相同的共享 TodoList"""
+        key = tuple(items)
+        try:
+            hash(key)
+        except TypeError:
+            # 内容不可哈希（异常输入）时不参与驻留
+            return cls(key)
+
+        with cls._pool_lock:
+            pooled = cls._pool.get(key)
+            if pooled is not None:
+                cls._pool.move_to_end(key)
+                return pooled
+
+        todo_list = cls(key)
+        with cls._pool_lock:
+            pooled = cls._pool.setdefault(key, todo_list)
+            cls._pool.move_to_end(key)
+            if len(cls._pool) > cls.POOL_MAX_SIZE:
+                cls._pool.popitem(last=False)
+        return pooled
+
+
+EMPTY_TODOS = TodoList.intern(())
+
+
+class TodoSummary(NamedTuple):
+    """todos 的派生统计（todos 变化时计算一次，之后直接复用）"""
+    total: int
+    completed: int
+    in_progress: int
+    pending: int
+    current_task: Optional[TodoItem]  # 当前最相关的任务
+    progress_text: str                # 任务进度字符串
+
+    @classmethod
+    def from_todos(cls, todos: Sequence[TodoItem]) -> 'TodoSummary':
+        """单次遍历 todos 计算统计信息"""
+        if not todos:
+            return cls(0, 0, 0, 0, None, "无任务")
+
+        completed = in_progress = pending = 0
+        first_in_progress = None
+        first_unfinished = None
+        for todo in todos:
+            if todo.status == TodoStatus.COMPLETED:
+                completed += 1
+                continue
+            if todo.status == TodoStatus.IN_PROGRESS:
+                in_progress += 1
+                if first_in_progress is None:
+                    first_in_progress = todo
+            elif todo.status == TodoStatus.PENDING:
+                pending += 1
+            if first_unfinished is None:
+                first_unfinished = todo
+        total = len(todos)
+
+        # 确定整体进度图标
+        if completed == total:
+            progress_icon = "✅"  # 全部完成
+        elif in_progress:
+            progress_icon = "🔄"  # 有进行中的任务
+        else:
+            progress_icon = "⏳"  # 部分完成或未开始
+
+        # 找到当前最相关的任务：优先显示进行中的，其次是第一个待完成的，全部完成时显示最后一个
+        current_task = first_in_progress or first_unfinished or todos[-1]
+
+        progress_text = f"[{progress_icon} {completed}/{total}] {current_task.content}"
+        return cls(total, completed, in_progress, pending, current_task, progress_text)
+
+
+@dataclass(frozen=True, **_SLOTS)
+class MessageRef:
+    """消息在会话文件中的位置（用于按需读取完整消息）"""
+    file_path: str
+    offset: int            # 该行记录在文件中的字节偏移
+    field: str = ""        # 记录中消息所在的字段，为空表示整条记录
+
+    def load(self):
+        """读取完整消息，读取失败时返回 None"""
+        try:
+            with open(self.file_path, 'rb') as f:
+                f.seek(self.offset)
+                record = json.loads(f.readline())
+        except (OSError, ValueError):
+            return None
+
+        if self.field:
+            return record.get(self.field) if isinstance(record, dict) else None
+        return record
+
+
+@dataclass(**_SLOTS)
 class Session:
     """AI 会话（支持 Claude Code 和 Qoder）"""
     session_id: str
@@ -53,11 +178,98 @@ class Session:
     is_active: bool = False
     is_pinned: bool = False
     custom_name: str = ""  # 用户自定义项目名称
-    todos: List[TodoItem] = field(default_factory=list)
+    todos: TodoList = EMPTY_TODOS
     message_count: int = 0
-    last_message: str = ""
+    last_message: str = ""  # 最后一条消息的截断预览
     file_path: str = ""
     source_type: str = "claude"  # 新增字段："claude" 或 "qoder"
+    last_message_ref: Optional[MessageRef] = None  # 最后一条消息的位置，完整内容按需读取
+    _todo_summary: Optional[TodoSummary] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # 项目路径、名称和来源在大量会话间重复，驻留后共享同一个字符串对象
+        self.project_path = sys.intern(self.project_path)
+        self.project_name = sys.intern(self.project_name)
+        self.source_type = sys.intern(self.source_type)
+
+    def __setattr__(self, name, value):
+        if name == 'todos':
+            # todos 统一存储为共享的 TodoList，替换时让派生统计失效
+            if not isinstance(value, TodoList):
+                value = TodoList.intern(value)
+            object.__setattr__(self, '_todo_summary', None)
+        object.__setattr__(self, name, value)
+
+    @property
+    def render_key(self) -> tuple:
+        """界面渲染依赖的字段（todos 按对象身份比较），用于跳过未变化的行"""
+        return (self.session_id, self.is_active, self.is_pinned, self.custom_name,
+                self.project_name, self.source_type, self.todos)
+
+    @property
+    def todo_summary(self) -> TodoSummary:
+        """todos 的派生统计（缓存，todos 被替换后重新计算）"""
+        summary = self._todo_summary
+        if summary is None:
+            summary = TodoSummary.from_todos(self.todos)
+            self._todo_summary = summary
+        return summary
+
+    def load_last_message(self):
+        """按需读取最后一条消息的完整内容"""
+        if self.last_message_ref is None:
+            return None
+        return self.last_message_ref.load()
+
+    def to_dict(self) -> dict:
+        """转换为可 JSON 序列化的字典（控制接口、快照使用）"""
+        return {
+            'session_id': self.session_id,
+            'project_path': self.project_path,
+            'project_name': self.project_name,
+            'start_time': self.start_time.isoformat(),
+            'last_activity': self.last_activity.isoformat(),
+            'is_active': self.is_active,
+            'is_pinned': self.is_pinned,
+            'custom_name': self.custom_name,
+            'todos': [
+                {'content': t.content, 'status': t.status.value, 'activeForm': t.active_form}
+                for t in self.todos
+            ],
+            'message_count': self.message_count,
+            'last_message': self.last_message,
+            'file_path': self.file_path,
+            'source_type': self.source_type,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Session':
+        """从 to_dict() 的结果还原会话"""
+        todos = []
+        for todo in data.get('todos', ()):
+            try:
+                todos.append(TodoItem(
+                    content=todo.get('content', ''),
+                    status=TodoStatus(todo.get('status', 'pending')),
+                    active_form=todo.get('activeForm', ''),
+                ))
+            except ValueError:
+                continue
+        return cls(
+            session_id=data['session_id'],
+            project_path=data.get('project_path', ''),
+            project_name=data.get('project_name', ''),
+            start_time=datetime.fromisoformat(data['start_time']),
+            last_activity=datetime.fromisoformat(data['last_activity']),
+            is_active=data.get('is_active', False),
+            is_pinned=data.get('is_pinned', False),
+            custom_name=data.get('custom_name', ''),
+            todos=TodoList.intern(todos),
+            message_count=data.get('message_count', 0),
+            last_message=data.get('last_message', ''),
+            file_path=data.get('file_path', ''),
+            source_type=data.get('source_type', 'claude'),
+        )
 
     @property
     def duration(self) -> str:
@@ -80,52 +292,15 @@ class Session:
     @property
     def todo_progress(self) -> str:
         """返回任务进度字符串"""
-        if not self.todos:
-            return "无任务"
-        completed = sum(1 for t in self.todos if t.is_completed)
-        total = len(self.todos)
-
-        # 确定整体进度图标
-        if completed == total:
-            progress_icon = "✅"  # 全部完成
-        elif any(t.status == TodoStatus.IN_PROGRESS for t in self.todos):
-            progress_icon = "🔄"  # 有进行中的任务
-        elif completed > 0:
-            progress_icon = "⏳"  # 部分完成
-        else:
-            progress_icon = "⏳"  # 未开始
-
-        # 找到当前最相关的任务：优先显示进行中的，其次是第一个待完成的
-        current_task = None
-        for todo in self.todos:
-            if todo.status == TodoStatus.IN_PROGRESS:
-                current_task = todo
-                break
-
-        if not current_task:
-            # 没有进行中的任务，找第一个待完成的
-            for todo in self.todos:
-                if not todo.is_completed:
-                    current_task = todo
-                    break
-
-        # 如果全部完成，显示最后一个任务
-        if not current_task and self.todos:
-            current_task = self.todos[-1]
-
-        task_content = current_task.content if current_task else ""
-        return f"[{progress_icon} {completed}/{total}] {task_content}"
+        return self.todo_summary.progress_text
 
     @property
     def progress_percentage(self) -> int:
         """进度百分比"""
-        if not self.todos:
-            return 0
-        completed = sum(1 for t in self.todos if t.is_completed)
-        total = len(self.todos)
-        if total == 0:
+        summary = self.todo_summary
+        if summary.total == 0:
             return 0
-        return int((completed / total) * 100)
+        return int((summary.completed / summary.total) * 100)
 
     @property
     def status_icon(self) -> str:
@@ -147,11 +322,10 @@ class Session:
         return "success"      # 绿色
 
     def __str__(self) -> str:
-        if not self.todos:
+        summary = self.todo_summary
+        if not summary.total:
             return f"{self.status_icon} {self.project_name}"
-        completed = sum(1 for t in self.todos if t.is_completed)
-        total = len(self.todos)
-        return f"{self.status_icon} {self.project_name} ({completed}/{total})"
+        return f"{self.status_icon} {self.project_name} ({summary.completed}/{summary.total})"
 
 
 # 保持向后兼容
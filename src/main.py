@@ -4,14 +4,18 @@ ClaudeCode-Cola Mac 应用入口
 """
 import sys
 from pathlib import Path
-from PyQt6.QtWidgets import QApplication
-from PyQt6.QtCore import Qt
 
 # 添加项目根目录到 Python 路径
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.app import ColaApp
+# 最先导入，作为启动计时的起点
+from src.utils.startup_profiler import profiler
+
+with profiler.measure_import('PyQt6'):
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import Qt
+
 from src.utils.logger import setup_logger
 
 
@@ -35,7 +39,11 @@ def main():
     app.setOrganizationName("Haya")
     app.setOrganizationDomain("com.haya.claudecode-cola")
 
-    # 创建并启动主应用
+    profiler.mark('qapplication_created')
+
+    # 创建并启动主应用（主窗口、监控器等子系统在 ColaApp 中按需导入）
+    with profiler.measure_import('src.app'):
+        from src.app import ColaApp
     cola_app = ColaApp()
     cola_app.show()
 
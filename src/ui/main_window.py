@@ -12,7 +12,7 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, pyqtSignal, QSize
 from PyQt6.QtGui import QAction, QIcon, QPixmap
 
-from src.data.models import Session, TodoStatus
+from src.data.models import Session
 from src.data.config import Config
 from src.utils.logger import logger
 from src.ui.path_delegate import PathItemDelegate
@@ -32,6 +32,7 @@ class MainWindow(QMainWindow):
         self.config = config
         self.sessions: List[Session] = []
         self.current_session: Optional[Session] = None
+        self._row_render_keys: List[tuple] = []  # 每行最近一次渲染的 render_key
 
         # 加载来源图标
         self.load_source_icons()
@@ -167,6 +168,12 @@ class MainWindow(QMainWindow):
         title = QLabel("🥤 ClaudeCode-Cola")
         title.setStyleSheet("color: white; font-size: 18px; font-weight: 600; background: transparent;")
         layout.addWidget(title)
+
+        # 显示的是旧数据（上次保存的快照）时的提示
+        self.stale_label = QLabel("⏳ 显示的是上次保存的数据，正在获取最新会话...")
+        self.stale_label.setStyleSheet("color: #FFD60A; font-size: 12px; background: transparent;")
+        self.stale_label.hide()
+        layout.addWidget(self.stale_label)
         
         layout.addStretch()
         
@@ -425,6 +432,10 @@ class MainWindow(QMainWindow):
             }
         """)
 
+    def set_stale(self, stale: bool):
+        """标记当前显示的是否是上次保存的快照"""
+        self.stale_label.setVisible(stale)
+
     def update_sessions(self, sessions: List[Session]):
         """更新会话列表"""
         self.sessions = sessions
@@ -432,9 +443,6 @@ class MainWindow(QMainWindow):
 
     def refresh_sessions_display(self):
         """刷新会话表格显示"""
-        # 清空表格
-        self.sessions_table.setRowCount(0)
-
         # 显示活跃会话和被标记的会话（和CLI版本保持一致）
         displayed_sessions = []
         for session in self.sessions:
@@ -451,9 +459,17 @@ class MainWindow(QMainWindow):
         # 只显示前20个会话（和CLI版本保持一致）
         sorted_sessions = sorted_sessions[:20]
 
-        # 填充表格
+        # 调整行数并填充表格，render_key 未变化的行保持原样
+        self.sessions_table.setRowCount(len(sorted_sessions))
+        del self._row_render_keys[len(sorted_sessions):]
         for row, session in enumerate(sorted_sessions):
-            self.sessions_table.insertRow(row)
+            render_key = session.render_key
+            if row < len(self._row_render_keys):
+                if self._row_render_keys[row] == render_key:
+                    continue
+                self._row_render_keys[row] = render_key
+            else:
+                self._row_render_keys.append(render_key)
 
             # 列0: 状态图标
             status_item = QTableWidgetItem(session.status_icon)
@@ -508,10 +524,7 @@ class MainWindow(QMainWindow):
         total = len(sessions_to_count)
         active = sum(1 for s in sessions_to_count if s.is_active)
         todo_projects = sum(1 for s in sessions_to_count if s.todos)
-        pending_todos = sum(
-            len([t for t in s.todos if t.status.value == 'pending'])
-            for s in sessions_to_count
-        )
+        pending_todos = sum(s.todo_summary.pending for s in sessions_to_count)
 
         # 更新统计标签
         self.stats_total.findChild(QLabel, "value").setText(str(total))
@@ -524,35 +537,34 @@ class MainWindow(QMainWindow):
         # 使用过滤后的会话列表进行统计
         sessions_to_count = displayed_sessions if displayed_sessions is not None else self.sessions
 
-        # 统计所有任务
-        all_todos = []
+        # 统计所有任务（计数直接使用会话缓存的统计，只收集需要显示的前10个任务）
+        recent_todos = []
+        total = 0
         completed = 0
         in_progress = 0
         pending = 0
 
         for session in sessions_to_count:
-            for todo in session.todos:
-                all_todos.append((session.project_name, todo))
-                if todo.status.value == 'completed':
-                    completed += 1
-                elif todo.status.value == 'in_progress':
-                    in_progress += 1
-                elif todo.status.value == 'pending':
-                    pending += 1
+            summary = session.todo_summary
+            total += summary.total
+            completed += summary.completed
+            in_progress += summary.in_progress
+            pending += summary.pending
+            for todo in session.todos[:10 - len(recent_todos)]:
+                recent_todos.append((session.project_name, todo))
 
         # 更新统计信息
-        total = len(all_todos)
         if total > 0:
             stats_text = f"✅ 已完成: {completed} | 🔄 进行中: {in_progress} | ⏳ 待处理: {pending}"
             self.todos_stats.setText(stats_text)
 
             # 显示最新的10个任务
             todos_text = ""
-            for project, todo in all_todos[:10]:
+            for project, todo in recent_todos:
                 todos_text += f"{todo}\n[{project}]\n\n"
 
-            if len(all_todos) > 10:
-                todos_text += f"\n... 还有 {len(all_todos) - 10} 个任务"
+            if total > 10:
+                todos_text += f"\n... 还有 {total - 10} 个任务"
 
             self.todos_list.setText(todos_text)
         else:
@@ -697,17 +709,14 @@ class MainWindow(QMainWindow):
         """)
         
         # 统计信息
-        total = len(session.todos)
-        completed = sum(1 for t in session.todos if t.status == TodoStatus.COMPLETED)
-        in_progress = sum(1 for t in session.todos if t.status == TodoStatus.IN_PROGRESS)
-        pending = sum(1 for t in session.todos if t.status == TodoStatus.PENDING)
+        summary = session.todo_summary
         
         content = f"📊 任务统计\n"
         content += f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-        content += f"总任务数: {total}\n"
-        content += f"✅ 已完成: {completed}\n"
-        content += f"🔄 进行中: {in_progress}\n"
-        content += f"⏳ 待处理: {pending}\n"
+        content += f"总任务数: {summary.total}\n"
+        content += f"✅ 已完成: {summary.completed}\n"
+        content += f"🔄 进行中: {summary.in_progress}\n"
+        content += f"⏳ 待处理: {summary.pending}\n"
         content += f"\n📝 任务列表\n"
         content += f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n\n"
         
@@ -7,7 +7,6 @@ from PyQt6.QtGui import QIcon, QAction, QPixmap, QPainter, QColor
 from PyQt6.QtCore import pyqtSignal, Qt
 
 from src.data.models import ClaudeSession
-from src.ui.tray_popup import TrayPopup
 from src.utils.logger import logger
 
 
@@ -24,10 +23,10 @@ class SystemTray(QSystemTrayIcon):
         icon = self.create_icon("🥤")
         super().__init__(icon, parent)
 
-        # 创建弹出窗口
-        self.popup = TrayPopup()
-        self.popup.show_main_window.connect(self.show_window_requested)
-        self.popup.open_session.connect(self.open_session)
+        # 弹出窗口在第一次点击托盘图标时才创建
+        self.popup = None
+        self.sessions: List[ClaudeSession] = []
+        self.stale = False  # 显示的是否是上次保存的快照
 
         self.setup_menu()
         self.setup_connections()
@@ -81,6 +80,25 @@ class SystemTray(QSystemTrayIcon):
         # 不设置默认的contextMenu，我们手动控制
         # self.setContextMenu(menu)
 
+    def ensure_popup(self):
+        """第一次需要时导入并创建弹出窗口"""
+        if self.popup is None:
+            from src.ui.tray_popup import TrayPopup
+            self.popup = TrayPopup()
+            self.popup.show_main_window.connect(self.show_window_requested)
+            self.popup.open_session.connect(self.open_session)
+            self.popup.set_stale(self.stale)
+            self.popup.update_sessions(self.sessions)
+        return self.popup
+
+    def toggle_popup(self):
+        """显示/隐藏弹出窗口"""
+        popup = self.ensure_popup()
+        if popup.isVisible():
+            popup.hide()
+        else:
+            popup.show_at_cursor()
+
     def setup_connections(self):
         """设置连接"""
         # 托盘图标激活事件
@@ -93,10 +111,7 @@ class SystemTray(QSystemTrayIcon):
         if reason == QSystemTrayIcon.ActivationReason.Trigger:
             # 左键单击显示弹出窗口
             logger.info("左键单击托盘图标")
-            if self.popup.isVisible():
-                self.popup.hide()
-            else:
-                self.popup.show_at_cursor()
+            self.toggle_popup()
         elif reason == QSystemTrayIcon.ActivationReason.DoubleClick:
             # 双击显示主窗口
             logger.info("双击托盘图标")
@@ -104,7 +119,7 @@ class SystemTray(QSystemTrayIcon):
         elif reason == QSystemTrayIcon.ActivationReason.Context:
             # 右键点击时，隐藏弹出窗口并显示菜单
             logger.info("右键点击托盘图标")
-            if self.popup.isVisible():
+            if self.popup is not None and self.popup.isVisible():
                 self.popup.hide()
             # 手动显示菜单
             from PyQt6.QtGui import QCursor
@@ -112,10 +127,7 @@ class SystemTray(QSystemTrayIcon):
         elif reason == QSystemTrayIcon.ActivationReason.MiddleClick:
             logger.info("中键点击托盘图标")
             # 中键点击也显示弹出窗口
-            if self.popup.isVisible():
-                self.popup.hide()
-            else:
-                self.popup.show_at_cursor()
+            self.toggle_popup()
 
     def create_icon(self, emoji: str, color: QColor = None) -> QIcon:
         """
@@ -160,10 +172,18 @@ class SystemTray(QSystemTrayIcon):
             tooltip = f"ClaudeCode-Cola 🥤\n🟡 {need_attention_count} 个会话需要关注"
         else:
             tooltip = f"ClaudeCode-Cola 🥤\n{total_count} 个会话"
+        if self.stale:
+            tooltip += "\n⏳ 上次保存的数据，正在刷新..."
 
         self.setIcon(icon)
         self.setToolTip(tooltip)
 
+    def set_stale(self, stale: bool):
+        """标记当前显示的是否是上次保存的快照"""
+        self.stale = stale
+        if self.popup is not None:
+            self.popup.set_stale(stale)
+
     def update_active_sessions_menu(self, sessions: List[ClaudeSession]):
         """
         更新弹出窗口
@@ -171,8 +191,10 @@ class SystemTray(QSystemTrayIcon):
         Args:
             sessions: 会话列表
         """
-        # 更新弹出窗口
-        self.popup.update_sessions(sessions)
+        # 更新弹出窗口（还没创建时，创建时再填充）
+        self.sessions = sessions
+        if self.popup is not None:
+            self.popup.update_sessions(sessions)
 
     def open_session(self, session: ClaudeSession):
         """
@@ -1,7 +1,7 @@
 """
 系统托盘弹出窗口模块
 """
-from typing import List
+from typing import Dict, List, Tuple
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
     QFrame, QScrollArea, QPushButton
@@ -23,6 +23,9 @@ class TrayPopup(QWidget):
     def __init__(self):
         super().__init__()
         self.sessions: List[ClaudeSession] = []
+        self._session_cards: Dict[str, Tuple[tuple, QWidget]] = {}  # session_id -> (render_key, 卡片)
+        self.stale = False  # 显示的是否是上次保存的快照
+        self._stats_text = "0 个活跃会话"
         self.init_ui()
         
     def init_ui(self):
@@ -158,15 +161,29 @@ class TrayPopup(QWidget):
         
         return footer
     
+    def set_stale(self, stale: bool):
+        """标记当前显示的是否是上次保存的快照"""
+        self.stale = stale
+        self.update_stats_label()
+
+    def update_stats_label(self):
+        """更新标题栏的统计信息（旧数据时加上提示）"""
+        text = self._stats_text
+        if self.stale:
+            text = f"⏳ {text}（上次数据）"
+        self.stats_label.setText(text)
+
     def update_sessions(self, sessions: List[ClaudeSession]):
         """更新会话列表"""
         self.sessions = sessions
         
-        # 清空现有会话
+        # 从布局中取出现有控件（会话卡片稍后按需复用）
+        cached_cards = {id(card) for _, card in self._session_cards.values()}
         while self.sessions_layout.count():
             item = self.sessions_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+            widget = item.widget()
+            if widget and id(widget) not in cached_cards:
+                widget.deleteLater()
         
         # 显示活跃会话或被标记的会话（与主窗口保持一致）
         displayed_sessions = [s for s in sessions if s.is_active or s.is_pinned]
@@ -183,9 +200,10 @@ class TrayPopup(QWidget):
         
         # 更新统计
         if active_count > 0:
-            self.stats_label.setText(f"{active_count} 个活跃会话")
+            self._stats_text = f"{active_count} 个活跃会话"
         else:
-            self.stats_label.setText(f"{len(displayed_sessions)} 个会话")
+            self._stats_text = f"{len(displayed_sessions)} 个会话"
+        self.update_stats_label()
         
         if not displayed_sessions:
             # 显示空状态
@@ -197,11 +215,25 @@ class TrayPopup(QWidget):
                 padding: 40px 0;
             """)
             self.sessions_layout.addWidget(empty)
-        else:
-            # 显示会话卡片
-            for session in displayed_sessions:
+        
+        # 显示会话卡片，render_key 未变化的卡片直接复用
+        session_cards = {}
+        for session in displayed_sessions:
+            render_key = session.render_key
+            cached = self._session_cards.pop(session.session_id, None)
+            if cached is not None and cached[0] == render_key:
+                card = cached[1]
+            else:
+                if cached is not None:
+                    cached[1].deleteLater()
                 card = self.create_session_card(session)
-                self.sessions_layout.addWidget(card)
+            session_cards[session.session_id] = (render_key, card)
+            self.sessions_layout.addWidget(card)
+        
+        # 不再显示的会话卡片
+        for _, card in self._session_cards.values():
+            card.deleteLater()
+        self._session_cards = session_cards
         
         self.sessions_layout.addStretch()
     
@@ -247,13 +279,13 @@ class TrayPopup(QWidget):
         
         # 第二行：TodoWrite进度
         if session.todos:
-            progress = QLabel(session.todo_progress)
+            progress_text = session.todo_progress
+            progress = QLabel(progress_text)
             progress.setStyleSheet("""
                 font-size: 11px;
                 color: #6B7280;
             """)
             # 限制长度
-            progress_text = session.todo_progress
             if len(progress_text) > 40:
                 progress.setText(progress_text[:40] + "...")
                 progress.setToolTip(progress_text)
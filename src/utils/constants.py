@@ -14,6 +14,7 @@ DEFAULT_PROJECTS_DIR = "~/.claude/projects"  # 保持兼容
 DEFAULT_CLAUDE_PROJECTS_DIR = "~/.claude/projects"
 DEFAULT_QODER_PROJECTS_DIR = "~/.qoder/projects"
 DEFAULT_QODER_TODOS_DIR = "~/.qoder/todos"
+MESSAGE_PREVIEW_MAX_BYTES = 512  # 会话中保留的最后一条消息预览的最大字节数
 
 # UI 常量
 MIN_WINDOW_WIDTH = 800
@@ -53,5 +53,17 @@ def setup_logger(name: str = "ClaudeCode-Cola", level: int = logging.INFO) -> lo
     return logger
 
 
+def redirect_console_logging(stream=sys.stderr, level: int = logging.WARNING):
+    """
+    把控制台日志改为输出到 stream 并提高级别（stdout 用于输出数据时调用，例如命令行的 --json 模式）
+
+    日志文件不受影响
+    """
+    for handler in logging.getLogger("ClaudeCode-Cola").handlers:
+        if type(handler) is logging.StreamHandler:
+            handler.setStream(stream)
+            handler.setLevel(level)
+
+
 # 全局日志实例
 logger = setup_logger()
@@ -0,0 +1,82 @@
+"""
+消息预览工具
+
+会话只保留最后一条消息的截断文本（固定字节预算），
+完整消息通过 MessageRef（文件路径 + 字节偏移）按需读取
+"""
+from typing import Any, Iterator
+
+from src.utils.constants import MESSAGE_PREVIEW_MAX_BYTES
+
+
+def truncate_utf8(text: str, max_bytes: int) -> str:
+    """
+    按 UTF-8 字节数截断字符串，不会截断半个多字节字符
+
+    Args:
+        text: 原始字符串
+        max_bytes: 最大字节数
+
+    Returns:
+        截断后的字符串（被截断时以 … 结尾，结果仍不超过 max_bytes）
+    """
+    encoded = text.encode('utf-8', errors='replace')
+    if len(encoded) <= max_bytes:
+        return text
+
+    ellipsis = '…'.encode('utf-8')
+    cut = encoded[:max(max_bytes - len(ellipsis), 0)]
+    return cut.decode('utf-8', errors='ignore') + '…'
+
+
+def _iter_text_parts(message: Any) -> Iterator[str]:
+    """
+    从消息结构中依次提取文本片段
+
+    支持的结构：
+    - 字符串
+    - {"text": ...} / {"content": ...} / {"message": ...}
+    - 内容块列表（text / tool_use / tool_result）
+    """
+    if isinstance(message, str):
+        yield message
+    elif isinstance(message, list):
+        for item in message:
+            yield from _iter_text_parts(item)
+    elif isinstance(message, dict):
+        if message.get('type') == 'tool_use':
+            yield f"[{message.get('name', 'tool_use')}]"
+        elif isinstance(message.get('text'), str):
+            yield message['text']
+        elif 'content' in message:
+            yield from _iter_text_parts(message['content'])
+        elif 'message' in message:
+            yield from _iter_text_parts(message['message'])
+
+
+def build_message_preview(message: Any, max_bytes: int = MESSAGE_PREVIEW_MAX_BYTES) -> str:
+    """
+    生成消息预览文本
+
+    只拼接到字节预算为止，不会为了生成预览而复制整个大消息（如超长的工具结果）
+
+    Args:
+        message: 消息对象（字符串、字典或内容块列表）
+        max_bytes: 预览的最大 UTF-8 字节数
+
+    Returns:
+        预览文本
+    """
+    parts = []
+    collected = 0
+    for part in _iter_text_parts(message):
+        if not part:
+            continue
+        # 每个字符至少占 1 个字节，收集 max_bytes 个字符即可覆盖字节预算
+        part = part[:max_bytes - collected + 1]
+        parts.append(part)
+        collected += len(part) + 1
+        if collected > max_bytes:
+            break
+
+    return truncate_utf8(' '.join(parts).strip(), max_bytes)
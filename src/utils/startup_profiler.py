@@ -0,0 +1,84 @@
+"""
+启动耗时记录
+
+记录各个启动阶段（导入、创建托盘、首帧绘制……）距进程启动的毫秒数，
+以及主要子系统的导入耗时，写入 ~/.claudecode-cola/startup_report.json，
+保留最近若干次启动的记录，方便跨版本对比。
+"""
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+from src.utils.constants import APP_VERSION
+
+STARTUP_REPORT_FILE = Path.home() / '.claudecode-cola' / 'startup_report.json'
+MAX_HISTORY = 20
+
+
+class StartupProfiler:
+    """启动阶段计时器（第一次导入本模块的时间作为起点）"""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.marks: Dict[str, float] = {}
+        self.imports: Dict[str, float] = {}
+        self.saved = False
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started_at) * 1000
+
+    def mark(self, name: str):
+        """记录一个启动阶段（同名阶段只记录第一次）"""
+        self.marks.setdefault(name, round(self.elapsed_ms(), 1))
+
+    @contextmanager
+    def measure_import(self, name: str):
+        """记录一段导入代码的耗时"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.imports[name] = round((time.perf_counter() - start) * 1000, 1)
+
+    def report(self) -> dict:
+        return {
+            'version': APP_VERSION,
+            'recorded_at': datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'platform': sys.platform,
+            'marks_ms': dict(self.marks),
+            'imports_ms': dict(self.imports),
+            'modules_loaded': len(sys.modules),
+        }
+
+    def save(self, path: Path = STARTUP_REPORT_FILE):
+        """追加本次启动记录（只写一次），最新一次放在 latest 中"""
+        if self.saved:
+            return
+        self.saved = True
+        report = self.report()
+        history: List[dict] = []
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                history = json.load(f).get('history', [])
+        except (OSError, ValueError, AttributeError):
+            pass
+        history = (history + [report])[-MAX_HISTORY:]
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(path.name + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'latest': report, 'history': history}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, path)
+        except OSError:
+            # 启动报告只用于统计，写入失败不影响启动
+            pass
+
+
+profiler = StartupProfiler()
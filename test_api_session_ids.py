@@ -0,0 +1,57 @@
+"""
+claudecode_cola_api 文件模式（没有监控器运行）下的会话ID解析
+
+会话索引文件（session_index.json）只在桌面应用/守护进程运行时更新，
+应用关闭期间新建的会话不在其中，标记这些会话时要退回遍历项目目录。
+
+    python -m pytest test_api_session_ids.py
+"""
+import json
+
+import pytest
+
+import claudecode_cola_api as api
+
+INDEXED_ID = '11111111-0000-4000-8000-000000000001'
+NEW_ID = '22222222-0000-4000-8000-000000000002'
+
+
+@pytest.fixture
+def file_mode(tmp_path, monkeypatch):
+    """临时 HOME：索引文件中只有 INDEXED_ID，项目目录中还有之后新建的 NEW_ID"""
+    projects = tmp_path / '.claude' / 'projects'
+    project_dir = projects / '-work-demo'
+    project_dir.mkdir(parents=True)
+    for session_id in (INDEXED_ID, NEW_ID):
+        (project_dir / f'{session_id}.jsonl').write_text('{}\n', encoding='utf-8')
+
+    config_dir = tmp_path / '.claudecode-cola'
+    config_dir.mkdir()
+    entries = {INDEXED_ID: {'file_path': str(project_dir / f'{INDEXED_ID}.jsonl'),
+                            'project_path': '-work-demo', 'project_name': '/work/demo'}}
+
+    monkeypatch.setattr(api, 'CLAUDE_ROOT', projects)
+    monkeypatch.setattr(api, 'CONFIG_DIR', config_dir)
+    monkeypatch.setattr(api, 'CONFIG_FILE', config_dir / 'pinned_sessions.json')
+    monkeypatch.setattr(api, 'load_index_entries', lambda: entries)
+    monkeypatch.setattr(api, 'call_monitor', lambda method, **params: (False, None))
+    monkeypatch.setattr(api, '_index_entries', None)
+    monkeypatch.setattr(api, '_session_id_index', None)
+    monkeypatch.setattr(api, '_session_id_index_scanned', False)
+    return config_dir / 'pinned_sessions.json'
+
+
+def test_resolves_indexed_id_without_scanning(file_mode):
+    assert api.resolve_session_id(INDEXED_ID[:8]) == INDEXED_ID
+    assert not api._session_id_index_scanned
+
+
+@pytest.mark.parametrize('prefix', [NEW_ID, NEW_ID[:8]])
+def test_pins_session_missing_from_stale_index(file_mode, prefix):
+    assert api.pin_sessions([prefix]) == [NEW_ID]
+    assert json.loads(file_mode.read_text(encoding='utf-8')) == [NEW_ID]
+
+
+def test_unknown_id_still_rejected(file_mode, capsys):
+    assert api.pin_sessions(['33333333']) == []
+    assert '不存在' in capsys.readouterr().out
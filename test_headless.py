@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+测试命令行版无界面模式（--watch）
+"""
+import json
+import os
+import select
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent
+
+
+def write_message(path, content):
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps({'type': 'user', 'timestamp': '2025-01-02T03:04:05Z',
+                            'message': {'role': 'user', 'content': content}}) + '\n')
+
+
+def test_watch_exits_when_reader_closes_pipe(tmp_path):
+    """没有守护进程时 --watch | head -1：读取方关闭管道后，下一次输出变化时退出"""
+    pytest.importorskip('watchdog')
+    pytest.importorskip('rich')
+    session_file = tmp_path / '.claude' / 'projects' / '-work-demo' / 'watch-session.jsonl'
+    session_file.parent.mkdir(parents=True)
+    write_message(session_file, 'hello')
+    config_dir = tmp_path / '.claudecode-cola'
+    config_dir.mkdir()
+    (config_dir / 'config.json').write_text(json.dumps({'refresh_interval': 1}), encoding='utf-8')
+
+    env = dict(os.environ, HOME=str(tmp_path))
+    proc = subprocess.Popen([sys.executable, str(ROOT / 'claudecode_cola.py'), '--watch'],
+                            cwd=ROOT, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        assert select.select([proc.stdout], [], [], 30)[0], "没有输出初始快照"
+        assert json.loads(proc.stdout.readline())['event'] == 'snapshot'
+        proc.stdout.close()
+
+        write_message(session_file, 'changed')
+        assert proc.wait(timeout=30) == 0
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def run_once_json(home):
+    env = dict(os.environ, HOME=str(home))
+    result = subprocess.run([sys.executable, str(ROOT / 'claudecode_cola.py'), '--once', '--json', '--max-age', '0'],
+                            cwd=ROOT, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=60, check=True)
+    return {session['session_id']: session for session in json.loads(result.stdout)['sessions']}
+
+
+def test_once_reparses_only_changed_files(tmp_path):
+    """--once 复用上次快照中文件未变化的会话：修改会话文件、增加 todo 文件后，结果与重新完整扫描相同"""
+    pytest.importorskip('watchdog')
+    pytest.importorskip('rich')
+    project_dir = tmp_path / '.claude' / 'projects' / '-work-demo'
+    project_dir.mkdir(parents=True)
+    for name in ('changed', 'todo-added', 'unchanged'):
+        write_message(project_dir / f'{name}.jsonl', 'hello')
+
+    first = run_once_json(tmp_path)
+    assert first['changed']['message_count'] == 1
+
+    write_message(project_dir / 'changed.jsonl', 'again')
+    todos_dir = tmp_path / '.claude' / 'todos'
+    todos_dir.mkdir()
+    (todos_dir / 'todo-added-agent-todo-added.json').write_text(
+        json.dumps([{'content': 'step', 'status': 'pending', 'activeForm': 'Stepping'}]), encoding='utf-8')
+
+    incremental = run_once_json(tmp_path)
+    assert incremental['changed']['message_count'] == 2
+    assert incremental['todo-added']['todos'] == [{'content': 'step', 'status': 'pending', 'activeForm': 'Stepping'}]
+
+    (tmp_path / '.claudecode-cola' / 'snapshot.json').unlink()
+    assert incremental == run_once_json(tmp_path)
@@ -7,7 +7,7 @@ from PyQt6.QtCore import Qt
 
 def test_text_elide():
     """测试Qt的文本省略功能"""
-    app = QApplication([])
+    app = QApplication.instance() or QApplication([])
 
     from PyQt6.QtGui import QFontMetrics, QFont
 
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+测试进程扫描（没有 /proc 时使用 psutil）
+"""
+import os
+import subprocess
+
+import pytest
+
+from claudecode_cola_proc import ProcScanner
+
+
+def test_psutil_scan_reports_matched(tmp_path):
+    """没有 /proc 时 matched 也包含匹配的进程（命令行版据此显示进程列表）"""
+    pytest.importorskip('psutil')
+    sleeper = tmp_path / 'colaprobe'
+    os.symlink('/bin/sleep', sleeper)
+    proc = subprocess.Popen([str(sleeper), '30'], cwd=tmp_path)
+    try:
+        scanner = ProcScanner(name_keyword='colaprobe', proc_root=str(tmp_path))  # 不存在 <proc_root>/self
+        assert not scanner.use_proc
+
+        assert scanner.scan() == {proc.pid: str(tmp_path)}
+        assert sorted(scanner.matched) == [proc.pid]
+        assert scanner.matched[proc.pid].cmdline == (str(sleeper), '30')
+    finally:
+        proc.kill()
+        proc.wait()
+
+    assert scanner.scan() == {}
+    assert scanner.matched == {}
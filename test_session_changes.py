@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+测试重复扫描没有变化的会话文件时不产生变更（守护进程不推送、桌面应用不重写快照）
+"""
+import json
+
+import pytest
+
+from src.core.changeset import ChangeTracker
+from src.core.qoder_monitor import QoderSessionMonitor
+from src.core.session_index import SessionIndex
+from src.core.session_monitor import ClaudeSessionMonitor
+
+
+def write_jsonl(path, records):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(''.join(json.dumps(record) + '\n' for record in records), encoding='utf-8')
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    """临时 HOME：Claude Code 和 Qoder 各有一个带时间戳和一个不带时间戳的会话"""
+    monkeypatch.setenv('HOME', str(tmp_path))
+    claude_dir = tmp_path / '.claude' / 'projects' / '-work-demo'
+    write_jsonl(claude_dir / 'claude-with-timestamp.jsonl', [
+        {'type': 'user', 'timestamp': '2025-01-02T03:04:05.000Z',
+         'message': {'role': 'user', 'content': 'hello'}},
+        {'type': 'assistant', 'timestamp': '2025-01-02T03:04:09.000Z',
+         'message': {'role': 'assistant', 'content': [{'type': 'text', 'text': 'hi'}]}},
+    ])
+    write_jsonl(claude_dir / 'claude-without-timestamp.jsonl', [
+        {'type': 'user', 'message': {'role': 'user', 'content': 'hello'}},
+    ])
+    qoder_dir = tmp_path / '.qoder' / 'projects' / '-work-demo'
+    write_jsonl(qoder_dir / 'qoder-with-timestamp.jsonl', [
+        {'id': '1', 'role': 'user', 'content': 'hello', 'created_at': 1735787045000},
+    ])
+    write_jsonl(qoder_dir / 'qoder-without-timestamp.jsonl', [
+        {'id': '1', 'role': 'user', 'content': 'hello'},
+    ])
+    return tmp_path
+
+
+def scan(home):
+    """重新创建监控器并扫描一次（相当于一次完整刷新）"""
+    claude = ClaudeSessionMonitor(home / '.claude' / 'projects', todos_dir=home / '.claude' / 'todos')
+    qoder = QoderSessionMonitor(home / '.qoder' / 'projects', todos_dir=home / '.qoder' / 'todos')
+    return claude.scan_sessions() + qoder.scan_sessions()
+
+
+def test_claude_timestamp_is_parsed(home):
+    sessions = {session.session_id: session for session in scan(home)}
+    session = sessions['claude-with-timestamp']
+    assert (session.start_time.isoformat(), session.last_activity.isoformat()) == \
+        ('2025-01-02T03:04:05', '2025-01-02T03:04:09')
+
+
+def test_rescan_of_unchanged_tree_has_no_changes(home):
+    tracker = ChangeTracker()
+    assert tracker.update(scan(home)) is not None
+    assert tracker.update(scan(home)) is None
+
+
+def test_idle_refresh_does_not_save_snapshot(home, qapp, monkeypatch):
+    from src.app import ColaApp
+    from src.core.multi_source_monitor import MultiSourceMonitor
+    from src.core.snapshot_store import SnapshotStore
+
+    # 会话索引写到临时目录
+    save_if_dirty = SessionIndex.save_if_dirty
+    monkeypatch.setattr(SessionIndex, 'save_if_dirty',
+                        lambda self: save_if_dirty(self, home / 'session_index.json'))
+
+    app = ColaApp()
+    app.config.auto_refresh = True
+    app.snapshot_store = SnapshotStore(home / 'snapshot.json')
+    saved = []
+    monkeypatch.setattr(app.snapshot_store, 'save_in_background', lambda *args: saved.append(args))
+    app.session_monitor = MultiSourceMonitor()
+    app.session_monitor.sessions_updated.connect(app.on_sessions_updated)
+    app.tracker = ChangeTracker()
+    app.monitor_ready = True
+
+    app.on_timer_refresh()
+    assert saved
+    saved.clear()
+
+    app.on_timer_refresh()
+    assert saved == []
+    app.system_tray.hide()
+
+
+def test_scan_all_sessions_emits_aggregate_once(home, monkeypatch):
+    from src.core.multi_source_monitor import MultiSourceMonitor
+
+    save_if_dirty = SessionIndex.save_if_dirty
+    monkeypatch.setattr(SessionIndex, 'save_if_dirty',
+                        lambda self: save_if_dirty(self, home / 'session_index.json'))
+
+    monitor = MultiSourceMonitor()
+    emitted = []
+    monitor.sessions_updated.connect(emitted.append)
+    monitor.scan_all_sessions()
+    assert [len(sessions) for sessions in emitted] == [4]